@@ -0,0 +1,8 @@
+"""
+python -m crawling <명령> 진입점 (crawling/cli.py)
+"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,293 @@
+"""
+원본 데이터 아카이브 (압축 JSON Lines)
+- 상품을 수집하는 즉시 은행/실행 단위 세그먼트(raw_data/<run_id>/<bank>.jsonl.gz)에 한 줄씩 추가합니다.
+- 메모리에 전체 목록을 들고 있지 않아도 되며, 실행 도중 중단되어도 마지막 flush 시점까지의 데이터가 남습니다.
+- index.json에 세그먼트 목록/건수/상태를 기록하고, 리더는 세그먼트를 지연(lazy) 순회합니다.
+- 기존 raw_kb_data_<ts>.json(들여쓰기 JSON) 파일도 같은 리더로 읽을 수 있습니다.
+"""
+import gzip
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .config import CrawlingConfig
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+RAW_DATA_DIR = Path(__file__).resolve().parent / 'raw_data'
+INDEX_FILE = 'index.json'
+RUN_ID_FORMAT = '%Y%m%d_%H%M%S'
+
+_SEGMENT_SUFFIX = {'gzip': '.jsonl.gz', 'zstd': '.jsonl.zst', 'none': '.jsonl'}
+_LEGACY_FILE_PATTERN = re.compile(r'raw_(?P<bank>[a-z]+)_data_(?P<ts>\d{8}_\d{6})\.json$', re.IGNORECASE)
+
+
+def _zstd():
+    """zstandard는 선택 의존성 (없으면 gzip 사용)"""
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+def resolve_compression(compression: Optional[str] = None) -> str:
+    compression = (compression or CrawlingConfig.ARCHIVE_COMPRESSION).lower()
+    if compression not in _SEGMENT_SUFFIX:
+        raise ValueError(f"지원하지 않는 압축 방식: {compression}")
+    if compression == 'zstd' and _zstd() is None:
+        logger.warning("zstandard 패키지가 없어 gzip으로 저장합니다.")
+        return 'gzip'
+    return compression
+
+
+def _safe_name(bank_name: str) -> str:
+    return re.sub(r'[^\w-]', '_', bank_name)
+
+
+class SegmentWriter:
+    """은행 하나의 append-only JSONL 세그먼트 (스레드 안전)"""
+
+    def __init__(self, path: Path, compression: str, flush_every: int):
+        self.path = path
+        self.compression = compression
+        self.flush_every = max(1, flush_every)
+        self.records = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._raw = open(path, 'ab')
+        if compression == 'gzip':
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode='ab')
+        elif compression == 'zstd':
+            self._stream = _zstd().ZstdCompressor(level=3).stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = self._raw
+
+    def write(self, record: Dict):
+        started = time.perf_counter()
+        line = (json.dumps(record, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+        with self._lock:
+            self._stream.write(line)
+            self.records += 1
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._flush()
+        METRICS.observe('archive_write', time.perf_counter() - started)
+        METRICS.incr('archived_bytes', len(line))
+
+    def _flush(self):
+        # 압축 블록을 끝까지 내보내 중단되더라도 여기까지는 복원 가능하도록 함
+        if self.compression == 'zstd':
+            self._stream.flush(_zstd().FLUSH_BLOCK)
+        else:
+            self._stream.flush()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._pending = 0
+
+    def close(self):
+        with self._lock:
+            if self._raw.closed:
+                return
+            if self._stream is not self._raw:
+                self._stream.close()
+            self._raw.flush()
+            os.fsync(self._raw.fileno())
+            self._raw.close()
+
+
+class RawArchiveWriter:
+    """
+    실행(run) 단위 원본 아카이브
+    사용 예:
+        with RawArchiveWriter() as archive:
+            archive.write('KB', raw_data)
+    """
+
+    def __init__(self, run_id: Optional[str] = None, root: Path = RAW_DATA_DIR,
+                 compression: Optional[str] = None, flush_every: Optional[int] = None):
+        self.run_id = run_id or datetime.now().strftime(RUN_ID_FORMAT)
+        self.run_dir = Path(root) / self.run_id
+        self.compression = resolve_compression(compression)
+        self.flush_every = flush_every or CrawlingConfig.ARCHIVE_FLUSH_EVERY
+        self._segments: Dict[str, SegmentWriter] = {}
+        self._lock = threading.Lock()
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self._index = {
+            'run_id': self.run_id,
+            'status': 'running',
+            'compression': self.compression,
+            'started_at': datetime.now().isoformat(),
+            'finished_at': None,
+            'segments': {}
+        }
+        self._save_index()
+        logger.info(f"🗄️ 원본 아카이브 시작: {self.run_dir}")
+
+    def segment(self, bank_name: str) -> SegmentWriter:
+        with self._lock:
+            if bank_name not in self._segments:
+                path = self.run_dir / f"{_safe_name(bank_name)}{_SEGMENT_SUFFIX[self.compression]}"
+                self._segments[bank_name] = SegmentWriter(path, self.compression, self.flush_every)
+                self._index['segments'][bank_name] = {
+                    'path': path.name,
+                    'records': 0,
+                    'status': 'open',
+                    'opened_at': datetime.now().isoformat()
+                }
+                self._save_index()
+            return self._segments[bank_name]
+
+    def write(self, bank_name: str, record: Dict):
+        self.segment(bank_name).write(record)
+
+    def close_segment(self, bank_name: str):
+        """은행 하나의 수집이 끝났을 때 세그먼트를 닫고 인덱스에 건수 기록"""
+        with self._lock:
+            writer = self._segments.get(bank_name)
+            if writer is None:
+                return
+            writer.close()
+            entry = self._index['segments'][bank_name]
+            entry.update({'records': writer.records, 'status': 'closed', 'closed_at': datetime.now().isoformat()})
+            self._save_index()
+
+    def close(self, status: str = 'complete'):
+        for bank_name in list(self._segments):
+            self.close_segment(bank_name)
+        with self._lock:
+            self._index.update({'status': status, 'finished_at': datetime.now().isoformat()})
+            self._save_index()
+        total = sum(s['records'] for s in self._index['segments'].values())
+        logger.info(f"🗄️ 원본 아카이브 종료: {self.run_dir} ({total}건)")
+
+    @property
+    def record_count(self) -> int:
+        return sum(writer.records for writer in self._segments.values())
+
+    def _save_index(self):
+        tmp_path = self.run_dir / (INDEX_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.run_dir / INDEX_FILE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close('complete' if exc_type is None else 'failed')
+
+
+# ----------------------------------------------------------------------
+# 리더
+# ----------------------------------------------------------------------
+def _open_text(path: Path):
+    name = path.name
+    if name.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if name.endswith('.zst'):
+        zstandard = _zstd()
+        if zstandard is None:
+            raise ImportError(f"{name}을 읽으려면 zstandard 패키지가 필요합니다.")
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True)
+        return io.TextIOWrapper(reader, encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def iter_segment(path: Path) -> Iterator[Dict]:
+    """세그먼트(또는 기존 JSON 백업) 한 파일의 레코드를 순서대로 반환 (중단된 꼬리는 건너뜀)"""
+    path = Path(path)
+    if path.suffix == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+        return
+
+    with _open_text(path) as f:
+        while True:
+            try:
+                line = f.readline()
+            except (EOFError, OSError, ValueError) as e:
+                # 압축 스트림이 중간에 끊긴 경우 (실행 중단) - 마지막 flush 지점까지만 사용
+                logger.warning(f"⚠️ 세그먼트가 중간에 끊겼습니다. 이전 레코드까지만 읽습니다: {path.name} ({e})")
+                return
+            if not line:
+                return
+            if not line.endswith('\n'):
+                logger.warning(f"⚠️ 불완전한 마지막 레코드를 건너뜁니다: {path.name}")
+                return
+            yield json.loads(line)
+
+
+def _run_started_at(run_id: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(run_id, RUN_ID_FORMAT)
+    except ValueError:
+        return None
+
+
+def list_runs(root: Path = RAW_DATA_DIR) -> List[Dict]:
+    """
+    보관된 실행 목록 (오래된 순)
+    [{'run_id', 'started_at', 'status', 'segments': {bank: Path}}]
+    """
+    root = Path(root)
+    runs = []
+    if not root.exists():
+        return runs
+
+    for entry in root.iterdir():
+        if entry.is_dir() and (entry / INDEX_FILE).exists():
+            with open(entry / INDEX_FILE, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            runs.append({
+                'run_id': index['run_id'],
+                'started_at': _run_started_at(index['run_id']),
+                'status': index.get('status'),
+                'segments': {bank: entry / info['path'] for bank, info in index['segments'].items()}
+            })
+            continue
+
+        # 기존 형식: raw_kb_data_<ts>.json
+        match = _LEGACY_FILE_PATTERN.match(entry.name)
+        if entry.is_file() and match:
+            runs.append({
+                'run_id': match.group('ts'),
+                'started_at': _run_started_at(match.group('ts')),
+                'status': 'legacy',
+                'segments': {match.group('bank').upper(): entry}
+            })
+
+    return sorted(runs, key=lambda run: run['run_id'])
+
+
+def iter_archive(
+    root: Path = RAW_DATA_DIR,
+    banks: Optional[Iterable[str]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+) -> Iterator[Dict]:
+    """기간/은행 조건에 맞는 보관 레코드를 실행 순서대로 지연 순회"""
+    banks = set(banks) if banks else None
+    for run in list_runs(root):
+        started_at = run['started_at']
+        if started_at and ((since and started_at < since) or (until and started_at > until)):
+            continue
+        legacy = run['status'] == 'legacy'
+        for bank_name, path in run['segments'].items():
+            if banks and not legacy and bank_name not in banks:
+                continue
+            if not path.exists():
+                continue
+            for record in iter_segment(path):
+                # 기존 백업 파일은 여러 은행이 한 파일에 섞여 있으므로 레코드 단위로 거름
+                if legacy and banks and record.get('bank_name') not in banks:
+                    continue
+                yield record
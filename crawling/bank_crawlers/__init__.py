@@ -4,4 +4,9 @@
 
 from .kb_crawler import KBCrawler
 
-__all__ = ['KBCrawler']
+# CrawlingConfig.TARGET_BANKS 코드 -> 크롤러 클래스
+BANK_CRAWLERS = {
+    'KB': KBCrawler,
+}
+
+__all__ = ['KBCrawler', 'BANK_CRAWLERS']
@@ -1,91 +1,149 @@
 """
 KB국민은행 크롤러 (신용/담보 통합 및 실제 구조 반영)
 """
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 import logging
-from typing import List, Dict
+from typing import List
 
 from ..crawler import BaseBankCrawler
 from ..cleansing import LoanDataCleaner
+from ..detail import DetailExtractionError
+from ..parsers import ItemSelector
+from ..records import LoanProduct
 
 logger = logging.getLogger(__name__)
 
 class KBCrawler(BaseBankCrawler):
+    # 신용/담보 목록 페이지 공통 구조
+    LIST_SELECTOR = ItemSelector(
+        item='.area1',
+        fields={'product_name': 'a.title strong', 'limit': '.info-data2', 'detail_url': 'a.title@href'},
+        # <span>3.5</span>억원 이슈 해결을 위해 내부 공백을 유지하며 텍스트 추출
+        separators={'limit': ' '}
+    )
+    # 상품 상세 페이지 (금리 범위 / 중도상환해약금 / 면제 기간)
+    DETAIL_SELECTOR = ItemSelector(
+        item='.product-detail',
+        fields={'rate': '.info-rate dd', 'fee': '.info-fee dd', 'waiver': '.info-waiver dd'},
+        # 연 <strong>4.12</strong>% ~ <strong>5.62</strong>% 형태이므로 조각 사이 공백 유지
+        separators={'rate': ' ', 'fee': ' ', 'waiver': ' '}
+    )
+    # 상세 페이지에서 반드시 읽어야 하는 필드 (raw_data의 rate / fee / waiver)
+    DETAIL_FIELDS = ('rate', 'fee', 'waiver')
+    
     def __init__(self):
         super().__init__('KB')
+        # 이번 crawl()에서 목록 페이지로 읽은 상품 수 (상세 단계에서 모두 빠졌는지 판단)
+        self.listed_count = 0
         # 수집할 타겟 리스트 정의
         self.targets = [
             (self.config.BANK_URLS['KB_CREDIT'], '신용대출'),
             (self.config.BANK_URLS['KB_MORTGAGE'], '담보대출')
         ]
     
-    def crawl(self) -> List[Dict]:
+    def crawl(self) -> List[LoanProduct]:
         all_products = []
+        errors = []
+        self.listed_count = 0
         
         for url, p_type in self.targets:
-            logger.info(f"🚀 {self.bank_name} [{p_type}] 접속: {url}")
-            self.driver.get(url)
-            
             try:
-                # 1. 실제 데이터(area1) 로드 대기
-                WebDriverWait(self.driver, 15).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "area1"))
-                )
-                
-                # 2. HTML 파싱
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                product_items = soup.select('.area1')
-                logger.info(f"🔎 {p_type} 파싱된 아이템 수: {len(product_items)}개")
-
-                for item in product_items:
-                    try:
-                        name_tag = item.select_one('a.title strong')
-                        limit_tag = item.select_one('.info-data2')
-                        
-                        if not name_tag: continue
+                all_products.extend(self.crawl_target(url, p_type))
+            except Exception as e:
+                logger.error(f"❌ {p_type} 목록 로드 실패 또는 타임아웃: {e}")
+                errors.append(e)
+                continue
+        
+        # 모든 목록이 실패하면 safe_crawl이 재시도(서킷 차단이면 즉시 실패)하도록 예외 전달
+        if errors and len(errors) == len(self.targets):
+            raise errors[-1]
+        
+        # 변경 없는 상품만 있었던 경우는 수집 실패가 아니므로 더미 데이터를 만들지 않음
+        if all_products or self.unchanged_count:
+            return all_products
+        # 목록은 읽었는데 상세 단계에서 모두 빠졌으면 더미 데이터로 덮지 않고 은행을 실패로 보고
+        if self.detail_pages_enabled and self.listed_count:
+            raise DetailExtractionError(
+                f"상세 정보를 읽은 상품이 없습니다 (목록 {self.listed_count}개). 상세 선택자를 확인하세요."
+            )
+        return self._create_dummy_data()
+    
+    def crawl_target(self, url: str, p_type: str) -> List[LoanProduct]:
+        """상품 목록 페이지 하나를 수집/파싱"""
+        products = []
+        logger.info(f"🚀 {self.bank_name} [{p_type}] 접속: {url}")
+        
+        # 1. 실제 데이터(area1)가 있는 HTML 확보 (정적 페이지는 HTTP, 아니면 Selenium 대기)
+        page = self.fetch_page(url, wait_selector='.area1')
+        if self.page_unchanged(url, page):
+            return products
+        
+        # 2. HTML 파싱 (필요한 필드만 추출)
+        product_items = [item for item in self.parse_items(page['html']) if item['product_name']]
+        logger.info(f"🔎 {p_type} 파싱된 아이템 수: {len(product_items)}개")
+        self.listed_count += len(product_items)
+        
+        # 3. 상세 페이지 동시 수집 (실제 금리/수수료/면제 기간)
+        details = self.fetch_details(page['url'], product_items)
 
-                        product_name = name_tag.get_text(strip=True)
-                        # <span>3.5</span>억원 이슈 해결을 위해 내부 공백을 유지하며 텍스트 추출
-                        product_limit = limit_tag.get_text(" ", strip=True) if limit_tag else "상세문의"
-                        
-                        raw_data = {
-                            'bank_name': self.bank_name,
-                            'product_name': product_name,
-                            'product_type': p_type,
-                            'rate': '4.2', # 추후 상세 페이지 수집 시 고도화 가능
-                            'limit': product_limit,
-                            'fee': '1.5',
-                            'waiver': '36'
-                        }
-                        
-                        # 전처리 (LoanDataCleaner를 통해 원 단위 정수로 변환)
-                        cleaned_data = LoanDataCleaner.parse_product_row(raw_data)
-                        if cleaned_data:
-                            all_products.append(cleaned_data)
-                            
-                    except Exception as e:
-                        logger.warning(f"개별 상품 파싱 중 오류: {e}")
+        for item, detail in zip(product_items, details):
+            try:
+                if self.detail_pages_enabled:
+                    # 상세 페이지를 받지 못했거나 필드를 읽지 못한 상품은 기본값으로 채우지 않고 다음 실행에서 재수집
+                    if detail is None:
+                        logger.warning(f"상세 정보 없음, 이번 실행에서 제외: {item['product_name']}")
                         continue
-                        
+                    missing = [field for field in self.DETAIL_FIELDS if not detail.get(field)]
+                    if missing:
+                        logger.warning(
+                            f"상세 정보 누락({', '.join(missing)}), 이번 실행에서 제외: {item['product_name']} ({detail['url']})"
+                        )
+                        continue
+                    rate, fee, waiver = (detail[field] for field in self.DETAIL_FIELDS)
+                else:
+                    # 상세 페이지를 수집하지 않는 설정(DETAIL_ENABLED=False)에서만 KB 평균값 사용
+                    rate, fee, waiver = '4.2', '1.5', '36'
+                
+                product_limit = item['limit'] if item['limit'] is not None else "상세문의"
+                
+                raw_data = {
+                    'bank_name': self.bank_name,
+                    'product_name': item['product_name'],
+                    'product_type': p_type,
+                    'rate': rate,
+                    'limit': product_limit,
+                    'fee': fee,
+                    'waiver': waiver
+                }
+                # 변경 여부와 관계없이 원본은 모두 기록 (재처리/백필 시 그날의 전체 목록을 다시 만들 수 있도록)
+                self.archive_raw(raw_data)
+                
+                # 지난 실행과 동일한 상품(목록 + 상세)은 파싱/적재 생략
+                item_hash = self.item_fingerprint(item['html'], detail)
+                if self.item_unchanged(url, item_hash):
+                    continue
+                
+                # 전처리 (LoanDataCleaner를 통해 원 단위 정수로 변환)
+                cleaned_data = LoanDataCleaner.parse_product_row(raw_data)
+                if cleaned_data:
+                    products.append(cleaned_data)
+                    self.remember_item(url, item_hash)
+                    
             except Exception as e:
-                logger.error(f"❌ {p_type} 목록 로드 실패 또는 타임아웃: {e}")
+                logger.warning(f"개별 상품 파싱 중 오류: {e}")
                 continue
         
-        return all_products if all_products else self._create_dummy_data()
+        return products
 
-    def _create_dummy_data(self) -> List[Dict]:
+    def _create_dummy_data(self) -> List[LoanProduct]:
         # 수집 실패 시 시스템 중단을 방지하기 위한 더미 데이터
-        return [{
-            'bank_name': 'KB',
-            'product_name': '수집 실패 보정 데이터',
-            'product_type': '신용대출',
-            'base_rate': 4.5,
-            'additional_rate': 0.0,
-            'max_limit': 10000000,
-            'early_repay_fee_rate': 1.5,
-            'fee_waiver_months': 36,
-            'salary_transfer_discount': 0.3
-        }]
\ No newline at end of file
+        return [LoanProduct(
+            bank_name='KB',
+            product_name='수집 실패 보정 데이터',
+            product_type='신용대출',
+            base_rate=4.5,
+            additional_rate=0.0,
+            max_limit=10000000,
+            early_repay_fee_rate=1.5,
+            fee_waiver_months=36,
+            salary_transfer_discount=0.3
+        )]
\ No newline at end of file
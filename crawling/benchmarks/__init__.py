@@ -0,0 +1,4 @@
+"""
+크롤링 경로 성능 벤치마크
+- bench_parsing: HTML 파싱/선택자/필드 추출 및 LoanDataCleaner 단계별 처리량, 지연 시간, 메모리
+"""
@@ -0,0 +1,344 @@
+"""
+파싱 벤치마크 (KBCrawler.crawl_target + LoanDataCleaner)
+- 대상 페이지: 체크인된 KB 신용/담보 목록 스냅샷(crawling/fixtures) + 최대 10,000개 상품의 합성 페이지
+- 측정 단계: parse(트리 생성) / select('.area1') / extract(상품명·한도) / clean_* / validate
+- 파서 백엔드: html.parser, lxml(BeautifulSoup), selectolax (설치된 것만)
+- parse_items: 크롤러가 실제로 사용하는 KBCrawler.LIST_SELECTOR 파서(crawling/parsers.py) 백엔드별 전체 추출
+- 단계별 처리량(items/s), p50/p99 지연 시간, 최대 메모리(파이썬 힙, tracemalloc 기준)를 출력하고
+  baseline.json 대비 느려진 단계가 있으면 종료 코드 1로 실패합니다.
+
+사용 예:
+    python -m crawling.benchmarks.bench_parsing
+    python -m crawling.benchmarks.bench_parsing --sizes 100 1000 --backends html.parser lxml
+    python -m crawling.benchmarks.bench_parsing --update-baseline
+"""
+import argparse
+import gc
+import hashlib
+import importlib.util
+import json
+import logging
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from ..bank_crawlers.kb_crawler import KBCrawler
+from ..cleansing import LoanDataCleaner
+from ..parsers import available_backends as available_parser_backends
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent / 'fixtures'
+BASELINE_PATH = Path(__file__).resolve().parent / 'baseline.json'
+SNAPSHOTS = {'kb_credit': 'kb_credit.html', 'kb_mortgage': 'kb_mortgage.html'}
+DEFAULT_SIZES = [100, 1000, 10000]
+
+_ITEM_BLOCK = re.compile(r'<li>\s*<div class="area1">.*?</li>\s*', re.DOTALL)
+_ITEM_NAME = re.compile(r'<strong>(.*?)</strong>')
+
+
+# ----------------------------------------------------------------------
+# 벤치마크 페이지
+# ----------------------------------------------------------------------
+def load_snapshot(name: str) -> str:
+    return (FIXTURE_DIR / SNAPSHOTS[name]).read_text(encoding='utf-8')
+
+
+def synthetic_page(item_count: int) -> str:
+    """스냅샷의 상품 블록을 반복해 item_count개 상품이 있는 목록 페이지 생성 (상품명은 고유하게)"""
+    credit, mortgage = load_snapshot('kb_credit'), load_snapshot('kb_mortgage')
+    blocks = _ITEM_BLOCK.findall(credit) + _ITEM_BLOCK.findall(mortgage)
+    items = []
+    for i in range(item_count):
+        block = blocks[i % len(blocks)]
+        items.append(_ITEM_NAME.sub(lambda m: f'<strong>{m.group(1)} #{i}</strong>', block, count=1))
+    start = credit.index('<ul>') + len('<ul>\n')
+    end = credit.index('      </ul>')
+    return credit[:start] + ''.join(items) + credit[end:]
+
+
+def benchmark_pages(sizes: List[int]) -> Dict[str, str]:
+    pages = {name: load_snapshot(name) for name in SNAPSHOTS}
+    for size in sizes:
+        pages[f'synthetic_{size}'] = synthetic_page(size)
+    return pages
+
+
+# ----------------------------------------------------------------------
+# 파서 백엔드 (KBCrawler와 같은 선택자 사용)
+# ----------------------------------------------------------------------
+def _soup_backend(parser: str) -> Dict[str, Callable]:
+    from bs4 import BeautifulSoup
+    if parser == 'lxml' and importlib.util.find_spec('lxml') is None:
+        raise ImportError('lxml')  # 없으면 건너뜀
+
+    def extract(items):
+        rows = []
+        for item in items:
+            name_tag = item.select_one('a.title strong')
+            limit_tag = item.select_one('.info-data2')
+            if not name_tag:
+                continue
+            rows.append((name_tag.get_text(strip=True),
+                         limit_tag.get_text(" ", strip=True) if limit_tag else "상세문의"))
+        return rows
+
+    return {
+        'parse': lambda html: BeautifulSoup(html, parser),
+        'select': lambda tree: tree.select('.area1'),
+        'extract': extract
+    }
+
+
+def _selectolax_backend() -> Dict[str, Callable]:
+    from selectolax.lexbor import LexborHTMLParser
+
+    def extract(items):
+        rows = []
+        for item in items:
+            name_tag = item.css_first('a.title strong')
+            limit_tag = item.css_first('.info-data2')
+            if not name_tag:
+                continue
+            rows.append((name_tag.text(strip=True),
+                         limit_tag.text(separator=' ', strip=True) if limit_tag else "상세문의"))
+        return rows
+
+    return {
+        'parse': LexborHTMLParser,
+        'select': lambda tree: tree.css('.area1'),
+        'extract': extract
+    }
+
+
+BACKENDS = {
+    'html.parser': lambda: _soup_backend('html.parser'),
+    'lxml': lambda: _soup_backend('lxml'),
+    'selectolax': _selectolax_backend,
+}
+
+
+def available_backends(names: List[str]) -> Dict[str, Dict[str, Callable]]:
+    backends = {}
+    for name in names:
+        try:
+            backends[name] = BACKENDS[name]()
+        except ImportError:
+            logger.warning(f"⏭️ {name} 미설치, 건너뜀")
+    return backends
+
+
+# ----------------------------------------------------------------------
+# 측정
+# ----------------------------------------------------------------------
+def percentile(samples: List[float], pct: float) -> float:
+    """nearest-rank 백분위수"""
+    ordered = sorted(samples)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def repeat_for(item_count: int) -> int:
+    if item_count <= 100:
+        return 30
+    if item_count <= 1000:
+        return 10
+    return 5
+
+
+def measure(fn: Callable, repeat: int, warmup_sec: float = 0.2) -> Dict:
+    # 워밍업 (작은 페이지는 캐시/CPU 클럭이 안정될 때까지 여러 번 실행)
+    warmup_started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+        if time.perf_counter() - warmup_started >= warmup_sec:
+            break
+    # timeit과 같이 측정 중에는 GC를 끄고, 반복 사이에 직접 수집해 이전 반복의 쓰레기가 끼어들지 않도록 함
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'samples': samples, 'peak_bytes': peak}
+
+
+def calibrate() -> float:
+    """
+    기계 성능 보정용 고정 작업 소요 시간
+    공유 CI처럼 실행 도중 속도가 바뀌는 환경을 고려해 단계마다 측정 직후 다시 재고, 결과마다 기록합니다.
+    """
+    def work():
+        digest = b''
+        for i in range(20000):
+            digest = hashlib.sha256(digest + str(i).encode()).digest()
+        return sorted(str(i) for i in range(50000))
+    return min(measure(work, 3, warmup_sec=0)['samples'])
+
+
+def run_benchmarks(sizes: List[int], backend_names: List[str]) -> List[Dict]:
+    results = []
+    backends = available_backends(backend_names)
+
+    def record(page: str, items: int, backend: str, stage: str, fn: Callable, repeat: int):
+        stats = measure(fn, repeat)
+        calibration_ms = calibrate() * 1000
+        p50 = percentile(stats['samples'], 50)
+        result = {
+            'page': page,
+            'items': items,
+            'backend': backend,
+            'stage': stage,
+            'p50_ms': round(p50 * 1000, 4),
+            'p99_ms': round(percentile(stats['samples'], 99) * 1000, 4),
+            'min_ms': round(min(stats['samples']) * 1000, 4),
+            'throughput': round(items / p50, 1) if p50 > 0 else None,
+            'peak_kb': round(stats['peak_bytes'] / 1024, 1),
+            'samples': len(stats['samples']),
+            'calibration_ms': round(calibration_ms, 3)
+        }
+        results.append(result)
+        logger.info(
+            f"   {page:<17} {backend:<16} {stage:<14} p50 {result['p50_ms']:>10.3f}ms  "
+            f"p99 {result['p99_ms']:>10.3f}ms  {result['throughput'] or 0:>12,.0f} items/s  {result['peak_kb']:>10,.1f}KB"
+        )
+
+    for page_name, html in benchmark_pages(sizes).items():
+        raw_rows = None
+        for backend_name, backend in backends.items():
+            tree = backend['parse'](html)
+            items = backend['select'](tree)
+            rows = backend['extract'](items)
+            repeat = repeat_for(len(items))
+            record(page_name, len(items), backend_name, 'parse', lambda: backend['parse'](html), repeat)
+            record(page_name, len(items), backend_name, 'select', lambda: backend['select'](tree), repeat)
+            record(page_name, len(items), backend_name, 'extract', lambda: backend['extract'](items), repeat)
+            raw_rows = raw_rows or rows
+
+        for parser_backend in available_parser_backends():
+            parser = KBCrawler.LIST_SELECTOR.compile(parser_backend)
+            count = len(parser.extract(html))
+            record(page_name, count, f'items:{parser_backend}', 'parse_items',
+                   lambda: parser.extract(html), repeat_for(count))
+
+        if not raw_rows:
+            continue
+
+        # 전처리 단계는 파서와 무관하므로 페이지당 한 번만 측정
+        raw_records = [{
+            'bank_name': 'KB', 'product_name': name, 'product_type': '신용대출',
+            'rate': '4.2', 'limit': limit, 'fee': '1.5', 'waiver': '36'
+        } for name, limit in raw_rows]
+        count, repeat = len(raw_records), repeat_for(len(raw_records))
+        limits = [r['limit'] for r in raw_records]
+        record(page_name, count, '-', 'clean_rate', lambda: [LoanDataCleaner.clean_rate(r['rate']) for r in raw_records], repeat)
+        record(page_name, count, '-', 'clean_limit', lambda: [LoanDataCleaner.clean_limit(v) for v in limits], repeat)
+        record(page_name, count, '-', 'clean_fee', lambda: [LoanDataCleaner.clean_fee_rate(r['fee']) for r in raw_records], repeat)
+        record(page_name, count, '-', 'clean_waiver', lambda: [LoanDataCleaner.clean_waiver_months(r['waiver']) for r in raw_records], repeat)
+        record(page_name, count, '-', 'clean_row', lambda: [LoanDataCleaner.parse_product_row(r) for r in raw_records], repeat)
+        record(page_name, count, '-', 'clean_batch', lambda: LoanDataCleaner.parse_product_records(raw_records), repeat)
+
+        import pandas as pd
+        products = [LoanDataCleaner.parse_product_row(r) for r in raw_records]
+        parsed = pd.DataFrame(products)
+        record(page_name, count, '-', 'validate', lambda: LoanDataCleaner.validate_and_clean(parsed), repeat)
+        record(page_name, count, '-', 'clean_records', lambda: LoanDataCleaner.clean_products(products), repeat)
+
+    return results
+
+
+# ----------------------------------------------------------------------
+# 기준값 비교
+# ----------------------------------------------------------------------
+def _key(result: Dict) -> str:
+    return f"{result['page']}|{result['backend']}|{result['stage']}"
+
+
+def compare_with_baseline(results: List[Dict], baseline: Dict, tolerance: float, min_delta_ms: float) -> List[Dict]:
+    """
+    기준값 대비 느려진 단계 목록
+    - p50과 최솟값이 모두 (1 + tolerance)배를 넘고 차이가 min_delta_ms 이상일 때만 성능 저하로 판단
+      (일시적인 부하로 몇 개 샘플만 튀는 경우는 최솟값이 유지되므로 걸러짐)
+    """
+    regressions = []
+    for result in results:
+        base = baseline['results'].get(_key(result))
+        if base is None:
+            continue
+        scale = result['calibration_ms'] / base['calibration_ms'] if base.get('calibration_ms') else 1.0
+        expected = base['p50_ms'] * scale
+        expected_min = base.get('min_ms', base['p50_ms']) * scale
+        if (result['p50_ms'] > expected * (1 + tolerance)
+                and result['min_ms'] > expected_min * (1 + tolerance)
+                and result['p50_ms'] - expected > min_delta_ms):
+            regressions.append({**result, 'baseline_p50_ms': round(expected, 4)})
+    return regressions
+
+
+def save_baseline(results: List[Dict], path: Path = BASELINE_PATH):
+    baseline = {
+        'python': sys.version.split()[0],
+        'results': {
+            _key(r): {key: r[key] for key in ('p50_ms', 'p99_ms', 'min_ms', 'calibration_ms')}
+            for r in results
+        }
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='크롤링 파싱 경로 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='합성 페이지 상품 수')
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help='현재 결과를 기준값으로 저장')
+    parser.add_argument('--tolerance', type=float, default=1.0, help='허용 성능 저하 비율 (기본 1.0 = 2배, 전용 러너에서는 더 낮게)')
+    parser.add_argument('--min-delta-ms', type=float, default=2.0, help='이보다 작은 차이(ms)는 노이즈로 간주')
+    parser.add_argument('--output', type=Path, help='결과를 JSON으로 저장')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[logging.StreamHandler(sys.stdout)])
+    # validate_and_clean의 품질 리포트 로그가 반복 측정마다 출력되지 않도록 함
+    logging.getLogger(LoanDataCleaner.__module__).setLevel(logging.WARNING)
+    results = run_benchmarks(args.sizes, args.backends)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'results': results}, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        save_baseline(results, args.baseline)
+        logger.info(f"💾 기준값 저장: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        logger.warning(f"기준값 파일이 없어 비교를 건너뜁니다: {args.baseline}")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare_with_baseline(results, baseline, args.tolerance, args.min_delta_ms)
+    if regressions:
+        logger.error(f"❌ 성능 저하 {len(regressions)}건")
+        for r in regressions:
+            logger.error(f"   - {_key(r)}: {r['p50_ms']:.3f}ms (기준 {r['baseline_p50_ms']:.3f}ms)")
+        return 1
+    logger.info("✅ 기준값 대비 성능 저하 없음")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
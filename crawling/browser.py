@@ -0,0 +1,189 @@
+"""
+브라우저 프로필 (Chrome 실행 옵션)
+- 은행별로 프로필을 골라 Chrome을 띄웁니다. (CrawlingConfig.BROWSER_PROFILES / BANK_BROWSER_PROFILE)
+- lean 프로필: headless=new, 이미지/폰트/미디어/추적 스크립트 차단, eager 로드 전략, 워밍된 user-data-dir 재사용
+- debug 프로필: 화면이 뜨는 기존 방식 (선택자 확인용)
+
+리소스 차단은 두 단계로 적용합니다.
+    1. Chrome 환경설정(prefs)으로 이미지 로드 자체를 끔
+    2. CDP Network.setBlockedURLs로 리소스 유형별 확장자 패턴과 차단 도메인 패턴을 막음
+       (execute_cdp_cmd로는 요청 이벤트를 받을 수 없어 Fetch 도메인 대신 URL 패턴 방식 사용)
+"""
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import CrawlingConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_DATA_ROOT = Path(__file__).resolve().parent / 'state' / 'chrome_profiles'
+
+# 리소스 유형(CDP ResourceType 이름) -> 차단할 URL 패턴
+RESOURCE_TYPE_PATTERNS: Dict[str, List[str]] = {
+    'Image': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.bmp'],
+    'Font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'Media': ['*.mp4', '*.webm', '*.mp3', '*.ogg', '*.wav'],
+    'Stylesheet': ['*.css'],
+}
+
+
+def get_profile(name: Optional[str] = None, config: CrawlingConfig = None) -> Dict:
+    """프로필 설정 (없는 이름이면 기본 프로필)"""
+    config = config or CrawlingConfig()
+    name = name or config.BROWSER_PROFILE
+    if name not in config.BROWSER_PROFILES:
+        logger.warning(f"알 수 없는 브라우저 프로필 {name}, {config.BROWSER_PROFILE} 프로필을 사용합니다.")
+        name = config.BROWSER_PROFILE
+    return {'name': name, **config.BROWSER_PROFILES[name]}
+
+
+def profile_for_bank(bank_name: str, config: CrawlingConfig = None) -> str:
+    """은행별 프로필 이름 (BANK_BROWSER_PROFILE > BROWSER_PROFILE)"""
+    config = config or CrawlingConfig()
+    return config.BANK_BROWSER_PROFILE.get(bank_name, config.BROWSER_PROFILE)
+
+
+def blocked_url_patterns(profile: Dict) -> List[str]:
+    patterns = []
+    for resource_type in profile.get('block_resource_types', []):
+        patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, []))
+    patterns.extend(profile.get('block_url_patterns', []))
+    return patterns
+
+
+def build_chrome_options(profile: Dict, user_data_dir: Optional[Path] = None, config: CrawlingConfig = None):
+    """프로필과 공통 SELENIUM_OPTIONS로 ChromeOptions 구성"""
+    from selenium.webdriver.chrome.options import Options
+
+    config = config or CrawlingConfig()
+    common = config.SELENIUM_OPTIONS
+    options = Options()
+
+    headless = profile.get('headless', common['headless'])
+    if headless == 'new':
+        options.add_argument('--headless=new')
+    elif headless:
+        options.add_argument('--headless')
+    if common.get('disable_gpu'):
+        options.add_argument('--disable-gpu')
+    if common.get('no_sandbox'):
+        options.add_argument('--no-sandbox')
+    if common.get('disable_dev_shm_usage'):
+        options.add_argument('--disable-dev-shm-usage')
+    if common.get('window_size'):
+        options.add_argument(f"--window-size={common['window_size']}")
+    options.add_argument(f'--user-agent={config.USER_AGENT}')
+    for argument in profile.get('extra_args', []):
+        options.add_argument(argument)
+
+    if 'Image' in profile.get('block_resource_types', []):
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    options.page_load_strategy = profile.get('page_load_strategy', 'normal')
+    if user_data_dir is not None:
+        options.add_argument(f'--user-data-dir={user_data_dir}')
+    return options
+
+
+def apply_network_blocking(driver, profile: Dict):
+    """CDP로 차단 URL 패턴 등록 (Chrome 계열이 아니면 건너뜀)"""
+    patterns = blocked_url_patterns(profile)
+    if not patterns or not hasattr(driver, 'execute_cdp_cmd'):
+        return
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    except Exception as e:
+        logger.warning(f"리소스 차단 설정 실패 (전체 리소스를 받습니다): {e}")
+
+
+class ChromeDriverFactory:
+    """
+    프로필별 Chrome 생성기 (WebDriverPool의 factory)
+    - 워밍된 user-data-dir은 동시에 한 Chrome만 쓸 수 있으므로 '프로필/slot-N' 디렉터리를 빌려주고
+      드라이버가 종료되면 반납받아 다음 세션이 캐시/쿠키 DB를 그대로 재사용하게 합니다.
+    - 슬롯은 '프로필/slot-N.lock' 파일 잠금으로 프로세스 간에도 배타적입니다.
+      (작업 큐 워커처럼 생성기가 프로세스마다 따로 있어도 같은 디렉터리를 두 Chrome이 함께 쓰지 않음,
+       프로세스가 죽으면 OS가 잠금을 풀어 다음 실행이 그 슬롯을 다시 씀)
+    """
+
+    def __init__(self, config: CrawlingConfig = None, user_data_root: Optional[Path] = None):
+        self.config = config or CrawlingConfig()
+        self.user_data_root = Path(user_data_root or self.config.BROWSER_USER_DATA_ROOT or DEFAULT_USER_DATA_ROOT)
+        self._lock = threading.Lock()
+        # 프로필 -> {슬롯 번호: 잠금 파일}
+        self._slots_in_use: Dict[str, Dict[int, object]] = {}
+        self._driver_slots: Dict[int, tuple] = {}
+
+    def __call__(self, profile_name: Optional[str] = None):
+        from selenium import webdriver
+
+        profile = get_profile(profile_name, self.config)
+        slot = self._acquire_slot(profile['name']) if profile.get('reuse_user_data_dir') else None
+        user_data_dir = self.user_data_root / profile['name'] / f'slot-{slot}' if slot is not None else None
+        try:
+            driver = webdriver.Chrome(options=build_chrome_options(profile, user_data_dir, self.config))
+        except Exception:
+            if slot is not None:
+                self._release_slot(profile['name'], slot, broken=True)
+            raise
+        driver.set_page_load_timeout(self.config.PAGE_LOAD_TIMEOUT)
+        apply_network_blocking(driver, profile)
+        if slot is not None:
+            with self._lock:
+                self._driver_slots[id(driver)] = (profile['name'], slot)
+        return driver
+
+    def release(self, driver):
+        """드라이버 종료 후 user-data-dir 반납"""
+        with self._lock:
+            entry = self._driver_slots.pop(id(driver), None)
+        if entry is not None:
+            self._release_slot(*entry)
+
+    def _acquire_slot(self, profile_name: str) -> int:
+        """이 프로세스와 다른 프로세스 모두 쓰고 있지 않은 가장 작은 슬롯 번호"""
+        profile_dir = self.user_data_root / profile_name
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            in_use = self._slots_in_use.setdefault(profile_name, {})
+            slot = 0
+            while True:
+                if slot not in in_use:
+                    handle = _try_lock(profile_dir / f'slot-{slot}.lock')
+                    if handle is not None:
+                        in_use[slot] = handle
+                        return slot
+                slot += 1
+
+    def _release_slot(self, profile_name: str, slot: int, broken: bool = False):
+        if broken:
+            # 시작에 실패한 디렉터리는 손상되었을 수 있으므로 지우고 다음에 새로 만듦 (잠금을 가진 채로 삭제)
+            shutil.rmtree(self.user_data_root / profile_name / f'slot-{slot}', ignore_errors=True)
+        with self._lock:
+            handle = self._slots_in_use.get(profile_name, {}).pop(slot, None)
+        if handle is not None:
+            handle.close()
+
+
+def _try_lock(path: Path):
+    """
+    잠금 파일을 배타적으로 잠금 (기다리지 않음)
+    반환: 잠금을 가진 파일 객체 (close하면 해제) / 다른 곳에서 잠그고 있으면 None
+    """
+    handle = open(path, 'a+b')
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
@@ -0,0 +1,212 @@
+"""
+대량 UPSERT 적재기
+- 레코드를 건수/바이트 기준 청크로 나누어 동시에 전송 (동시 전송 수 제한)
+- 일시적 오류(네트워크, 429/5xx 등)는 지수 백오프로 재시도 (청크당 최대 MAX_RETRIES회 시도)
+- 충돌 키 없는 단순 INSERT(이력/시뮬레이션 결과)는 반영 여부를 알 수 없는 오류(응답 유실)를 재전송하지 않음 (중복 로우 방지)
+- 재시도로 해결되지 않는 청크는 이분할하여 문제 로우(poison row)만 격리
+- 청크별 결과를 구조화된 리포트(dict)로 반환
+- 레코드는 dict 또는 LoanProduct이며, LoanProduct는 청크를 전송할 때만 dict로 변환
+"""
+import json
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config import CrawlingConfig
+from .metrics import METRICS
+from .records import json_row
+
+logger = logging.getLogger(__name__)
+
+# 재시도하면 성공할 수 있는 PostgreSQL SQLSTATE 접두어 / PostgREST 코드
+_TRANSIENT_SQLSTATE_PREFIXES = ('08', '53', '57', '40001', '40P01')
+_TRANSIENT_POSTGREST_CODES = ('PGRST000', 'PGRST001', 'PGRST002', 'PGRST003')
+_TRANSIENT_HTTP_STATUS = (408, 425, 429, 500, 502, 503, 504)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """재시도 대상 오류인지 판별 (제약 조건 위반/스키마 오류 등은 재시도하지 않음)"""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    try:
+        import httpx
+        if isinstance(error, httpx.TransportError):
+            return True
+    except ImportError:
+        pass
+
+    code = getattr(error, 'code', None)
+    if code is None:
+        return False
+    code = str(code)
+    if code.isdigit() and int(code) in _TRANSIENT_HTTP_STATUS:
+        return True
+    return code.startswith(_TRANSIENT_SQLSTATE_PREFIXES) or code in _TRANSIENT_POSTGREST_CODES
+
+
+def is_ambiguous_error(error: Exception) -> bool:
+    """서버가 요청을 이미 반영했는지 알 수 없는 오류 (응답 유실 / 게이트웨이 시간 초과)"""
+    try:
+        import httpx
+        if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)):
+            return False
+        if isinstance(error, httpx.TransportError):
+            return True
+    except ImportError:
+        pass
+    if isinstance(error, ConnectionRefusedError):
+        return False
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    # 그 밖의 PostgREST/DB 오류 응답은 트랜잭션이 롤백된 것이므로 다시 보내도 안전
+    return str(getattr(error, 'code', '')) in ('408', '502', '504')
+
+
+def row_size(row: Dict) -> int:
+    """JSON 직렬화 기준 로우 크기(byte)"""
+    return len(json.dumps(json_row(row), ensure_ascii=False, default=str).encode('utf-8'))
+
+
+class BulkLoader:
+    """청크 단위 UPSERT 적재기 (client는 supabase Client 또는 LocalSupabaseClient)"""
+
+    def __init__(
+        self,
+        client,
+        table: str,
+        on_conflict: str,
+        chunk_size: Optional[int] = None,
+        max_chunk_bytes: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.client = client
+        self.table = table
+        self.on_conflict = on_conflict
+        self.chunk_size = chunk_size or CrawlingConfig.UPSERT_CHUNK_SIZE
+        self.max_chunk_bytes = max_chunk_bytes or CrawlingConfig.UPSERT_MAX_CHUNK_BYTES
+        self.max_workers = max_workers or CrawlingConfig.UPSERT_MAX_WORKERS
+        self.max_retries = CrawlingConfig.MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = CrawlingConfig.UPSERT_RETRY_BACKOFF if backoff_base is None else backoff_base
+        self._sleep = sleep
+
+    def make_chunks(self, records: List[Dict]) -> List[Tuple[int, List[Dict], int]]:
+        """(시작 인덱스, 로우 목록, 바이트 크기) 청크 목록 생성"""
+        chunks = []
+        start, rows, size = 0, [], 0
+        for i, row in enumerate(records):
+            row_bytes = row_size(row)
+            if rows and (len(rows) >= self.chunk_size or size + row_bytes > self.max_chunk_bytes):
+                chunks.append((start, rows, size))
+                start, rows, size = i, [], 0
+            rows.append(row)
+            size += row_bytes
+        if rows:
+            chunks.append((start, rows, size))
+        return chunks
+
+    def load(self, records: List[Dict]) -> Dict:
+        """전체 레코드 적재 후 리포트 반환"""
+        started = time.perf_counter()
+        chunks = self.make_chunks(records)
+        workers = max(1, min(self.max_workers, len(chunks)))
+        logger.info(f"📦 {self.table} 적재 시작: {len(records)}건 / 청크 {len(chunks)}개 / 동시 전송 {workers}")
+
+        with METRICS.span('upsert', table=self.table), \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix='upsert') as executor:
+            chunk_reports = list(executor.map(
+                lambda args: self._load_chunk(*args),
+                [(index, start, rows, size) for index, (start, rows, size) in enumerate(chunks)]
+            ))
+
+        failed_rows = [row for report in chunk_reports for row in report['failed_rows']]
+        loaded = sum(report['loaded'] for report in chunk_reports)
+        report = {
+            'table': self.table,
+            'success': not failed_rows,
+            'total_rows': len(records),
+            'loaded_rows': loaded,
+            'failed_row_count': len(failed_rows),
+            'failed_rows': failed_rows,
+            'chunks': chunk_reports,
+            'elapsed_sec': round(time.perf_counter() - started, 3)
+        }
+        METRICS.incr('rows_loaded', loaded, table=self.table)
+        METRICS.incr('rows_failed', len(failed_rows), table=self.table)
+        METRICS.incr('upsert_requests', sum(chunk['attempts'] for chunk in chunk_reports), table=self.table)
+        if failed_rows:
+            logger.warning(f"⚠️ {self.table} 적재 일부 실패: 성공 {loaded}건 / 실패 {len(failed_rows)}건")
+        else:
+            logger.info(f"✅ {self.table} 적재 완료: {loaded}건 ({report['elapsed_sec']:.2f}초)")
+        return report
+
+    def _load_chunk(self, index: int, start: int, rows: List[Dict], size: int) -> Dict:
+        started = time.perf_counter()
+        report = {
+            'chunk': index,
+            'offset': start,
+            'rows': len(rows),
+            'bytes': size,
+            'attempts': 0,
+            'splits': 0,
+            'loaded': 0,
+            'failed_rows': []
+        }
+        self._upsert_or_bisect(rows, start, report)
+        if not report['failed_rows']:
+            report['status'] = 'success'
+        elif report['loaded']:
+            report['status'] = 'partial'
+        else:
+            report['status'] = 'failed'
+        report['elapsed_sec'] = round(time.perf_counter() - started, 3)
+        return report
+
+    def _upsert_or_bisect(self, rows: List[Dict], offset: int, report: Dict):
+        """전송 실패 시 절반씩 나누어 다시 보내 문제 로우만 남김"""
+        try:
+            self._upsert_with_retry(rows, report)
+            report['loaded'] += len(rows)
+            return
+        except Exception as e:
+            # 재시도를 모두 소진한 일시적 오류(DB 장애 등)는 나눠 보내도 소용없으므로 청크 전체 실패 처리
+            if len(rows) == 1 or is_transient_error(e):
+                if len(rows) == 1:
+                    row = rows[0]
+                    logger.error(f"❌ 문제 로우 격리: {row.get('bank_name')} / {row.get('product_name')} - {e}")
+                for i, row in enumerate(rows):
+                    report['failed_rows'].append({
+                        'index': offset + i,
+                        'bank_name': row.get('bank_name'),
+                        'product_name': row.get('product_name'),
+                        'error': str(e)
+                    })
+                return
+        report['splits'] += 1
+        mid = len(rows) // 2
+        self._upsert_or_bisect(rows[:mid], offset, report)
+        self._upsert_or_bisect(rows[mid:], offset + mid, report)
+
+    def _upsert_with_retry(self, rows: List[Dict], report: Dict):
+        payload = [json_row(row) for row in rows]
+        max_attempts = max(1, self.max_retries)
+        for attempt in range(max_attempts):
+            report['attempts'] += 1
+            try:
+                self.client.table(self.table).upsert(payload, on_conflict=self.on_conflict).execute()
+                return
+            except Exception as e:
+                if attempt + 1 >= max_attempts or not is_transient_error(e):
+                    raise
+                if not self.on_conflict and is_ambiguous_error(e):
+                    # 충돌 키가 없으면 이미 반영된 청크를 다시 보냈을 때 같은 로우가 한 번 더 들어감
+                    logger.error(f"❌ {self.table} 응답 유실, 중복 적재를 막기 위해 재시도하지 않습니다: {e}")
+                    raise
+                # 지수 백오프 + 지터 (동시 전송 청크들이 한꺼번에 재시도하지 않도록)
+                delay = self.backoff_base * (2 ** attempt) * random.uniform(0.5, 1.5)
+                logger.warning(f"🔁 청크 재시도 {attempt + 1}/{max_attempts - 1} ({delay:.1f}초 후): {e}")
+                self._sleep(delay)
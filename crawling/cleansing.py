@@ -1,18 +1,39 @@
 """
 대출 상품 데이터 전처리 (Cleansing) 클래스
 - 데이터 진단 기능 및 NaN 처리 보강
+- 파싱 결과는 LoanProduct(__slots__ 레코드), 정제는 clean_products()가 레코드에 바로 적용 (crawling/records.py)
+  validate_and_clean()은 DataFrame 입력용으로 유지
 """
 import pandas as pd
 import numpy as np
 import re
-from typing import Optional, Dict, List
+from typing import Iterable, Optional, Dict, List
 import logging
 
+from .metrics import METRICS
+from .records import LoanProduct, ProductBatch, PRODUCT_FIELDS
+
 logger = logging.getLogger(__name__)
 
+# 정규식 사전 컴파일 (로우 단위/배치 경로 공용)
+_NUMBER_PATTERN = re.compile(r'\d+\.?\d*')
+_FIRST_NUMBER_PATTERN = re.compile(r'(\d+\.?\d*)')
+# findall 결과의 첫 번째/두 번째 숫자와 동일 (두 번째는 첫 숫자 뒤 비숫자 구간 다음)
+_RATE_PAIR_PATTERN = re.compile(r'(\d+\.?\d*)\D*(\d+\.?\d*)?')
+_INT_PATTERN = re.compile(r'(\d+)')
+
+# 한도 단위 (판별 순서 중요: '천만'/'백만'이 '만'보다 먼저)
+_LIMIT_UNITS = [('억', 100_000_000), ('천만', 10_000_000), ('백만', 1_000_000), ('만', 10_000)]
+
 class LoanDataCleaner:
     """대출 상품 데이터 전처리 클래스"""
     
+    @staticmethod
+    def clean_products(products: Iterable) -> ProductBatch:
+        """상품 레코드(LoanProduct 또는 dict) 정제 - validate_and_clean과 같은 규칙, DataFrame 변환 없음"""
+        batch = products if isinstance(products, ProductBatch) else ProductBatch(products)
+        return batch.clean()
+
     @staticmethod
     def validate_and_clean(df: pd.DataFrame) -> pd.DataFrame:
         logger.info("--- 전처리 및 데이터 품질 검사 시작 ---")
@@ -23,26 +44,30 @@ class LoanDataCleaner:
         
         # 1. 타입 변환 및 NaN 방어 (Supabase JSON 에러 방지)
         # float 타입에서 NaN은 JSON 직렬화가 안 되므로 미리 처리합니다.
-        working_df['base_rate'] = pd.to_numeric(working_df['base_rate'], errors='coerce').fillna(4.0)
-        working_df['additional_rate'] = pd.to_numeric(working_df['additional_rate'], errors='coerce').fillna(0.0)
-        working_df['max_limit'] = pd.to_numeric(working_df['max_limit'], errors='coerce').fillna(0).astype(int)
+        with METRICS.span('clean_step', step='coerce'):
+            working_df['base_rate'] = pd.to_numeric(working_df['base_rate'], errors='coerce').fillna(4.0)
+            working_df['additional_rate'] = pd.to_numeric(working_df['additional_rate'], errors='coerce').fillna(0.0)
+            working_df['max_limit'] = pd.to_numeric(working_df['max_limit'], errors='coerce').fillna(0).astype(int)
         
         # 2. DB 제약 조건 검증 (Check Constraint: max_limit > 0)
         # 한도가 '국가보훈부 추천금액'처럼 텍스트로 수집되어 0이 된 데이터들 제외
-        working_df = working_df[working_df['max_limit'] > 0]
+        with METRICS.span('clean_step', step='limit_filter'):
+            working_df = working_df[working_df['max_limit'] > 0]
         limit_filtered = initial_count - len(working_df)
         if limit_filtered > 0:
             logger.info(f"   ⚠️ [필터링] 한도 정보 미비(0원) 상품 {limit_filtered}건 제외")
 
         # 3. 중복 데이터 제거
-        before_dedup = len(working_df)
-        working_df = working_df.drop_duplicates(subset=['bank_name', 'product_name'], keep='last')
-        dedup_count = before_dedup - len(working_df)
+        with METRICS.span('clean_step', step='dedup'):
+            before_dedup = len(working_df)
+            working_df = working_df.drop_duplicates(subset=['bank_name', 'product_name'], keep='last')
+            dedup_count = before_dedup - len(working_df)
         if dedup_count > 0:
             logger.info(f"   ⚠️ [필터링] 중복 수집 상품 {dedup_count}건 제거")
 
         # 4. 필수 필드 검증 (상품명, 은행명)
-        working_df = working_df.dropna(subset=['bank_name', 'product_name'])
+        with METRICS.span('clean_step', step='required'):
+            working_df = working_df.dropna(subset=['bank_name', 'product_name'])
         
         # 5. 최종 데이터 요약 출력
         logger.info(f"📊 전처리 분석 결과:")
@@ -51,7 +76,8 @@ class LoanDataCleaner:
         logger.info(f"   - 탈락 수치: {initial_count - len(working_df)}건")
 
         # PostgreSQL/Supabase 호환성을 위한 최종 변환
-        return working_df.replace({np.nan: None})
+        with METRICS.span('clean_step', step='to_records'):
+            return working_df.replace({np.nan: None})
 
     @staticmethod
     def clean_rate(rate_text: str) -> Optional[Dict[str, float]]:
@@ -59,7 +85,7 @@ class LoanDataCleaner:
             if not rate_text or rate_text.strip() == '':
                 return {'base_rate': 4.0, 'additional_rate': 0.0}
             cleaned = rate_text.replace('%', '').replace('연', '').replace(' ', '')
-            numbers = re.findall(r'\d+\.?\d*', cleaned)
+            numbers = _NUMBER_PATTERN.findall(cleaned)
             if len(numbers) >= 2:
                 min_rate = float(numbers[0])
                 max_rate = float(numbers[1])
@@ -80,7 +106,7 @@ class LoanDataCleaner:
             
             # 2. 숫자(소수점 포함) 추출 로직 강화
             # (\d+\.?\d*) -> 3.5 같은 형태를 통째로 잡음
-            match_num = re.search(r'(\d+\.?\d*)', text)
+            match_num = _FIRST_NUMBER_PATTERN.search(text)
             if not match_num: return 0
             
             value = float(match_num.group(1))
@@ -105,32 +131,33 @@ class LoanDataCleaner:
             return 0
 
     @staticmethod
-    def parse_product_row(raw_data: Dict) -> Optional[Dict]:
-        try:
-            rate_info = LoanDataCleaner.clean_rate(raw_data.get('rate', ''))
-            limit = LoanDataCleaner.clean_limit(raw_data.get('limit', ''))
-            fee_rate = LoanDataCleaner.clean_fee_rate(raw_data.get('fee', ''))
-            waiver_months = LoanDataCleaner.clean_waiver_months(raw_data.get('waiver', ''))
+    def parse_product_row(raw_data: Dict) -> Optional[LoanProduct]:
+        with METRICS.span('clean_step', step='parse_row'):
+            try:
+                rate_info = LoanDataCleaner.clean_rate(raw_data.get('rate', ''))
+                limit = LoanDataCleaner.clean_limit(raw_data.get('limit', ''))
+                fee_rate = LoanDataCleaner.clean_fee_rate(raw_data.get('fee', ''))
+                waiver_months = LoanDataCleaner.clean_waiver_months(raw_data.get('waiver', ''))
             
-            return {
-                'bank_name': raw_data.get('bank_name'),
-                'product_name': raw_data.get('product_name'),
-                'product_type': raw_data.get('product_type', '신용대출'),
-                'base_rate': float(rate_info['base_rate']),
-                'additional_rate': float(rate_info['additional_rate']),
-                'max_limit': int(limit),
-                'early_repay_fee_rate': float(fee_rate),
-                'fee_waiver_months': int(waiver_months),
-                'salary_transfer_discount': 0.3
-            }
-        except Exception as e:
-            logger.error(f"로우 파싱 실패: {e}")
-            return None
+                return LoanProduct(
+                    bank_name=raw_data.get('bank_name'),
+                    product_name=raw_data.get('product_name'),
+                    product_type=raw_data.get('product_type', '신용대출'),
+                    base_rate=float(rate_info['base_rate']),
+                    additional_rate=float(rate_info['additional_rate']),
+                    max_limit=int(limit),
+                    early_repay_fee_rate=float(fee_rate),
+                    fee_waiver_months=int(waiver_months),
+                    salary_transfer_discount=0.3
+                )
+            except Exception as e:
+                logger.error(f"로우 파싱 실패: {e}")
+                return None
 
     @staticmethod
     def clean_fee_rate(fee_text: str) -> float:
         try:
-            numbers = re.findall(r'\d+\.?\d*', str(fee_text))
+            numbers = _NUMBER_PATTERN.findall(str(fee_text))
             return float(numbers[0]) if numbers else 1.5
         except: return 1.5
 
@@ -139,8 +166,173 @@ class LoanDataCleaner:
         try:
             text = str(waiver_text)
             if '년' in text:
-                match = re.search(r'(\d+)', text)
+                match = _INT_PATTERN.search(text)
                 return int(match.group(1)) * 12 if match else 36
-            match = re.search(r'(\d+)', text)
+            match = _INT_PATTERN.search(text)
             return int(match.group(1)) if match else 36
-        except: return 36
\ No newline at end of file
+        except: return 36
+
+    # ------------------------------------------------------------------
+    # 배치(컬럼 단위) 전처리 - 보관된 원본 덤프 대량 재처리용
+    # ------------------------------------------------------------------
+    @staticmethod
+    def parse_product_frame(raw_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        parse_product_row의 배치 버전
+        - rate/limit/fee/waiver 컬럼을 사전 컴파일된 정규식과 pandas 벡터 연산으로 한 번에 파싱
+        - 결과는 로우 단위 경로(parse_product_row)와 동일합니다.
+        - DataFrame 특성상 결측값(NaN)은 키가 없는 것과 같이 취급합니다. (product_type은 '신용대출')
+        """
+        index = raw_df.index
+
+        def column(name: str) -> pd.Series:
+            if name in raw_df.columns:
+                return raw_df[name].astype(object)
+            return pd.Series([None] * len(raw_df), index=index, dtype=object)
+
+        def nullable(series: pd.Series) -> pd.Series:
+            return series.where(series.notna(), None)
+
+        rate = LoanDataCleaner._parse_unique(column('rate'), LoanDataCleaner._clean_rate_column)
+        product_type = column('product_type')
+
+        return pd.DataFrame({
+            'bank_name': nullable(column('bank_name')),
+            'product_name': nullable(column('product_name')),
+            'product_type': product_type.where(product_type.notna(), '신용대출'),
+            'base_rate': rate['base_rate'],
+            'additional_rate': rate['additional_rate'],
+            'max_limit': LoanDataCleaner._parse_unique(column('limit'), LoanDataCleaner._clean_limit_column),
+            'early_repay_fee_rate': LoanDataCleaner._parse_unique(column('fee'), LoanDataCleaner._clean_fee_rate_column),
+            'fee_waiver_months': LoanDataCleaner._parse_unique(column('waiver'), LoanDataCleaner._clean_waiver_months_column),
+            'salary_transfer_discount': 0.3
+        }, index=index)
+
+    @staticmethod
+    def parse_product_records(raw_records: List[Dict]) -> List[LoanProduct]:
+        """원본 레코드 목록을 배치 전처리하여 parse_product_row 결과와 같은 LoanProduct 목록으로 반환"""
+        if not raw_records:
+            return []
+        frame = LoanDataCleaner.parse_product_frame(pd.DataFrame(raw_records))
+        # tolist()는 파이썬 기본 타입(int/float/str)으로 변환하므로 로우 단위 결과와 타입까지 동일
+        return [LoanProduct(*values) for values in zip(*(frame[c].tolist() for c in PRODUCT_FIELDS))]
+
+    @staticmethod
+    def _parse_unique(series: pd.Series, parse_column):
+        """
+        고유값만 파싱한 뒤 코드 배열로 펼침
+        보관 덤프는 같은 금리/한도 문구가 반복되므로 실제 파싱 횟수는 고유 문구 수로 줄어듭니다.
+        (문자열이 아닌 값이 섞인 컬럼은 1 == 1.0 == True처럼 서로 다른 값이 합쳐질 수 있어 전체를 그대로 파싱)
+        """
+        if pd.api.types.infer_dtype(series, skipna=True) not in ('string', 'empty'):
+            return parse_column(series)
+
+        codes, uniques = pd.factorize(series)
+        # 마지막 자리에 결측값 결과를 붙여 코드 -1(결측)을 그 위치로 보냄
+        candidates = pd.Series(list(uniques) + [None], dtype=object)
+        parsed = parse_column(candidates)
+        codes = np.where(codes < 0, len(uniques), codes)
+        result = parsed.take(codes)
+        result.index = series.index
+        return result
+
+    @staticmethod
+    def _is_str(series: pd.Series) -> pd.Series:
+        return series.map(lambda value: isinstance(value, str)).astype(bool)
+
+    @staticmethod
+    def _as_text(series: pd.Series) -> pd.Series:
+        """str()과 같은 문자열 변환 (문자열은 그대로, 나머지만 변환)"""
+        is_str = LoanDataCleaner._is_str(series)
+        if is_str.all():
+            return series
+        return series.where(is_str, series.map(str))
+
+    @staticmethod
+    def _clean_rate_column(series: pd.Series) -> pd.DataFrame:
+        # 문자열이 아니거나 공백뿐이면 기본값 (clean_rate의 예외/빈 값 처리와 동일)
+        base_rate = pd.Series(4.0, index=series.index)
+        additional_rate = pd.Series(0.0, index=series.index)
+
+        text = series[LoanDataCleaner._is_str(series)]
+        text = text[text.str.strip() != '']
+        cleaned = (
+            text.str.replace('%', '', regex=False)
+                .str.replace('연', '', regex=False)
+                .str.replace(' ', '', regex=False)
+        )
+        numbers = cleaned.str.extract(_RATE_PAIR_PATTERN)
+        first, second = numbers[0], numbers[1]
+
+        base_rate[first.index[first.isna()]] = 4.2  # KB 기본 평균값
+        has_first = first.notna()
+        base_rate[first.index[has_first]] = first[has_first].astype(float)
+
+        has_pair = has_first & second.notna()
+        if has_pair.any():
+            spread = second[has_pair].astype(float) - first[has_pair].astype(float)
+            # numpy 반올림과 결과가 다를 수 있어 파이썬 round를 그대로 사용
+            additional_rate[spread.index] = spread.map(lambda value: round(value, 4))
+
+        return pd.DataFrame({'base_rate': base_rate, 'additional_rate': additional_rate})
+
+    @staticmethod
+    def _clean_limit_column(series: pd.Series) -> pd.Series:
+        limit = pd.Series(0, index=series.index, dtype='int64')
+
+        valid = series[series.notna()]
+        text = (
+            LoanDataCleaner._as_text(valid)
+                .str.replace(',', '', regex=False)
+                .str.replace(' ', '', regex=False)
+        )
+        number = text.str.extract(_FIRST_NUMBER_PATTERN)[0]
+        matched = number.notna()
+        if not matched.any():
+            return limit
+        text, value = text[matched], number[matched].astype(float)
+
+        # 단위 판별: 억 > 천만 > 백만 > 만, 단위가 없고 1000 미만이면 억으로 추정
+        multiplier = pd.Series(np.where(value < 1000, 100_000_000, 1), index=value.index, dtype='int64')
+        unit_found = pd.Series(False, index=value.index)
+        for unit, unit_value in _LIMIT_UNITS:
+            has_unit = ~unit_found & text.str.contains(unit, regex=False)
+            multiplier[has_unit] = unit_value
+            unit_found |= has_unit
+
+        amount = value * multiplier
+        in_range = np.isfinite(amount) & (amount < 2 ** 63)
+        limit[amount.index[in_range]] = np.trunc(amount[in_range]).astype('int64')
+        if not in_range.all():
+            # int64 범위를 넘는 값은 파이썬 int로 처리 (inf는 clean_limit과 같이 0)
+            limit = limit.astype(object)
+            limit[amount.index[~in_range]] = amount[~in_range].map(
+                lambda v: int(v) if np.isfinite(v) else 0
+            )
+        return limit
+
+    @staticmethod
+    def _clean_fee_rate_column(series: pd.Series) -> pd.Series:
+        number = LoanDataCleaner._as_text(series).str.extract(_FIRST_NUMBER_PATTERN)[0]
+        fee_rate = pd.Series(1.5, index=series.index)
+        matched = number.notna()
+        fee_rate[number.index[matched]] = number[matched].astype(float)
+        return fee_rate
+
+    @staticmethod
+    def _clean_waiver_months_column(series: pd.Series) -> pd.Series:
+        text = LoanDataCleaner._as_text(series)
+        number = text.str.extract(_INT_PATTERN)[0]
+        months = pd.Series(36, index=series.index, dtype='int64')
+        matched = number.notna()
+        if not matched.any():
+            return months
+        try:
+            value = number[matched].astype('int64')
+        except (OverflowError, ValueError):
+            months = months.astype(object)
+            value = number[matched].map(int)
+        # '년' 단위는 개월로 환산
+        in_years = text[matched].str.contains('년', regex=False)
+        months[value.index] = value.where(~in_years, value * 12)
+        return months
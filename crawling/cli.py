@@ -0,0 +1,281 @@
+"""
+크롤링 파이프라인 명령행 진입점
+- 서브커맨드별로 필요한 모듈만 실행 시점에 임포트합니다.
+  (status 같은 가벼운 명령은 pandas/selenium/supabase를 로드하지 않아 cron/헬스 체크에서 빠르게 끝남)
+- 로깅도 명령을 실행할 때 설정하며, 로그 파일은 crawl 명령에서만 만듭니다.
+
+사용 예:
+    python -m crawling crawl                         # 수집 → 정제 → 적재 (기존 python -m crawling.main)
+    python -m crawling clean --output cleaned.jsonl  # 보관된 원본을 정제만 (DB 접속 없음)
+    python -m crawling load cleaned.jsonl            # 정제 결과 파일 적재
+    python -m crawling replay --since 2026-02-01     # 원본 재정제 후 적재
+    python -m crawling status --max-age-hours 26     # 최근 실행 상태 (헬스 체크: 이상 시 종료 코드 1)
+    python -m crawling queue run --workers 4         # 작업 큐 모드: 로컬 워커 4개로 나눠 수집 후 병합/적재
+"""
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _setup_logging(args: argparse.Namespace, log_file: bool = False):
+    from .main import setup_logging
+    setup_logging(level=logging.WARNING if args.quiet else logging.INFO, log_file=log_file)
+
+
+def cmd_crawl(args: argparse.Namespace) -> int:
+    _setup_logging(args, log_file=not args.no_log_file)
+    from .main import main
+    return main(banks=args.banks)
+
+
+def cmd_clean(args: argparse.Namespace) -> int:
+    _setup_logging(args)
+    from .replay import replay
+    summary = replay(args.paths, args.banks, args.since, args.until, args.workers, dry_run=True, output=args.output)
+    return 0 if summary['segments'] else 1
+
+
+def cmd_load(args: argparse.Namespace) -> int:
+    _setup_logging(args)
+    from .supabase_client import SupabaseManager, load_project_env
+    load_project_env()
+
+    records = []
+    with open(args.input, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                records.append(json.loads(line))
+    if not records:
+        logger.warning(f"⚠️ 적재할 레코드가 없습니다: {args.input}")
+        return 1
+    try:
+        supabase = SupabaseManager()
+    except Exception as e:
+        logger.error(f"❌ Supabase 연결 실패: {e}")
+        return 1
+    report = supabase.bulk_upsert_loan_products(records)
+    return 0 if report['success'] else 1
+
+
+def cmd_replay(args: argparse.Namespace) -> int:
+    _setup_logging(args)
+    from .replay import replay
+    summary = replay(args.paths, args.banks, args.since, args.until, args.workers, args.dry_run, args.output,
+                     args.load_live)
+    return 0 if summary.get('failed', 0) == 0 else 1
+
+
+def _work_queue(args: argparse.Namespace):
+    from .work_queue import WorkQueue
+    return WorkQueue(args.queue_path)
+
+
+def cmd_queue_enqueue(args: argparse.Namespace) -> int:
+    _setup_logging(args)
+    from .work_queue import QueueCoordinator
+    coordinator = QueueCoordinator(_work_queue(args), args.run_id)
+    coordinator.enqueue(args.banks)
+    sys.stdout.write(coordinator.run_id + '\n')
+    return 0
+
+
+def cmd_queue_work(args: argparse.Namespace) -> int:
+    _setup_logging(args)
+    from .work_queue import QueueWorker
+    stats = QueueWorker(_work_queue(args), args.run_id, args.worker_id).run(args.max_tasks, wait=args.wait)
+    return 0 if not stats['failed'] else 1
+
+
+def cmd_queue_merge(args: argparse.Namespace) -> int:
+    _setup_logging(args)
+    from .work_queue import QueueCoordinator
+    from .main import main
+    queue = _work_queue(args)
+    run_id = args.run_id or queue.latest_run_id()
+    if run_id is None:
+        logger.error("❌ 큐에 등록된 실행이 없습니다.")
+        return 1
+    QueueCoordinator(queue, run_id).wait(args.timeout)
+    return main(banks=args.banks, queue_run_id=run_id, queue_path=queue.path)
+
+
+def cmd_queue_run(args: argparse.Namespace) -> int:
+    _setup_logging(args)
+    from .work_queue import run_local
+    from .main import main
+    run_id = run_local(args.banks, args.workers, args.queue_path, args.run_id,
+                       log_level=logging.WARNING if args.quiet else logging.INFO)
+    return main(banks=args.banks, queue_run_id=run_id, queue_path=args.queue_path)
+
+
+def cmd_queue_status(args: argparse.Namespace) -> int:
+    queue = _work_queue(args)
+    run_id = args.run_id or queue.latest_run_id()
+    if run_id is None:
+        sys.stdout.write("큐에 등록된 실행이 없습니다.\n")
+        return 1
+    tasks = queue.tasks(run_id)
+    if args.json:
+        sys.stdout.write(json.dumps({'run_id': run_id, 'counts': queue.counts(run_id), 'tasks': tasks},
+                                    ensure_ascii=False, indent=2) + '\n')
+    else:
+        lines = [f"🗂️ 작업 큐 실행 {run_id}: {queue.counts(run_id)}"]
+        for task in tasks:
+            lines.append(
+                f"   - #{task['id']} {task['bank_name']} [{task['product_type']}] {task['status']} "
+                f"(시도 {task['attempts']}, 상품 {task['product_count'] if task['product_count'] is not None else '-'}건)"
+                + (f" {task['error']}" if task['error'] else '')
+            )
+        sys.stdout.write('\n'.join(lines) + '\n')
+    counts = queue.counts(run_id)
+    return 0 if not counts['failed'] else 1
+
+
+def collect_status() -> Dict:
+    """로컬 상태 파일만 읽어 최근 실행 정보 수집 (DB/무거운 모듈 없음)"""
+    from .archive import RAW_DATA_DIR, list_runs
+    from .metrics import DEFAULT_METRICS_DIR
+    from .offer_index import DEFAULT_INDEX_DIR, LATEST_FILE
+    from .config import CrawlingConfig
+
+    status: Dict = {'checked_at': datetime.now().isoformat(), 'last_run': None, 'metrics': None, 'offer_index': None}
+
+    runs = [run for run in list_runs(RAW_DATA_DIR) if run['status'] != 'legacy']
+    if runs:
+        run = runs[-1]
+        status['last_run'] = {
+            'run_id': run['run_id'],
+            'started_at': run['started_at'].isoformat() if run['started_at'] else None,
+            'status': run['status'],
+            'banks': sorted(run['segments'])
+        }
+
+    metrics_dir = Path(CrawlingConfig.METRICS_DIR or DEFAULT_METRICS_DIR)
+    summaries = sorted(metrics_dir.glob('*.json')) if metrics_dir.exists() else []
+    if summaries:
+        with open(summaries[-1], 'r', encoding='utf-8') as f:
+            metrics = json.load(f)
+        status['metrics'] = {
+            'run_id': metrics.get('run_id'),
+            'elapsed_sec': metrics.get('elapsed_sec'),
+            'peak_rss_bytes': metrics.get('peak_rss_bytes'),
+            'slowest_spans': [
+                {'name': span['name'], 'labels': span['labels'], 'total_sec': span['total_sec']}
+                for span in metrics.get('spans', [])[:3]
+            ]
+        }
+
+    pointer = DEFAULT_INDEX_DIR / LATEST_FILE
+    if pointer.exists():
+        with open(pointer, 'r', encoding='utf-8') as f:
+            status['offer_index'] = json.load(f)['version']
+    return status
+
+
+def cmd_status(args: argparse.Namespace) -> int:
+    status = collect_status()
+    problems = []
+    last_run = status['last_run']
+    if last_run is None:
+        problems.append('보관된 실행 기록이 없습니다.')
+    else:
+        if last_run['status'] != 'complete':
+            problems.append(f"최근 실행 상태: {last_run['status']}")
+        if args.max_age_hours and last_run['started_at']:
+            age_hours = (datetime.now() - datetime.fromisoformat(last_run['started_at'])).total_seconds() / 3600
+            if age_hours > args.max_age_hours:
+                problems.append(f"최근 실행이 {age_hours:.1f}시간 전입니다. (기준 {args.max_age_hours}시간)")
+    status['healthy'] = not problems
+    status['problems'] = problems
+
+    if args.json:
+        sys.stdout.write(json.dumps(status, ensure_ascii=False, indent=2) + '\n')
+    else:
+        lines = [f"{'✅' if status['healthy'] else '❌'} 크롤링 상태 ({status['checked_at'][:19]})"]
+        if last_run:
+            lines.append(f"   - 최근 실행: {last_run['run_id']} / {last_run['status']} / {', '.join(last_run['banks']) or '-'}")
+        if status['metrics']:
+            metrics = status['metrics']
+            lines.append(f"   - 소요 시간: {metrics['elapsed_sec']}초 (실행 {metrics['run_id']})")
+        if status['offer_index']:
+            lines.append(f"   - 최적 상품 인덱스: v{status['offer_index']}")
+        lines += [f"   - {problem}" for problem in problems]
+        sys.stdout.write('\n'.join(lines) + '\n')
+    return 0 if status['healthy'] else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from .replay import add_arguments
+
+    parser = argparse.ArgumentParser(prog='python -m crawling', description='대출 상품 크롤링 파이프라인')
+    parser.add_argument('-q', '--quiet', action='store_true', help='경고 이상만 출력')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    crawl = commands.add_parser('crawl', help='수집 → 정제 → 적재 전체 실행')
+    crawl.add_argument('--bank', action='append', dest='banks', help='은행 코드 (기본: TARGET_BANKS, 여러 번 지정 가능)')
+    crawl.add_argument('--no-log-file', action='store_true', help='crawling_<ts>.log 파일을 만들지 않음')
+    crawl.set_defaults(handler=cmd_crawl)
+
+    clean = add_arguments(commands.add_parser('clean', help='보관된 원본을 정제만 (DB 적재 없음)'))
+    clean.set_defaults(handler=cmd_clean)
+
+    load = commands.add_parser('load', help='정제 결과(JSON Lines) 파일 적재')
+    load.add_argument('input', help='clean --output으로 만든 파일')
+    load.set_defaults(handler=cmd_load)
+
+    replay = add_arguments(commands.add_parser('replay', help='보관된 원본을 다시 정제해 적재'))
+    replay.set_defaults(handler=cmd_replay)
+
+    status = commands.add_parser('status', help='최근 실행 상태 확인 (로컬 파일만 읽음)')
+    status.add_argument('--max-age-hours', type=float, help='최근 실행이 이보다 오래되면 이상으로 판단')
+    status.add_argument('--json', action='store_true', help='JSON으로 출력')
+    status.set_defaults(handler=cmd_status)
+
+    work_queue = commands.add_parser('queue', help='작업 큐 모드 (수집 계획을 여러 워커 프로세스/서버로 나눠 처리)')
+    work_queue.add_argument('--queue', dest='queue_path', type=Path, help='큐 DB 경로 (기본: QUEUE_PATH)')
+    queue_commands = work_queue.add_subparsers(dest='queue_command', required=True)
+
+    enqueue = queue_commands.add_parser('enqueue', help='수집 계획을 작업으로 등록하고 run_id 출력')
+    enqueue.add_argument('--bank', action='append', dest='banks', help='은행 코드 (기본: TARGET_BANKS)')
+    enqueue.add_argument('--run-id', help='실행 ID (같은 ID로 다시 등록하면 빠진 작업만 추가)')
+    enqueue.set_defaults(handler=cmd_queue_enqueue)
+
+    work = queue_commands.add_parser('work', help='작업을 임대해 수집하는 워커 실행')
+    work.add_argument('--run-id', help='이 실행의 작업만 처리 (기본: 모든 실행)')
+    work.add_argument('--worker-id', help='워커 이름 (기본: 호스트-PID)')
+    work.add_argument('--max-tasks', type=int, help='처리할 최대 작업 수')
+    work.add_argument('--wait', action='store_true', help='작업이 없어도 종료하지 않고 계속 대기')
+    work.set_defaults(handler=cmd_queue_work)
+
+    merge = queue_commands.add_parser('merge', help='남은 작업을 기다린 뒤 결과를 병합해 정제/적재')
+    merge.add_argument('--run-id', help='실행 ID (기본: 가장 최근 등록한 실행)')
+    merge.add_argument('--bank', action='append', dest='banks', help='병합할 은행 코드 (기본: 전체)')
+    merge.add_argument('--timeout', type=float, help='작업 완료 대기 시간(초), 지나면 완료된 작업만 병합')
+    merge.set_defaults(handler=cmd_queue_merge)
+
+    run = queue_commands.add_parser('run', help='등록 → 로컬 워커 실행 → 병합/적재를 한 번에')
+    run.add_argument('--bank', action='append', dest='banks', help='은행 코드 (기본: TARGET_BANKS)')
+    run.add_argument('--workers', type=int, help='로컬 워커 프로세스 수 (기본: QUEUE_WORKERS)')
+    run.add_argument('--run-id', help='중단된 실행 ID를 지정하면 남은 작업만 이어서 처리')
+    run.set_defaults(handler=cmd_queue_run)
+
+    queue_status = queue_commands.add_parser('status', help='실행의 작업 상태 확인')
+    queue_status.add_argument('--run-id', help='실행 ID (기본: 가장 최근 등록한 실행)')
+    queue_status.add_argument('--json', action='store_true', help='JSON으로 출력')
+    queue_status.set_defaults(handler=cmd_queue_status)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
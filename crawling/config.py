@@ -15,7 +15,8 @@ class CrawlingConfig:
     
     PRODUCT_TYPES = ['신용대출', '담보대출']
     
-    # 3. 디버깅을 위해 headless는 False로 설정 (화면이 떠야 확인 가능)
+    # 3. 공통 Chrome 옵션 (headless는 브라우저 프로필 설정이 우선, 16번 참고)
+    # 디버깅 시에는 화면이 뜨는 'debug' 프로필 사용
     SELENIUM_OPTIONS = {
         'headless': False, 
         'disable_gpu': True,
@@ -24,7 +25,126 @@ class CrawlingConfig:
         'window_size': '1920,1080'
     }
     
-    CRAWL_DELAY = 4  # 은행 사이트 로딩 속도 고려
+    CRAWL_DELAY = 4  # 은행 사이트 로딩 속도 고려 (적응형 요청 간격의 시작값, 19번 참고)
     PAGE_LOAD_TIMEOUT = 30
-    MAX_RETRIES = 3
-    USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
\ No newline at end of file
+    MAX_RETRIES = 3  # 은행 크롤링 / 청크 적재 최대 시도 횟수
+    USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+
+    # 4. 동시 크롤링 스케줄러 설정
+    MAX_CONCURRENT_BANKS = 4   # 동시에 실행할 은행 크롤러 수
+    DRIVER_POOL_SIZE = 2       # 재사용할 WebDriver 세션 수 (Chrome 메모리 고려)
+    DRIVER_ACQUIRE_TIMEOUT = 300
+    # 은행별 요청 간격(초) 재정의. 지정하지 않은 은행은 CRAWL_DELAY를 사용합니다.
+    BANK_CRAWL_DELAY: Dict[str, float] = {}
+
+    # 5. 페이지 수집 방식 (HTTP 우선, JS 렌더링 페이지만 Selenium)
+    # 'auto': HTTP로 먼저 받아보고 대상 요소가 없으면 Selenium으로 재수집
+    # 'static': 항상 HTTP / 'dynamic': 항상 Selenium
+    FETCH_MODE = 'auto'
+    RENDER_MODES: Dict[str, str] = {}   # URL별 수집 방식 고정
+    HTTP_TIMEOUT = 10
+    HTTP_POOL_SIZE = 10
+    ELEMENT_WAIT_TIMEOUT = 15
+
+    # 6. 변경 감지 (콘텐츠 지문) - 변경 없는 페이지/상품은 파싱과 DB 적재 생략
+    FINGERPRINT_ENABLED = True
+    FINGERPRINT_MAX_AGE_HOURS = 24 * 7   # 이 기간이 지나면 변경 여부와 무관하게 전체 재수집
+
+    # 7. DB 대량 적재 (청크 분할 UPSERT)
+    UPSERT_CHUNK_SIZE = 500
+    UPSERT_MAX_CHUNK_BYTES = 512 * 1024   # 청크당 최대 요청 본문 크기
+    UPSERT_MAX_WORKERS = 4                # 동시에 전송할 청크 수
+    UPSERT_RETRY_BACKOFF = 1.0            # 재시도 대기 기본값(초), 시도마다 2배
+
+    # 8. 원본 아카이브 (raw_data/<run_id>/<bank>.jsonl.gz)
+    ARCHIVE_COMPRESSION = 'gzip'   # 'gzip' | 'zstd'(zstandard 설치 필요) | 'none'
+    ARCHIVE_FLUSH_EVERY = 20       # N건마다 디스크에 flush (중단 시 손실 범위)
+
+    # 9. 목록 페이지 파서 (crawling/parsers.py)
+    PARSER_BACKEND = 'auto'        # 'auto'(selectolax > lxml > bs4) | 'selectolax' | 'lxml' | 'bs4'
+
+    # 10. 단계별 파이프라인 (추출 → 정제 → 적재)
+    PIPELINE_QUEUE_SIZE = 2        # 단계 사이 대기 가능한 은행 배치 수 (초과 시 앞 단계 대기)
+
+    # 11. 대환 시뮬레이션 배치 (crawling/simulation.py)
+    SIMULATION_CHUNK_SIZE = 1000   # 한 번에 계산할 부채 수 (메모리 ≈ 부채 수 × 상품 수 × 20 × 8byte)
+    SIMULATION_TOP_N = 3           # 부채별 recommended_products에 저장할 상품 수
+
+    # 12. 최적 상품 인덱스 (crawling/offer_index.py)
+    OFFER_INDEX_TOP_K = 20         # 상품 유형 × 한도 구간별로 저장할 상위 상품 수 (조회 가능한 최대 N)
+    OFFER_INDEX_KEEP = 14          # 로컬에 보관할 스냅샷 버전 수
+
+    # 13. 상품 조회 캐시 (crawling/product_cache.py)
+    PRODUCT_CACHE_ENABLED = True
+    PRODUCT_CACHE_TTL_SEC = 300          # 조회 결과 유효 시간 (초)
+    PRODUCT_CACHE_MAX_ENTRIES = 32       # bank_name 필터별 항목 수 상한 (초과 시 가장 오래 안 쓴 항목 제거)
+    PRODUCT_CACHE_SNAPSHOT = False       # True면 state/product_cache.json에 보관해 새 프로세스에서도 재사용
+
+    # 14. 금리 변경 이력 (crawling/rate_history.py)
+    RATE_HISTORY_ENABLED = True             # 바뀐 상품만 적재하고 변경 필드를 이벤트로 기록
+    RATE_HISTORY_TO_DB = True               # 이벤트를 loan_product_history 테이블에도 기록
+    RATE_HISTORY_CHECKPOINT_EVERY = 5000    # N개 이벤트마다 전체 상태 체크포인트 (시점 복원 시작점)
+
+    # 15. 실행 계측 (crawling/metrics.py)
+    METRICS_ENABLED = True
+    METRICS_DIR = None             # JSON 실행 요약 경로 (None이면 crawling/state/metrics)
+    METRICS_TEXTFILE = None        # Prometheus textfile 경로 (예: /var/lib/node_exporter/textfile/crawling.prom)
+    METRICS_TO_DB = False          # True면 crawling_run_metrics 테이블에도 기록
+
+    # 16. 브라우저 프로필 (crawling/browser.py)
+    BROWSER_PROFILE = 'lean'                     # 기본 프로필
+    BANK_BROWSER_PROFILE: Dict[str, str] = {}    # 은행별 재정의 (예: {'KB': 'debug'})
+    BROWSER_USER_DATA_ROOT = None                # 워밍된 user-data-dir 위치 (None이면 crawling/state/chrome_profiles)
+    BROWSER_PROFILES: Dict[str, Dict] = {
+        'lean': {
+            'headless': 'new',
+            'page_load_strategy': 'eager',       # DOMContentLoaded까지만 대기, 이후는 wait_selector로 대기
+            'block_resource_types': ['Image', 'Font', 'Media'],
+            'block_url_patterns': ['*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+                                   '*facebook.net*', '*criteo*', '*wcs.naver.net*'],
+            'reuse_user_data_dir': True,
+            'extra_args': ['--disable-extensions', '--disable-background-networking', '--disable-sync',
+                           '--disable-component-update', '--no-first-run', '--mute-audio'],
+        },
+        'debug': {
+            'headless': False,                   # 화면이 떠야 선택자를 확인할 수 있음
+            'page_load_strategy': 'normal',
+            'block_resource_types': [],
+            'block_url_patterns': [],
+            'reuse_user_data_dir': False,
+            'extra_args': [],
+        },
+    }
+
+    # 17. 상품 상세 페이지 (crawling/detail.py) - 실제 금리 범위/중도상환수수료/면제 기간
+    DETAIL_ENABLED = False           # 상세 선택자(KBCrawler.DETAIL_SELECTOR)를 실제 페이지로 확인하기 전까지 끔
+    DETAIL_MAX_PER_HOST = 4          # 같은 호스트에 동시에 보내는 상세 요청 수 상한 (프로세스 전체)
+    DETAIL_REQUEST_INTERVAL = 0.25   # 같은 호스트에 상세 요청을 시작하는 최소 간격(초)
+
+    # 18. 정제 상품 컬럼형 스냅샷 (crawling/snapshot_store.py, pyarrow 설치 시)
+    # 켜면(pyarrow 필요) 스냅샷에 전체 상품이 필요하므로 그 실행은 지문 기반 건너뛰기(6번)를 쓰지 않음
+    SNAPSHOT_STORE_ENABLED = False
+    SNAPSHOT_STORE_DIR = None            # None이면 crawling/state/product_snapshots
+    SNAPSHOT_COMPRESSION = 'zstd'        # Parquet 압축 코덱 ('zstd' | 'snappy' | 'gzip' | 'none')
+    SNAPSHOT_ROW_GROUP_SIZE = 50000      # row group 최대 행 수 (상품 유형/금리순 정렬, 통계 기반 건너뛰기 단위)
+
+    # 19. 적응형 요청 간격 / 서킷 브레이커 / 재시도 (crawling/throttle.py)
+    THROTTLE_MIN_DELAY = 1.0          # 응답이 빠를 때 줄일 수 있는 최소 요청 간격(초)
+    THROTTLE_MAX_DELAY = 30.0         # 느리거나 오류일 때 늘릴 수 있는 최대 요청 간격(초)
+    THROTTLE_BURST = 2                # 토큰 버킷 크기 (쉬었다가 연속으로 보낼 수 있는 요청 수)
+    THROTTLE_FAST_SEC = 2.0           # 이보다 빠른 응답이면 간격 × THROTTLE_SPEEDUP
+    THROTTLE_SLOW_SEC = 8.0           # 이보다 느린 응답이면 간격 × THROTTLE_BACKOFF
+    THROTTLE_SPEEDUP = 0.8
+    THROTTLE_BACKOFF = 2.0
+    CIRCUIT_FAILURE_THRESHOLD = 3     # 연속 실패 N회면 해당 은행 요청 차단
+    CIRCUIT_COOLDOWN_SEC = 120        # 차단 후 시험 요청까지 대기(초)
+    RETRY_BACKOFF_BASE = 2.0          # safe_crawl 재시도 대기 기본값(초), 시도마다 2배 (+-50% 지터)
+    RETRY_BACKOFF_MAX = 30.0
+
+    # 20. 작업 큐 모드 (crawling/work_queue.py) - 수집 계획을 작업으로 나눠 여러 워커 프로세스가 임대해 처리
+    QUEUE_PATH = None                 # None이면 crawling/state/work_queue.sqlite3 (같은 서버의 워커끼리 공유)
+    QUEUE_WORKERS = 2                 # queue run이 띄우는 로컬 워커 프로세스 수
+    QUEUE_LEASE_SEC = 300             # 작업 임대 시간(초), 하트비트 없이 지나면 다른 워커에게 재할당
+    QUEUE_HEARTBEAT_SEC = 30          # 작업 중 임대 연장 주기(초)
+    QUEUE_MAX_ATTEMPTS = 3            # 작업당 최대 시도 횟수 (임대 만료 포함)
+    QUEUE_POLL_SEC = 2.0              # 임대할 작업이 없을 때 다시 확인하는 간격(초)
@@ -1,56 +1,262 @@
 """
 은행 크롤러 베이스 클래스 (수정본)
 """
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from abc import ABC, abstractmethod
 import logging
-from typing import List, Dict
+import time
+from typing import List, Dict, Optional
+from .browser import ChromeDriverFactory, profile_for_bank
 from .config import CrawlingConfig
+from .detail import DetailFetcher
+from .fetchers import HttpFetcher, SeleniumFetcher, contains_selector
+from .fingerprint import FingerprintStore
+from .metrics import METRICS
+from .parsers import ItemSelector
+from .records import LoanProduct
+from .throttle import CircuitOpenError, retry_delay
 
 logger = logging.getLogger(__name__)
 
 class BaseBankCrawler(ABC):
     """은행 크롤러 베이스 클래스"""
     
+    # 하위 클래스에서 목록 페이지 선택자를 한 번만 선언 (parse_items 기본값)
+    LIST_SELECTOR: Optional[ItemSelector] = None
+    # 상품 상세 페이지 선택자 (선언한 크롤러만 상세 페이지 수집, 첫 번째 블록의 필드 사용)
+    DETAIL_SELECTOR: Optional[ItemSelector] = None
+    
     def __init__(self, bank_name: str):
         self.bank_name = bank_name
         self.driver = None
         self.config = CrawlingConfig()
+        # 스케줄러가 주입하는 공유 자원 (단독 실행 시에는 None)
+        self.driver_pool = None
+        self.politeness = None
+        self.last_error: Optional[str] = None
+        # 페이지 수집기 (HTTP 우선, 필요 시 Selenium)
+        self.http_fetcher: Optional[HttpFetcher] = None
+        self.selenium_fetcher = SeleniumFetcher(self)
+        self._render_modes: Dict[str, str] = dict(self.config.RENDER_MODES)
+        # 변경 감지용 지문 저장소 (main에서 주입, None이면 항상 전체 수집)
+        self.fingerprints: Optional[FingerprintStore] = None
+        self.unchanged_count = 0
+        # 원본 아카이브 (main에서 주입, 수집 즉시 한 줄씩 기록)
+        self.archive = None
+        # 브라우저 프로필 (BANK_BROWSER_PROFILE로 은행별 지정) / 단독 실행 시 사용할 Chrome 생성기
+        self.browser_profile = profile_for_bank(bank_name, self.config)
+        self._driver_factory: Optional[ChromeDriverFactory] = None
+        self._detail_fetcher: Optional[DetailFetcher] = None
+    
+    @property
+    def detail_pages_enabled(self) -> bool:
+        return self.config.DETAIL_ENABLED and self.DETAIL_SELECTOR is not None
     
     def setup_driver(self):
-        """Selenium 드라이버 설정"""
-        chrome_options = Options()
-        if self.config.SELENIUM_OPTIONS['headless']:
-            chrome_options.add_argument('--headless')
-        # ... (기존 옵션 설정 생략) ...
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.driver.set_page_load_timeout(self.config.PAGE_LOAD_TIMEOUT)
-        logger.info(f"{self.bank_name} 드라이버 설정 완료")
-    
-    def teardown_driver(self):
-        """드라이버 종료"""
-        if self.driver:
+        """Selenium 드라이버 설정 (풀이 주입된 경우 풀에서 대여, 은행별 브라우저 프로필 적용)"""
+        if self.driver_pool is not None:
+            with METRICS.span('setup_driver', bank=self.bank_name, source='pool'):
+                self.driver = self.driver_pool.acquire(self.browser_profile)
+            logger.info(f"{self.bank_name} 드라이버 풀에서 세션 대여 (프로필 {self.browser_profile})")
+            return
+        if self._driver_factory is None:
+            self._driver_factory = ChromeDriverFactory(self.config)
+        with METRICS.span('setup_driver', bank=self.bank_name, source='new'):
+            self.driver = self._driver_factory(self.browser_profile)
+        logger.info(f"{self.bank_name} 드라이버 설정 완료 (프로필 {self.browser_profile})")
+    
+    def teardown_driver(self, discard: bool = False):
+        """드라이버 종료 (풀 세션은 종료하지 않고 반납)"""
+        if not self.driver:
+            return
+        if self.driver_pool is not None:
+            self.driver_pool.release(self.driver, discard=discard)
+            logger.info(f"{self.bank_name} 드라이버 세션 반납")
+        else:
             self.driver.quit()
+            if self._driver_factory is not None:
+                self._driver_factory.release(self.driver)
             logger.info(f"{self.bank_name} 드라이버 종료")
+        self.driver = None
+    
+    def get_driver(self):
+        """드라이버가 실제로 필요한 시점에만 준비 (정적 페이지만 있는 은행은 Chrome을 띄우지 않음)"""
+        if self.driver is None:
+            self.setup_driver()
+        return self.driver
+    
+    def fetch_page(self, url: str, wait_selector: Optional[str] = None) -> Dict:
+        """
+        렌더링 방식에 맞춰 페이지 수집
+        - static: HTTP만 사용 / dynamic: Selenium만 사용
+        - auto: HTTP로 먼저 받아 wait_selector 요소가 있으면 사용하고, 없으면 Selenium으로 재수집
+        """
+        self.throttle()
+        mode = self._render_modes.get(url, self.config.FETCH_MODE)
+
+        if mode in ('auto', 'static'):
+            try:
+                if self.http_fetcher is None:
+                    self.http_fetcher = HttpFetcher(self.config)
+                # 상세 페이지를 수집하는 은행은 목록이 같아도 상세 링크가 필요하므로 조건부 요청을 보내지 않음
+                headers = None
+                if self.fingerprints and not self.detail_pages_enabled:
+                    headers = self.fingerprints.conditional_headers(url)
+                page = self._timed_fetch(self.http_fetcher, url, wait_selector, headers)
+                if page['status'] == 304:
+                    self._render_modes[url] = 'static'
+                    logger.info(f"⚡ {self.bank_name} 변경 없음 (304 Not Modified): {url}")
+                    return page
+                if mode == 'static' or not wait_selector or contains_selector(page['html'], wait_selector):
+                    self._render_modes[url] = 'static'
+                    logger.info(f"⚡ {self.bank_name} HTTP 수집 ({page['elapsed_sec']:.2f}초): {url}")
+                    return page
+                logger.info(f"🔁 {self.bank_name} JS 렌더링 페이지로 판단, Selenium 전환: {url}")
+            except Exception as e:
+                if mode == 'static':
+                    raise
+                logger.warning(f"{self.bank_name} HTTP 수집 실패, Selenium 전환: {e}")
+            # 같은 실행 안에서는 다시 HTTP를 시도하지 않음
+            self._render_modes[url] = 'dynamic'
+            self.throttle()
+
+        return self._timed_fetch(self.selenium_fetcher, url, wait_selector)
+    
+    def _timed_fetch(self, fetcher, url: str, wait_selector: Optional[str], headers: Optional[Dict] = None) -> Dict:
+        """수집 결과(소요 시간, 성공 여부)를 은행별 요청 제어에 반영 (간격 조정 / 서킷 브레이커)"""
+        started = time.perf_counter()
+        try:
+            page = fetcher.fetch(url, wait_selector, headers=headers)
+        except Exception:
+            self.record_response(time.perf_counter() - started, ok=False)
+            raise
+        self.record_response(page['elapsed_sec'], ok=True)
+        return page
+    
+    def page_unchanged(self, url: str, page: Dict) -> bool:
+        """이전 실행과 같은 목록 페이지인지 확인 (바뀐 페이지는 새 지문을 stage)"""
+        if self.fingerprints is None:
+            return False
+        html_hash = FingerprintStore.digest(page['html'])
+        headers = page.get('headers') or {}
+        if self.detail_pages_enabled:
+            # 금리는 상세 페이지에만 있으므로 목록이 같아도 건너뛰지 않음 (상품 지문에 상세 블록 포함)
+            self.fingerprints.stage_page(url, html_hash, headers.get('ETag'), headers.get('Last-Modified'))
+            return False
+        if page['status'] == 304 or self.fingerprints.page_unchanged(url, html_hash):
+            skipped = self.fingerprints.known_item_count(url)
+            self.unchanged_count += skipped
+            logger.info(f"⏭️ {self.bank_name} 변경 없는 페이지 건너뜀 (상품 {skipped}개): {url}")
+            return True
+        self.fingerprints.stage_page(url, html_hash, headers.get('ETag'), headers.get('Last-Modified'))
+        return False
+    
+    def parse_items(self, html: str, selector: Optional[ItemSelector] = None) -> List[Dict]:
+        """
+        선언된 선택자로 상품 블록별 필드 추출 (PARSER_BACKEND 설정에 따라 가장 빠른 파서 사용)
+        반환: [{'html': 상품 HTML 조각(지문용), <field>: 텍스트 또는 None, ...}]
+        """
+        selector = selector or self.LIST_SELECTOR
+        if selector is None:
+            raise NotImplementedError(f"{self.bank_name} 크롤러에 LIST_SELECTOR가 선언되지 않았습니다.")
+        parser = selector.compile(self.config.PARSER_BACKEND)
+        with METRICS.span('parse', bank=self.bank_name, backend=parser.backend):
+            items = parser.extract(html)
+        METRICS.incr('items_parsed', len(items), bank=self.bank_name)
+        return items
+    
+    def fetch_details(self, page_url: str, items: List[Dict], link_field: str = 'detail_url') -> List[Optional[Dict]]:
+        """
+        목록 상품들의 상세 페이지를 호스트별 동시 요청 상한 안에서 병렬 수집 (DETAIL_SELECTOR로 파싱)
+        반환: items 순서대로 상세 필드 dict, 상세 수집을 하지 않거나 실패한 상품은 None
+        """
+        if not self.detail_pages_enabled:
+            return [None] * len(items)
+        if self._detail_fetcher is None:
+            self._detail_fetcher = DetailFetcher(self, self.DETAIL_SELECTOR)
+        return self._detail_fetcher.fetch_all(page_url, [item.get(link_field) for item in items])
+    
+    def item_fingerprint(self, item_html, detail: Optional[Dict] = None) -> Optional[str]:
+        """상품 HTML 조각(+ 상세 블록)의 지문 (저장소가 없으면 계산하지 않음)"""
+        if self.fingerprints is None:
+            return None
+        if detail is not None:
+            return FingerprintStore.digest(str(item_html) + detail['html'])
+        return FingerprintStore.digest(str(item_html))
+    
+    def item_unchanged(self, url: str, item_hash: Optional[str]) -> bool:
+        """이전 실행과 같은 상품이면 지문만 이어서 보관하고 True"""
+        if item_hash is None or not self.fingerprints.item_known(url, item_hash):
+            return False
+        self.fingerprints.stage_items(url, [item_hash])
+        self.unchanged_count += 1
+        return True
+    
+    def remember_item(self, url: str, item_hash: Optional[str]):
+        """파싱에 성공한 상품의 지문 stage"""
+        if item_hash is not None:
+            self.fingerprints.stage_items(url, [item_hash])
+    
+    def archive_raw(self, raw_data: Dict):
+        """파싱 전 원본 레코드를 아카이브에 기록 (재처리/백필용)"""
+        if self.archive is not None:
+            self.archive.write(self.bank_name, raw_data)
+    
+    def throttle(self):
+        """같은 은행 사이트에 대한 적응형 요청 간격 준수 (서킷이 열려 있으면 CircuitOpenError)"""
+        if self.politeness is not None:
+            with METRICS.span('politeness_wait', bank=self.bank_name):
+                self.politeness.wait()
+    
+    def record_response(self, elapsed_sec: float, ok: bool):
+        if self.politeness is not None:
+            self.politeness.record(elapsed_sec, ok)
     
     @abstractmethod
-    def crawl(self) -> List[Dict]:
+    def crawl(self) -> List[LoanProduct]:
         """하위 클래스(KBCrawler 등)에서 구체적으로 구현할 로직"""
         pass
     
-    def safe_crawl(self) -> List[Dict]:
+    def safe_crawl(self) -> List[LoanProduct]:
         """
         [중요] main.py가 호출하는 실제 메서드
         에러 핸들링과 드라이버 생명주기를 관리합니다.
+        - crawl()이 실패하면 지수 백오프 + 지터 후 최대 MAX_RETRIES번까지 다시 시도
+        - 서킷 브레이커가 열린 경우(은행 장애)는 재시도하지 않고 바로 실패 처리
         """
         products = []
+        failed = False
+        self.last_error = None
+        max_attempts = max(1, self.config.MAX_RETRIES)
         try:
-            self.setup_driver()
-            products = self.crawl()  # 여기서 자식 클래스의 crawl()이 실행됨
-            logger.info(f"✅ {self.bank_name}: {len(products)}개 상품 크림링 성공")
-        except Exception as e:
-            logger.error(f"❌ {self.bank_name} 크롤링 실패: {e}")
+            for attempt in range(1, max_attempts + 1):
+                self.unchanged_count = 0
+                try:
+                    products = self.crawl()  # 여기서 자식 클래스의 crawl()이 실행됨
+                    failed = False
+                    logger.info(f"✅ {self.bank_name}: {len(products)}개 상품 크림링 성공")
+                    break
+                except Exception as e:
+                    failed = True
+                    self.last_error = str(e)
+                    if isinstance(e, CircuitOpenError) or attempt == max_attempts:
+                        logger.error(f"❌ {self.bank_name} 크롤링 실패 ({attempt}/{max_attempts}회): {e}")
+                        break
+                    delay = retry_delay(attempt, self.config)
+                    logger.warning(
+                        f"🔁 {self.bank_name} 크롤링 실패 ({attempt}/{max_attempts}회), {delay:.1f}초 후 재시도: {e}"
+                    )
+                    # 실패한 세션은 상태를 신뢰할 수 없으므로 폐기하고 다음 시도에서 새로 준비
+                    self.teardown_driver(discard=True)
+                    with METRICS.span('retry_backoff', bank=self.bank_name):
+                        time.sleep(delay)
+            if not failed:
+                self.last_error = None
         finally:
-            self.teardown_driver()
-        return products
\ No newline at end of file
+            # 실패한 세션은 상태를 신뢰할 수 없으므로 풀에 돌려놓지 않고 폐기
+            self.teardown_driver(discard=failed)
+            if self.archive is not None:
+                self.archive.close_segment(self.bank_name)
+            if self.http_fetcher is not None:
+                self.http_fetcher.close()
+                self.http_fetcher = None
+        return products
@@ -0,0 +1,154 @@
+"""
+상품 상세 페이지 동시 수집 (Detail Stage)
+- 목록 페이지에서 모은 상세 링크(a.title@href)를 호스트별 동시 요청 상한 안에서 병렬로 받아
+  실제 금리 범위 / 중도상환수수료 / 면제 기간을 같은 실행 안에서 파싱합니다.
+- 상세 페이지는 크롤러의 HttpFetcher 세션(keep-alive 연결 풀)을 여러 스레드가 함께 사용해 받습니다.
+  HTTP 응답에 상세 블록이 없으면(JS 렌더링) 크롤러의 Selenium 수집기로 재수집하며,
+  드라이버는 크롤러당 하나이므로 이 경로는 한 번에 하나씩 처리됩니다.
+- 호스트별 제한(HostLimiter)은 프로세스 전역으로 공유되어, 같은 호스트를 여러 크롤러가 요청해도 상한을 넘지 않습니다.
+  요청 간격은 적응형 토큰 버킷(DETAIL_REQUEST_INTERVAL에서 시작, 느리거나 오류면 확대)이며,
+  은행 서킷 브레이커가 열려 있으면 상세 요청도 보내지 않습니다. (상세 페이지 실패도 브레이커에 반영)
+- 파싱은 수집이 끝난 뒤 호출 스레드에서 합니다. (파서 객체를 스레드 간에 공유하지 않음)
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlsplit
+
+from .fetchers import HttpFetcher, contains_selector
+from .metrics import METRICS
+from .parsers import ItemSelector
+from .throttle import AdaptiveRateLimiter, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+class DetailExtractionError(RuntimeError):
+    """목록은 읽었지만 상세 단계를 통과한 상품이 하나도 없음 (상세 선택자/페이지 구조 변경 의심)"""
+
+
+class HostLimiter:
+    """호스트 하나에 대한 동시 요청 수 상한 + 적응형 요청 간격 (스레드 안전)"""
+
+    def __init__(self, max_concurrent: int, interval: float):
+        if max_concurrent < 1:
+            raise ValueError("호스트별 동시 요청 수는 1 이상이어야 합니다.")
+        self.max_concurrent = max_concurrent
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self.pacer = AdaptiveRateLimiter(interval, min_delay=interval)
+
+    @contextmanager
+    def slot(self):
+        with self._slots:
+            self.pacer.wait()
+            yield
+
+
+_HOST_LIMITERS: Dict[str, HostLimiter] = {}
+_HOST_LIMITERS_LOCK = threading.Lock()
+
+
+def host_limiter(url: str, config) -> HostLimiter:
+    """URL 호스트별 제한기 (프로세스 전역, 처음 요청한 설정값으로 생성)"""
+    host = urlsplit(url).netloc
+    with _HOST_LIMITERS_LOCK:
+        if host not in _HOST_LIMITERS:
+            _HOST_LIMITERS[host] = HostLimiter(config.DETAIL_MAX_PER_HOST, config.DETAIL_REQUEST_INTERVAL)
+        return _HOST_LIMITERS[host]
+
+
+class DetailFetcher:
+    """크롤러 하나의 상세 페이지 수집기"""
+
+    def __init__(self, crawler, selector: ItemSelector):
+        self.crawler = crawler
+        self.selector = selector
+        self.config = crawler.config
+        self._selenium_lock = threading.Lock()
+        # HTTP로 상세 블록을 받지 못한 적이 있으면 이후 상세 페이지는 바로 Selenium으로 수집
+        self._dynamic = False
+
+    def fetch_all(self, page_url: str, links: List[Optional[str]]) -> List[Optional[Dict]]:
+        """
+        상세 링크 목록(목록 페이지 기준 상대 경로 가능)을 동시에 수집/파싱
+        반환: 입력 순서대로 {'url', 'html', <field>: 텍스트 또는 None, ...} / 링크가 없거나 실패하면 None
+        """
+        urls = [urljoin(page_url, link) if link else None for link in links]
+        targets = sorted({url for url in urls if url})
+        if not targets:
+            return [None] * len(urls)
+
+        if self.crawler.http_fetcher is None:
+            self.crawler.http_fetcher = HttpFetcher(self.config)
+        workers = min(len(targets), self.config.DETAIL_MAX_PER_HOST)
+        with METRICS.span('detail_stage', bank=self.crawler.bank_name):
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='detail') as executor:
+                pages = dict(zip(targets, executor.map(self._fetch_one, targets)))
+            details = {url: self._parse(page) for url, page in pages.items()}
+
+        failed = sum(1 for detail in details.values() if detail is None)
+        logger.info(
+            f"📄 {self.crawler.bank_name} 상세 페이지 {len(targets) - failed}/{len(targets)}개 수집 "
+            f"(호스트별 동시 {workers})"
+        )
+        return [details.get(url) if url else None for url in urls]
+
+    def _fetch_one(self, url: str) -> Optional[Dict]:
+        item_selector = self.selector.item
+        limiter = host_limiter(url, self.config)
+        started = time.perf_counter()
+        try:
+            with limiter.slot():
+                self._check_circuit()
+                started = time.perf_counter()
+                with METRICS.span('detail_fetch', bank=self.crawler.bank_name):
+                    page = None
+                    if not self._dynamic:
+                        page = self.crawler.http_fetcher.fetch(url, item_selector)
+                        if not contains_selector(page['html'], item_selector):
+                            logger.info(f"🔁 {self.crawler.bank_name} 상세 페이지 JS 렌더링으로 판단, Selenium 전환")
+                            self._dynamic = True
+                            page = None
+                    if page is None:
+                        with self._selenium_lock:
+                            page = self.crawler.selenium_fetcher.fetch(url, item_selector)
+            self._record(limiter, time.perf_counter() - started, ok=True)
+            return page
+        except CircuitOpenError as e:
+            METRICS.incr('detail_pages', bank=self.crawler.bank_name, status='skipped')
+            logger.warning(f"{self.crawler.bank_name} 상세 페이지 건너뜀: {e}")
+            return None
+        except Exception as e:
+            self._record(limiter, time.perf_counter() - started, ok=False)
+            logger.warning(f"{self.crawler.bank_name} 상세 페이지 수집 실패: {url} ({e})")
+            return None
+
+    def _check_circuit(self):
+        politeness = self.crawler.politeness
+        if politeness is not None:
+            politeness.breaker.check()
+
+    def _record(self, limiter: HostLimiter, elapsed_sec: float, ok: bool):
+        """상세 요청 간격 조정 + 은행 서킷 브레이커 반영"""
+        METRICS.incr('detail_pages', bank=self.crawler.bank_name, status='ok' if ok else 'failed')
+        limiter.pacer.record(elapsed_sec, ok)
+        politeness = self.crawler.politeness
+        if politeness is not None:
+            if ok:
+                politeness.breaker.record_success()
+            else:
+                politeness.breaker.record_failure()
+
+    def _parse(self, page: Optional[Dict]) -> Optional[Dict]:
+        if page is None:
+            return None
+        parser = self.selector.compile(self.config.PARSER_BACKEND)
+        with METRICS.span('parse', bank=self.crawler.bank_name, backend=parser.backend, page='detail'):
+            blocks = parser.extract(page['html'])
+        if not blocks:
+            logger.warning(f"{self.crawler.bank_name} 상세 블록({self.selector.item})을 찾지 못함: {page['url']}")
+            return None
+        return {'url': page['url'], **blocks[0]}
@@ -0,0 +1,142 @@
+"""
+페이지 수집기 (Fetcher)
+- HttpFetcher: 서버 렌더링 페이지용 경량 HTTP 수집 (keep-alive 세션 풀, gzip)
+- SeleniumFetcher: JS 렌더링 페이지용 브라우저 수집
+Chrome 콜드 스타트가 크롤링 지연/메모리의 대부분이므로, 정적 페이지는 HTTP로만 수집합니다.
+"""
+import logging
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .config import CrawlingConfig
+from .metrics import METRICS
+from .parsers import SIMPLE_SELECTOR
+
+logger = logging.getLogger(__name__)
+
+
+def contains_selector(html: str, selector: str) -> bool:
+    """
+    HTML에 selector에 해당하는 요소가 있는지 빠르게 확인
+    (.class / #id 형태는 정규식으로, 그 외는 BeautifulSoup으로 판별)
+    """
+    if not html:
+        return False
+    match = SIMPLE_SELECTOR.match(selector.strip())
+    if match:
+        kind, name = match.groups()
+        attr = 'class' if kind == '.' else 'id'
+        pattern = rf'''\b{attr}\s*=\s*["'](?:[^"']*\s)?{re.escape(name)}(?:\s[^"']*)?["']'''
+        return re.search(pattern, html, re.IGNORECASE) is not None
+
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, 'html.parser').select_one(selector) is not None
+
+
+class BaseFetcher(ABC):
+    """페이지 수집기 베이스 클래스"""
+
+    mode = ''
+
+    @abstractmethod
+    def fetch(self, url: str, wait_selector: Optional[str] = None,
+              headers: Optional[Dict[str, str]] = None) -> Dict:
+        """
+        페이지 수집 결과 반환
+        {'url', 'mode', 'status', 'html', 'headers', 'elapsed_sec'}
+        """
+        pass
+
+    def close(self):
+        pass
+
+
+class HttpFetcher(BaseFetcher):
+    """requests 세션 기반 HTTP 수집기 (연결 재사용)"""
+
+    mode = 'http'
+
+    def __init__(self, config: CrawlingConfig = None):
+        self.config = config or CrawlingConfig()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.config.HTTP_POOL_SIZE,
+            pool_maxsize=self.config.HTTP_POOL_SIZE
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': self.config.USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Encoding': 'gzip, deflate',
+            'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8',
+            'Connection': 'keep-alive'
+        })
+
+    def fetch(self, url: str, wait_selector: Optional[str] = None,
+              headers: Optional[Dict[str, str]] = None) -> Dict:
+        """headers로 조건부 요청을 보내면 변경이 없을 때 status 304, html ''이 반환됩니다."""
+        started = time.perf_counter()
+        with METRICS.span('page_load', mode=self.mode):
+            response = self.session.get(url, headers=headers, timeout=self.config.HTTP_TIMEOUT)
+        METRICS.incr('pages_fetched', mode=self.mode, status=response.status_code)
+        response.raise_for_status()
+        # 헤더에 charset이 없으면 본문 기준으로 인코딩 추정 (EUC-KR 페이지 대비)
+        if 'charset' not in response.headers.get('Content-Type', '').lower():
+            response.encoding = response.apparent_encoding
+        return {
+            'url': url,
+            'mode': self.mode,
+            'status': response.status_code,
+            'html': response.text,
+            'headers': response.headers,
+            'elapsed_sec': time.perf_counter() - started
+        }
+
+    def close(self):
+        self.session.close()
+
+
+class SeleniumFetcher(BaseFetcher):
+    """WebDriver 기반 수집기 (드라이버는 크롤러가 처음 필요할 때 준비)"""
+
+    mode = 'selenium'
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+
+    def _page_load_strategy(self) -> str:
+        from .browser import get_profile
+        profile = getattr(self.crawler, 'browser_profile', None)
+        return get_profile(profile, self.crawler.config).get('page_load_strategy', 'normal')
+
+    def fetch(self, url: str, wait_selector: Optional[str] = None,
+              headers: Optional[Dict[str, str]] = None) -> Dict:
+        started = time.perf_counter()
+        driver = self.crawler.get_driver()
+        with METRICS.span('page_load', mode=self.mode):
+            driver.get(url)
+        wait = WebDriverWait(driver, self.crawler.config.ELEMENT_WAIT_TIMEOUT)
+        with METRICS.span('element_wait'):
+            if wait_selector:
+                # eager/none 로드 전략에서는 전체 load 이벤트 대신 필요한 요소만 기다림
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector)))
+            elif self._page_load_strategy() == 'none':
+                wait.until(lambda d: d.execute_script('return document.readyState') != 'loading')
+        METRICS.incr('pages_fetched', mode=self.mode, status=200)
+        return {
+            'url': url,
+            'mode': self.mode,
+            'status': 200,
+            'html': driver.page_source,
+            'headers': {},
+            'elapsed_sec': time.perf_counter() - started
+        }
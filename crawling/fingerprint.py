@@ -0,0 +1,139 @@
+"""
+콘텐츠 지문(Fingerprint) 저장소
+- 목록 페이지 HTML 해시와 ETag/Last-Modified, 페이지별 상품(.area1) 해시를 JSON 파일로 보관합니다.
+- 변경되지 않은 페이지/상품은 파싱과 DB 적재를 건너뛰어 매일 밤 실행 비용을 줄입니다.
+- 변경 사항은 stage 후 DB 적재가 성공했을 때만 commit 합니다. (적재 실패 시 다음 실행에서 재처리)
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from .config import CrawlingConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = Path(__file__).resolve().parent / 'state' / 'fingerprints.json'
+
+
+class FingerprintStore:
+    """URL별 페이지/상품 지문 저장소 (스레드 안전)"""
+
+    def __init__(self, path: Optional[Path] = None, max_age_hours: Optional[float] = None):
+        self.path = Path(path) if path else DEFAULT_STORE_PATH
+        hours = CrawlingConfig.FINGERPRINT_MAX_AGE_HOURS if max_age_hours is None else max_age_hours
+        self.max_age = timedelta(hours=hours)
+        self._lock = threading.Lock()
+        self._pages: Dict[str, Dict] = {}
+        self._items: Dict[str, list] = {}
+        self._pending_pages: Dict[str, Dict] = {}
+        self._pending_items: Dict[str, set] = {}
+        self.load()
+
+    @staticmethod
+    def digest(text: str) -> str:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._pages = data.get('pages', {})
+            self._items = data.get('items', {})
+            logger.info(f"🧬 지문 저장소 로드: 페이지 {len(self._pages)}개")
+        except Exception as e:
+            # 손상된 저장소는 무시하고 전체 재수집
+            logger.warning(f"지문 저장소 로드 실패, 전체 재수집합니다: {e}")
+            self._pages, self._items = {}, {}
+
+    def _fresh_page(self, url: str) -> Optional[Dict]:
+        """max_age 이내에 전체 처리된 페이지 정보 (오래된 정보는 무시하여 주기적으로 전체 갱신)"""
+        page = self._pages.get(url)
+        if not page:
+            return None
+        try:
+            refreshed_at = datetime.fromisoformat(page['refreshed_at'])
+        except (KeyError, ValueError):
+            return None
+        if datetime.now() - refreshed_at > self.max_age:
+            return None
+        return page
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """HTTP 조건부 요청 헤더 (If-None-Match / If-Modified-Since)"""
+        with self._lock:
+            page = self._fresh_page(url)
+        headers = {}
+        if page:
+            if page.get('etag'):
+                headers['If-None-Match'] = page['etag']
+            if page.get('last_modified'):
+                headers['If-Modified-Since'] = page['last_modified']
+        return headers
+
+    def page_unchanged(self, url: str, html_hash: str) -> bool:
+        with self._lock:
+            page = self._fresh_page(url)
+            return bool(page) and page.get('hash') == html_hash
+
+    def known_item_count(self, url: str) -> int:
+        with self._lock:
+            return len(self._items.get(url, []))
+
+    def item_known(self, url: str, item_hash: str) -> bool:
+        with self._lock:
+            if not self._fresh_page(url):
+                return False
+            return item_hash in self._items.get(url, [])
+
+    def stage_page(self, url: str, html_hash: str, etag: Optional[str] = None,
+                   last_modified: Optional[str] = None):
+        """
+        처리한 페이지 지문 기록 (commit 전까지는 반영되지 않음)
+        내용이 같은 페이지를 다시 stage하면 전체 갱신 시각(refreshed_at)은 유지 (주기적 전체 재수집 보장)
+        """
+        with self._lock:
+            previous = self._fresh_page(url)
+            same = previous is not None and previous.get('hash') == html_hash
+            self._pending_pages[url] = {
+                'hash': html_hash,
+                'etag': etag,
+                'last_modified': last_modified,
+                'refreshed_at': previous['refreshed_at'] if same else datetime.now().isoformat()
+            }
+            self._pending_items[url] = set()
+
+    def stage_items(self, url: str, item_hashes: Iterable[str]):
+        with self._lock:
+            self._pending_items.setdefault(url, set()).update(item_hashes)
+
+    def commit(self) -> int:
+        """stage된 지문을 저장소에 반영하고 파일로 저장. 반영된 페이지 수 반환"""
+        with self._lock:
+            if not self._pending_pages:
+                return 0
+            self._pages.update(self._pending_pages)
+            for url, hashes in self._pending_items.items():
+                self._items[url] = sorted(hashes)
+            count = len(self._pending_pages)
+            self._pending_pages, self._pending_items = {}, {}
+            self._save()
+        logger.info(f"🧬 지문 저장소 갱신: 페이지 {count}개")
+        return count
+
+    def discard(self):
+        with self._lock:
+            self._pending_pages, self._pending_items = {}, {}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'pages': self._pages, 'items': self._items}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,152 @@
+"""
+오프라인 테스트용 로컬 픽스처 서버
+- crawling/fixtures/ 아래의 HTML 스냅샷을 은행 사이트 대신 제공합니다.
+- gzip 응답과 ETag/Last-Modified 조건부 요청(304)을 지원하므로 HttpFetcher 경로를 실제와 비슷하게 확인할 수 있습니다.
+- 목록의 상세 링크(/quics?...&prcode=<상품코드>)는 fixtures/kb_detail/<상품코드>.html로 응답합니다.
+
+사용 예:
+    with FixtureServer() as server:
+        crawler = KBCrawler()
+        crawler.targets = [(server.url_for('kb_credit.html'), '신용대출'),       # 정적 -> HTTP
+                           (server.url_for('kb_credit_js.html'), '신용대출')]    # JS 렌더링 -> Selenium
+        products = crawler.safe_crawl()
+
+단독 실행:
+    python -m crawling.fixture_server --port 8765
+"""
+import argparse
+import gzip
+import hashlib
+import logging
+import mimetypes
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+# 쿼리스트링으로 구분되는 경로 -> (쿼리 키, 픽스처 파일명 형식)
+QUERY_ROUTES = {
+    'quics': ('prcode', 'kb_detail/{}.html'),
+}
+
+
+class FixtureRequestHandler(SimpleHTTPRequestHandler):
+    """픽스처 파일 응답 핸들러 (QUERY_ROUTES 외에는 쿼리스트링 무시, gzip/조건부 요청 지원)"""
+
+    fixture_dir = FIXTURE_DIR
+
+    def do_GET(self):
+        name = self._fixture_name()
+        path = (self.fixture_dir / name).resolve()
+        if self.fixture_dir.resolve() not in path.parents or not path.is_file():
+            self.send_error(404, f"픽스처 없음: {name}")
+            return
+
+        body = path.read_bytes()
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        mtime = int(path.stat().st_mtime)
+        if self._not_modified(etag, mtime):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        if content_type.startswith('text/'):
+            content_type += '; charset=utf-8'
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', formatdate(mtime, usegmt=True))
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _fixture_name(self) -> str:
+        parts = urlsplit(self.path)
+        name = parts.path.lstrip('/')
+        if name in QUERY_ROUTES:
+            key, pattern = QUERY_ROUTES[name]
+            values = parse_qs(parts.query).get(key)
+            if values:
+                return pattern.format(values[0])
+        return name
+
+    def _not_modified(self, etag: str, mtime: int) -> bool:
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            return etag in [tag.strip() for tag in if_none_match.split(',')]
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                return mtime <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def log_message(self, format, *args):
+        logger.debug("fixture %s - %s", self.address_string(), format % args)
+
+
+class FixtureServer:
+    """백그라운드 스레드에서 동작하는 픽스처 HTTP 서버 (port=0이면 빈 포트 자동 할당)"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, fixture_dir: Path = FIXTURE_DIR):
+        handler = type('BoundFixtureHandler', (FixtureRequestHandler,), {'fixture_dir': Path(fixture_dir)})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url_for(self, name: str) -> str:
+        return f"{self.base_url}/{name}"
+
+    def start(self) -> 'FixtureServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fixture-server', daemon=True)
+        self._thread.start()
+        logger.info(f"🧪 픽스처 서버 시작: {self.base_url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='크롤러 오프라인 테스트용 픽스처 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s')
+    server = FixtureServer(args.host, args.port)
+    print(f"픽스처 서버: {server.base_url}/ (종료: Ctrl+C)")
+    for path in sorted(FIXTURE_DIR.glob('*.html')):
+        print(f"  - {server.url_for(path.name)}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
@@ -0,0 +1,193 @@
+"""
+로컬 Supabase 대체 클라이언트 (테스트/드라이런용)
+- supabase-py의 table().upsert()/insert()/select().eq().order().execute() 호출 형태를 메모리 상에서 흉내 냅니다.
+- database_schema.sql의 CHECK 제약 조건 일부와 요청 크기 제한, 일시적 장애를 재현할 수 있습니다.
+
+사용 예:
+    client = LocalSupabaseClient(transient_failures=2)
+    manager = SupabaseManager(client=client)
+"""
+import copy
+import json
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+
+class LocalAPIError(Exception):
+    """postgrest APIError와 같은 속성(code/message)을 가진 오류"""
+
+    def __init__(self, code: str, message: str):
+        self.code = code
+        self.message = message
+        super().__init__(f"Error {code}: {message}")
+
+
+class LocalResponse:
+    def __init__(self, data: List[Dict]):
+        self.data = data
+        self.count = len(data)
+
+
+def check_loan_product(row: Dict) -> Optional[str]:
+    """crawled_loan_products CHECK 제약 조건 (위반 시 메시지 반환)"""
+    checks = [
+        ('max_limit', lambda v: v is None or v > 0),
+        ('base_rate', lambda v: v is not None and 0 <= v <= 30),
+        ('additional_rate', lambda v: v is None or 0 <= v <= 10),
+        ('salary_transfer_discount', lambda v: v is None or 0 <= v <= 5),
+        ('early_repay_fee_rate', lambda v: v is None or 0 <= v <= 5),
+        ('fee_waiver_months', lambda v: v is None or 0 <= v <= 60),
+    ]
+    for column, is_valid in checks:
+        try:
+            if not is_valid(row.get(column)):
+                return f'new row violates check constraint "{column}_check"'
+        except TypeError:
+            return f'invalid input syntax for column "{column}"'
+    return None
+
+
+class LocalQuery:
+    """테이블 단위 쿼리 빌더"""
+
+    def __init__(self, client: 'LocalSupabaseClient', table: str):
+        self.client = client
+        self.table_name = table
+        self._op = 'select'
+        self._rows: List[Dict] = []
+        self._on_conflict: Optional[str] = None
+        self._filters: List[Callable[[Dict], bool]] = []
+        self._order: Optional[tuple] = None
+        self._limit: Optional[int] = None
+
+    def select(self, columns: str = '*') -> 'LocalQuery':
+        self._op = 'select'
+        return self
+
+    def insert(self, rows) -> 'LocalQuery':
+        self._op = 'insert'
+        self._rows = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def upsert(self, rows, on_conflict: str = '') -> 'LocalQuery':
+        self._op = 'upsert'
+        self._rows = rows if isinstance(rows, list) else [rows]
+        self._on_conflict = on_conflict
+        return self
+
+    def delete(self) -> 'LocalQuery':
+        self._op = 'delete'
+        return self
+
+    def eq(self, column: str, value) -> 'LocalQuery':
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gte(self, column: str, value) -> 'LocalQuery':
+        self._filters.append(lambda row: row.get(column) is not None and row.get(column) >= value)
+        return self
+
+    def lte(self, column: str, value) -> 'LocalQuery':
+        self._filters.append(lambda row: row.get(column) is not None and row.get(column) <= value)
+        return self
+
+    def order(self, column: str, desc: bool = False) -> 'LocalQuery':
+        self._order = (column, desc)
+        return self
+
+    def limit(self, count: int) -> 'LocalQuery':
+        self._limit = count
+        return self
+
+    def execute(self) -> LocalResponse:
+        return self.client._execute(self)
+
+
+class LocalSupabaseClient:
+    """
+    메모리 기반 Supabase 대체 클라이언트
+    - transient_failures: 처음 N번의 쓰기 요청을 503으로 실패시킴
+    - lost_responses: 처음 N번의 쓰기 요청은 반영한 뒤 응답을 잃음 (TimeoutError)
+    - max_payload_bytes: 요청 본문이 이보다 크면 413으로 실패시킴
+    - validators: 테이블별 로우 검증 함수 (위반 메시지 반환 시 23514 오류)
+    """
+
+    def __init__(
+        self,
+        transient_failures: int = 0,
+        lost_responses: int = 0,
+        max_payload_bytes: Optional[int] = None,
+        validators: Optional[Dict[str, Callable[[Dict], Optional[str]]]] = None
+    ):
+        self.tables: Dict[str, List[Dict]] = {}
+        self.transient_failures = transient_failures
+        self.lost_responses = lost_responses
+        self.max_payload_bytes = max_payload_bytes
+        self.validators = validators if validators is not None else {
+            'crawled_loan_products': check_loan_product
+        }
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+    def table(self, name: str) -> LocalQuery:
+        return LocalQuery(self, name)
+
+    def _execute(self, query: LocalQuery) -> LocalResponse:
+        with self._lock:
+            self.request_count += 1
+            rows = self.tables.setdefault(query.table_name, [])
+
+            if query._op in ('insert', 'upsert'):
+                self._check_write(query)
+                keys = [key.strip() for key in (query._on_conflict or '').split(',') if key.strip()]
+                positions = {self._conflict_key(row, keys): i for i, row in enumerate(rows)} if keys else {}
+                written = []
+                for new_row in query._rows:
+                    new_row = dict(new_row)
+                    index = positions.get(self._conflict_key(new_row, keys)) if keys else None
+                    if index is None:
+                        # DB의 DEFAULT NOW()처럼 새 로우에만 생성 시각 부여
+                        new_row.setdefault('crawled_at', datetime.now().isoformat())
+                        rows.append(new_row)
+                        if keys:
+                            positions[self._conflict_key(new_row, keys)] = len(rows) - 1
+                    else:
+                        rows[index] = {**rows[index], **new_row}
+                    written.append(new_row)
+                if self.lost_responses > 0:
+                    self.lost_responses -= 1
+                    raise TimeoutError('응답 시간 초과 (요청은 반영됨)')
+                return LocalResponse(copy.deepcopy(written))
+
+            matched = [row for row in rows if all(f(row) for f in query._filters)]
+            if query._op == 'delete':
+                matched_ids = {id(row) for row in matched}
+                self.tables[query.table_name] = [row for row in rows if id(row) not in matched_ids]
+                return LocalResponse(matched)
+
+            if query._order:
+                column, desc = query._order
+                matched.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+            if query._limit is not None:
+                matched = matched[:query._limit]
+            return LocalResponse(copy.deepcopy(matched))
+
+    def _check_write(self, query: LocalQuery):
+        if self.transient_failures > 0:
+            self.transient_failures -= 1
+            raise LocalAPIError('503', 'Service Unavailable')
+        if self.max_payload_bytes is not None:
+            size = len(json.dumps(query._rows, ensure_ascii=False, default=str).encode('utf-8'))
+            if size > self.max_payload_bytes:
+                raise LocalAPIError('413', f'Payload Too Large ({size} bytes)')
+        validator = self.validators.get(query.table_name)
+        if validator:
+            for row in query._rows:
+                message = validator(row)
+                if message:
+                    raise LocalAPIError('23514', message)
+
+    @staticmethod
+    def _conflict_key(row: Dict, keys: List[str]) -> tuple:
+        return tuple(row.get(key) for key in keys)
@@ -3,47 +3,56 @@
 - 환경 변수 경로 최적화 (Root .env 또는 .env.local 로드)
 - 스키마 캐시 이슈(PGRST204) 회피 로직 적용
 - 원본 데이터 백업 및 단계별 로깅
+- 임포트만으로는 아무 부작용이 없도록 환경 변수/로깅/무거운 모듈은 main() 실행 시점에 준비
+  (명령행 진입점은 python -m crawling crawl, crawling/cli.py 참고)
 """
 import logging
-import pandas as pd
-import json
 import os
 import sys
 from datetime import datetime
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import List, Optional
 
-# ==========================================================
-# [1] 프로젝트 루트의 환경 변수 파일 로드
-# ==========================================================
-base_dir = Path(__file__).resolve().parent.parent
-# .env와 .env.local 중 존재하는 파일을 로드합니다.
-for env_file in ['.env', '.env.local']:
-    env_path = base_dir / env_file
-    if env_path.exists():
-        load_dotenv(dotenv_path=env_path)
-        break
-
-# ==========================================================
-# 모듈 임포트 (load_dotenv 이후에 실행되어야 함)
-# ==========================================================
 from .config import CrawlingConfig
-from .cleansing import LoanDataCleaner
-from .supabase_client import SupabaseManager
-from .bank_crawlers.kb_crawler import KBCrawler
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-    handlers=[
-        logging.FileHandler(f'crawling_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger(__name__)
 
-def main():
+LOG_FORMAT = '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
+
+
+def setup_logging(level: int = logging.INFO, log_file: bool = False):
+    """
+    로깅 설정 (임포트 시점이 아니라 실행할 때만 호출)
+    log_file=True면 실행 시각이 붙은 crawling_<ts>.log 파일에도 기록
+    """
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.insert(0, logging.FileHandler(f'crawling_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'))
+    logging.basicConfig(level=level, format=LOG_FORMAT, handlers=handlers)
+
+
+def main(banks: Optional[List[str]] = None, queue_run_id: Optional[str] = None,
+         queue_path: Optional[Path] = None) -> int:
+    """
+    수집 → 정제 → 적재 전체 실행 (성공 시 0)
+    무거운 의존성(pandas, selenium, supabase)은 여기서 처음 임포트됩니다.
+    queue_run_id를 넘기면 직접 수집하지 않고 작업 큐 워커들이 남긴 결과를 병합해 정제/적재합니다. (crawling/work_queue.py)
+    queue_path는 워커들이 임대한 큐 DB 경로입니다. (None이면 QUEUE_PATH)
+    """
+    # 프로젝트 루트의 .env 또는 .env.local 로드 (모듈 임포트 전에 실행되어야 함)
+    from .supabase_client import SupabaseManager, load_project_env
+    load_project_env()
+    from .bank_crawlers import BANK_CRAWLERS
+    from .pipeline import CrawlPipeline
+    from .fingerprint import FingerprintStore
+    from .archive import RawArchiveWriter
+    from .offer_index import OfferIndexStore, publish_offer_index
+    from .rate_history import RateHistoryStore
+    from .snapshot_store import ProductSnapshotStore
+    from .work_queue import QueueCoordinator, WorkQueue
+    from .metrics import METRICS
+
+    METRICS.reset()
     logger.info("=" * 60)
     logger.info("🚀 대출 상품 실시간 수집 및 데이터 파이프라인 시작")
     logger.info("=" * 60)
@@ -51,81 +60,99 @@ def main():
     # 환경 변수 체크
     if not os.getenv("SUPABASE_URL"):
         logger.error("❌ 에러: SUPABASE_URL 환경 변수가 로드되지 않았습니다.")
-        return
+        return 1
 
-    # 0. 환경 준비: 원본 데이터 저장 폴더 생성
-    raw_data_dir = base_dir / "crawling" / "raw_data"
-    os.makedirs(raw_data_dir, exist_ok=True)
-    
     # 1. Supabase 연결
     try:
         supabase = SupabaseManager()
         logger.info("✅ Supabase 연결 성공")
     except Exception as e:
         logger.error(f"❌ Supabase 연결 실패: {e}")
-        return
+        return 1
     
-    # 2. 크롤링 수행 (Extraction)
-    crawlers = [KBCrawler()]
-    all_raw_products = []
+    # 2. 추출 → 정제 → 적재 파이프라인 (은행별 수집이 끝나는 대로 정제/적재)
+    # 정제 결과 스냅샷: 날짜/은행별 Parquet (SNAPSHOT_STORE_ENABLED로 켠 경우만, pyarrow 필요)
+    snapshots_enabled = CrawlingConfig.SNAPSHOT_STORE_ENABLED and ProductSnapshotStore.available()
+    if CrawlingConfig.SNAPSHOT_STORE_ENABLED and not snapshots_enabled:
+        logger.warning("⚠️ pyarrow가 설치되지 않아 상품 스냅샷을 남기지 않습니다.")
+    elif snapshots_enabled and CrawlingConfig.FINGERPRINT_ENABLED:
+        logger.warning("⚠️ 상품 스냅샷을 남기는 실행이라 변경 감지 건너뛰기 없이 전체 상품을 수집합니다.")
     
-    for crawler in crawlers:
-        try:
-            logger.info(f"\n[STEP 1] {crawler.bank_name} 데이터 추출 시작")
-            products = crawler.safe_crawl()
-            
-            if products:
-                all_raw_products.extend(products)
-                logger.info(f"✨ {crawler.bank_name} 추출 완료: {len(products)}건")
-            else:
-                logger.warning(f"⚠️ {crawler.bank_name} 추출된 데이터 없음")
-        except Exception as e:
-            logger.error(f"❌ {crawler.bank_name} 치명적 오류: {e}")
-
-    if not all_raw_products:
-        logger.error("❌ 수집된 데이터가 최종적으로 없습니다. 프로세스를 종료합니다.")
-        return
-
-    # 3. 원본 데이터 백업
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    raw_file_path = raw_data_dir / f"raw_kb_data_{timestamp}.json"
-    with open(raw_file_path, 'w', encoding='utf-8') as f:
-        json.dump(all_raw_products, f, ensure_ascii=False, indent=4)
-    logger.info(f"\n[STEP 2] 원본 데이터 저장 완료: {raw_file_path}")
-
-    # 4. 데이터 정제 (Transformation)
-    logger.info(f"\n[STEP 3] 데이터 전처리 시작")
-    df_raw = pd.DataFrame(all_raw_products)
-    cleaned_df = LoanDataCleaner.validate_and_clean(df_raw)
+    def snapshot_store(run_id: str):
+        return ProductSnapshotStore(run_id=run_id) if snapshots_enabled else None
     
-    # 5. 최종 DB 적재 (Load)
-    if not cleaned_df.empty:
-        logger.info(f"\n[STEP 4] Supabase 데이터 적재 단계")
-        
-        # ---------------------------------------------------------
-        # [핵심] PGRST204 에러 회피: crawled_at 컬럼을 데이터셋에서 제거
-        # DB 스키마의 'DEFAULT NOW()'가 자동으로 값을 채우게 합니다.
-        # ---------------------------------------------------------
-        if 'crawled_at' in cleaned_df.columns:
-            cleaned_df = cleaned_df.drop(columns=['crawled_at'])
-            logger.info("⚠️ 스키마 캐시 이슈 회피를 위해 crawled_at 필드를 제외하고 전송합니다.")
-        # ---------------------------------------------------------
-
-        products_to_insert = cleaned_df.to_dict('records')
-        
-        if supabase.insert_loan_products(products_to_insert):
-            logger.info(f"✅ 최종 {len(products_to_insert)}개 상품 DB 반영 완료")
+    # 변경 감지: 지난 실행과 같은 페이지/상품은 파싱과 적재를 건너뜀
+    # (작업 큐 모드는 워커가 여러 프로세스라, 스냅샷을 남기는 실행은 전체 상품이 필요해서 사용하지 않음)
+    use_fingerprints = CrawlingConfig.FINGERPRINT_ENABLED and not queue_run_id and not snapshots_enabled
+    fingerprints = FingerprintStore() if use_fingerprints else None
+    
+    # 변경 이력: 지난 상태와 비교해 바뀐 상품만 적재하고 변경 필드를 이벤트로 기록
+    history = RateHistoryStore() if CrawlingConfig.RATE_HISTORY_ENABLED else None
+    
+    if queue_run_id:
+        # 작업 큐 모드: 워커들이 작업별로 남긴 원본을 은행별 세그먼트로 병합한 뒤 같은 정제/적재 단계로 넘김
+        coordinator = QueueCoordinator(WorkQueue(queue_path), queue_run_id)
+        queue_banks = [code for code in coordinator.banks() if not banks or code in banks]
+        logger.info(f"\n[STEP 1] 작업 큐 실행 {queue_run_id} 병합 ({', '.join(queue_banks)}) → 정제 → 적재")
+        summary = CrawlPipeline(
+            supabase, scheduler=coordinator, history=history, snapshots=snapshot_store(queue_run_id)
+        ).run(queue_banks)
+        archive = coordinator.archive
+    else:
+        crawlers = [BANK_CRAWLERS[code]() for code in (banks or CrawlingConfig.TARGET_BANKS) if code in BANK_CRAWLERS]
+        # 원본 데이터 백업: 수집 즉시 raw_data/<run_id>/<bank>.jsonl.gz에 스트리밍 기록
+        logger.info(f"\n[STEP 1] {', '.join(c.bank_name for c in crawlers)} 추출 → 정제 → 적재 파이프라인 시작")
+        with RawArchiveWriter() as archive:
             for crawler in crawlers:
-                bank_df = cleaned_df[cleaned_df['bank_name'] == crawler.bank_name]
-                supabase.log_crawling_result(crawler.bank_name, 'success', len(bank_df))
+                crawler.fingerprints = fingerprints
+                crawler.archive = archive
+            summary = CrawlPipeline(supabase, history=history, snapshots=snapshot_store(archive.run_id)).run(crawlers)
+    logger.info(f"\n[STEP 2] 원본 데이터 저장 완료: {archive.run_dir} ({archive.record_count}건)")
+    
+    # 3. 전부 적재된 경우에만 지문을 확정 (실패 로우가 있으면 다음 실행에서 다시 처리)
+    if fingerprints:
+        if summary['success']:
+            fingerprints.commit()
         else:
-            logger.error("❌ DB 적재 실패")
+            fingerprints.discard()
+    
+    # 4. 최적 상품 인덱스: 상품이 바뀌었거나 아직 인덱스가 없을 때만 다시 계산
+    index_store = OfferIndexStore()
+    if summary['loaded_rows'] or index_store.load_latest() is None:
+        logger.info("\n[STEP 3] 최적 상품 인덱스 생성")
+        try:
+            publish_offer_index(supabase, archive.run_id, store=index_store)
+        except Exception as e:
+            logger.error(f"❌ 최적 상품 인덱스 생성 실패: {e}")
+    
+    if summary['loaded_rows']:
+        logger.info(f"✅ 최종 {summary['loaded_rows']}개 상품 DB 반영 완료")
+    elif summary['unchanged_rows']:
+        logger.info("⏭️ 지난 실행 이후 변경된 상품이 없어 적재를 생략했습니다.")
+    elif not summary['crawled_rows']:
+        logger.error("❌ 수집된 데이터가 최종적으로 없습니다.")
     else:
-        logger.warning("⚠️ 적재할 유효 데이터가 없습니다.")
+        logger.error("❌ DB 적재 실패")
+
+    # 5. 실행 계측 내보내기 (Prometheus textfile + JSON 요약)
+    if CrawlingConfig.METRICS_ENABLED:
+        METRICS.log_top()
+        try:
+            run_metrics = METRICS.export(archive.run_id)
+            if CrawlingConfig.METRICS_TO_DB:
+                supabase.log_run_metrics(run_metrics)
+        except Exception as e:
+            logger.warning(f"⚠️ 실행 계측 내보내기 실패: {e}")
+    
+    if supabase.product_cache:
+        stats = supabase.product_cache.summary()
+        logger.info(f"🗃️ 상품 조회 캐시: 적중 {stats['hits']}회 / 미적중 {stats['misses']}회 / 무효화 {stats['invalidations']}회")
 
     logger.info("\n" + "=" * 60)
     logger.info("🏁 파이프라인 프로세스 종료")
     logger.info("=" * 60)
+    return 0 if summary['success'] else 1
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    setup_logging(log_file=True)
+    sys.exit(main())
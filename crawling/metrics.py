@@ -0,0 +1,206 @@
+"""
+실행 계측 (Instrumentation)
+- 구간 타이머(span)와 카운터를 프로세스 전역 레지스트리(METRICS)에 모읍니다.
+  (드라이버 준비, 페이지 로드, 요소 대기, 파싱, 정제 단계, 원본 백업, UPSERT 등)
+- 실행이 끝나면 Prometheus textfile(node_exporter textfile collector용)과 JSON 요약으로 내보냅니다.
+
+사용 예:
+    with METRICS.span('page_load', mode='http'):
+        ...
+    METRICS.incr('pages_fetched', mode='http', status=200)
+    METRICS.export(run_id)
+"""
+import json
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .config import CrawlingConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_DIR = Path(__file__).resolve().parent / 'state' / 'metrics'
+PROMETHEUS_PREFIX = 'crawling'
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items() if value is not None))
+
+
+def _format_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ''
+    escaped = (
+        name + '="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def peak_rss_bytes() -> Dict[str, int]:
+    """
+    최대 상주 메모리 (self: 이 프로세스, children: 종료된 자식 프로세스 중 최대, 예: chromedriver)
+    Linux는 KB, macOS는 byte 단위로 보고됨
+    """
+    unit = 1 if sys.platform == 'darwin' else 1024
+    return {
+        'self': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit,
+        'children': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit
+    }
+
+
+class MetricsRegistry:
+    """구간 타이머/카운터 레지스트리 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enabled = CrawlingConfig.METRICS_ENABLED
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            # (이름, 레이블) -> {'count', 'total_sec', 'max_sec'}
+            self._spans: Dict[Tuple[str, LabelKey], Dict[str, float]] = {}
+            self._counters: Dict[Tuple[str, LabelKey], float] = {}
+            self.started_at = datetime.now()
+            self._started = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        """with 블록 소요 시간 기록 (예외가 나도 기록, 예외는 그대로 전파)"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def observe(self, name: str, seconds: float, **labels):
+        """이미 측정된 소요 시간 기록"""
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            stat = self._spans.get(key)
+            if stat is None:
+                stat = self._spans[key] = {'count': 0, 'total_sec': 0.0, 'max_sec': 0.0}
+            stat['count'] += 1
+            stat['total_sec'] += seconds
+            stat['max_sec'] = max(stat['max_sec'], seconds)
+
+    def incr(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def summary(self) -> Dict:
+        """JSON 요약 (구간은 누적 시간이 긴 순)"""
+        with self._lock:
+            spans = [
+                {'name': name, 'labels': dict(labels), 'count': stat['count'],
+                 'total_sec': round(stat['total_sec'], 4), 'max_sec': round(stat['max_sec'], 4),
+                 'avg_sec': round(stat['total_sec'] / stat['count'], 4)}
+                for (name, labels), stat in self._spans.items()
+            ]
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            elapsed = time.perf_counter() - self._started
+        return {
+            'started_at': self.started_at.isoformat(),
+            'elapsed_sec': round(elapsed, 3),
+            'peak_rss_bytes': peak_rss_bytes(),
+            'spans': sorted(spans, key=lambda span: span['total_sec'], reverse=True),
+            'counters': counters
+        }
+
+    def to_prometheus(self, summary: Optional[Dict] = None) -> str:
+        """Prometheus text exposition format"""
+        summary = summary or self.summary()
+        p = PROMETHEUS_PREFIX
+        lines = [
+            f'# HELP {p}_span_seconds_total 구간별 누적 소요 시간',
+            f'# TYPE {p}_span_seconds_total counter',
+        ]
+        span_rows = [(span, _format_labels(_label_key({'span': span['name'], **span['labels']})))
+                     for span in summary['spans']]
+        lines += [f'{p}_span_seconds_total{labels} {span["total_sec"]}' for span, labels in span_rows]
+        lines += [f'# TYPE {p}_span_count_total counter']
+        lines += [f'{p}_span_count_total{labels} {span["count"]}' for span, labels in span_rows]
+        lines += [f'# TYPE {p}_span_seconds_max gauge']
+        lines += [f'{p}_span_seconds_max{labels} {span["max_sec"]}' for span, labels in span_rows]
+
+        for name in sorted({counter['name'] for counter in summary['counters']}):
+            lines.append(f'# TYPE {p}_{name}_total counter')
+            lines += [
+                f'{p}_{name}_total{_format_labels(_label_key(counter["labels"]))} {counter["value"]}'
+                for counter in summary['counters'] if counter['name'] == name
+            ]
+
+        lines += [
+            f'# TYPE {p}_peak_rss_bytes gauge',
+            *(f'{p}_peak_rss_bytes{{process="{process}"}} {value}'
+              for process, value in summary['peak_rss_bytes'].items()),
+            f'# TYPE {p}_run_elapsed_seconds gauge',
+            f'{p}_run_elapsed_seconds {summary["elapsed_sec"]}',
+            f'# TYPE {p}_last_run_timestamp_seconds gauge',
+            f'{p}_last_run_timestamp_seconds {int(time.time())}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def export(self, run_id: str, directory: Optional[Path] = None,
+               textfile: Optional[Path] = None) -> Dict:
+        """
+        실행 요약 내보내기
+        - <directory>/<run_id>.json : JSON 요약
+        - textfile (기본 <directory>/crawling.prom) : Prometheus textfile (매 실행 덮어씀)
+        """
+        directory = Path(directory or CrawlingConfig.METRICS_DIR or DEFAULT_METRICS_DIR)
+        textfile = Path(textfile or CrawlingConfig.METRICS_TEXTFILE or directory / f'{PROMETHEUS_PREFIX}.prom')
+        summary = {'run_id': run_id, **self.summary()}
+        directory.mkdir(parents=True, exist_ok=True)
+        textfile.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(directory / f'{run_id}.json', json.dumps(summary, ensure_ascii=False, indent=2))
+        # textfile collector가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        _write_atomic(textfile, self.to_prometheus(summary))
+        return summary
+
+    def log_top(self, limit: int = 8):
+        """누적 시간이 긴 구간 출력"""
+        summary = self.summary()
+        rss = summary['peak_rss_bytes']
+        logger.info(
+            f"⏱️ 구간별 소요 시간 (전체 {summary['elapsed_sec']:.1f}초 / 최대 메모리 "
+            f"{rss['self'] / 1024 / 1024:.0f}MB, 자식 프로세스 {rss['children'] / 1024 / 1024:.0f}MB)"
+        )
+        for span in summary['spans'][:limit]:
+            labels = ', '.join(f"{k}={v}" for k, v in span['labels'].items())
+            logger.info(
+                f"   - {span['name']}{f' ({labels})' if labels else ''}: "
+                f"{span['total_sec']:.2f}초 / {span['count']}회 / 최대 {span['max_sec']:.2f}초"
+            )
+
+
+def _write_atomic(path: Path, text: str):
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+# 프로세스 전역 레지스트리
+METRICS = MetricsRegistry()
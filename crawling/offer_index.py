@@ -0,0 +1,183 @@
+"""
+최적 상품 사전 계산 인덱스 (Best-Offer Index)
+- 적재가 끝난 뒤 crawled_loan_products 전체를 한 번 읽어 실효 금리 기준 순위를 미리 계산합니다.
+  (실효 금리 = 기본 + 가산, 급여이체 시 우대 금리 차감 / 0% 미만은 0%)
+- 상품 유형별 × 한도 구간(실제 한도 값)별 상위 K개 상품 인덱스를 버전(run_id)별 스냅샷으로 저장합니다.
+  (로컬: state/offer_index/<version>.json, DB: offer_index_snapshots)
+- 조회 측은 "X원 대출 가능한 최저 금리 상품 N개"를 정렬 없이 구간 하나를 찾아 바로 답합니다.
+
+사용 예:
+    index = OfferIndex(OfferIndexStore().load_latest())
+    index.best_offers(30_000_000, n=5, product_type='신용대출')
+"""
+import bisect
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import CrawlingConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = Path(__file__).resolve().parent / 'state' / 'offer_index'
+LATEST_FILE = 'latest.json'
+ALL_TYPES = '전체'
+
+# products 컴팩트 표의 컬럼 순서
+PRODUCT_COLUMNS = ['bank_name', 'product_name', 'product_type', 'base_rate', 'additional_rate',
+                   'salary_transfer_discount', 'max_limit', 'rate', 'rate_with_salary']
+RATE_KEYS = {False: 'rate', True: 'rate_with_salary'}
+
+
+def _number(value, default: float = 0.0) -> float:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return default
+    return value if value == value else default
+
+
+def effective_rates(product: Dict) -> Dict[str, float]:
+    """실효 금리 (급여이체 미적용 / 적용)"""
+    rate = round(_number(product.get('base_rate')) + _number(product.get('additional_rate')), 4)
+    discount = _number(product.get('salary_transfer_discount'))
+    return {'rate': max(rate, 0.0), 'rate_with_salary': max(round(rate - discount, 4), 0.0)}
+
+
+def build_offer_index(
+    products: List[Dict],
+    version: str,
+    top_k: Optional[int] = None
+) -> Dict:
+    """
+    전체 상품 목록으로 인덱스 스냅샷 생성
+    - buckets: 상품들의 서로 다른 한도 값 (오름차순, 1억/3억처럼 몇 개 안 됨)
+    - rankings[product_type][rate_key][bucket] = 한도가 bucket 이상인 상품 중 실효 금리 상위 K개 (products 표의 행 번호)
+    """
+    top_k = top_k or CrawlingConfig.OFFER_INDEX_TOP_K
+
+    rows = []
+    for product in products:
+        if not product.get('bank_name') or not product.get('product_name'):
+            continue
+        row = {
+            'bank_name': product['bank_name'],
+            'product_name': product['product_name'],
+            'product_type': product.get('product_type') or '기타',
+            'base_rate': _number(product.get('base_rate')),
+            'additional_rate': _number(product.get('additional_rate')),
+            'salary_transfer_discount': _number(product.get('salary_transfer_discount')),
+            'max_limit': int(_number(product.get('max_limit'))),
+            **effective_rates(product)
+        }
+        rows.append(row)
+    buckets = sorted({row['max_limit'] for row in rows})
+
+    rankings: Dict[str, Dict[str, Dict[str, List[int]]]] = {}
+    product_types = sorted({row['product_type'] for row in rows}) + [ALL_TYPES]
+    for product_type in product_types:
+        members = [i for i, row in enumerate(rows) if product_type == ALL_TYPES or row['product_type'] == product_type]
+        rankings[product_type] = {}
+        for rate_key in RATE_KEYS.values():
+            # 동률이면 한도가 큰 상품 → 은행/상품명 순 (실행마다 같은 순서 보장)
+            ordered = sorted(members, key=lambda i: (rows[i][rate_key], -rows[i]['max_limit'],
+                                                     rows[i]['bank_name'], rows[i]['product_name']))
+            rankings[product_type][rate_key] = {
+                str(bucket): [i for i in ordered if rows[i]['max_limit'] >= bucket][:top_k]
+                for bucket in buckets
+            }
+
+    return {
+        'version': version,
+        'built_at': datetime.now().isoformat(),
+        'product_count': len(rows),
+        'top_k': top_k,
+        'buckets': buckets,
+        'columns': PRODUCT_COLUMNS,
+        'products': [[row[column] for column in PRODUCT_COLUMNS] for row in rows],
+        'rankings': rankings
+    }
+
+
+class OfferIndex:
+    """인덱스 스냅샷 조회기"""
+
+    def __init__(self, snapshot: Dict):
+        self.snapshot = snapshot
+        self.version = snapshot['version']
+        self.buckets: List[int] = snapshot['buckets']
+        columns = snapshot['columns']
+        self.products = [dict(zip(columns, values)) for values in snapshot['products']]
+
+    def best_offers(self, amount: int = 0, n: int = 5, product_type: Optional[str] = None,
+                    salary_transfer: bool = True) -> List[Dict]:
+        """
+        amount원 이상 대출 가능한 상품 중 실효 금리가 낮은 순으로 n개 (n은 top_k 이하)
+        구간 하한이 실제 한도 값들이므로 amount 이상인 첫 구간의 순위가 곧 정답입니다.
+        """
+        ranking = self.snapshot['rankings'].get(product_type or ALL_TYPES)
+        position = bisect.bisect_left(self.buckets, amount)
+        if ranking is None or position == len(self.buckets):
+            return []
+        by_bucket = ranking[RATE_KEYS[salary_transfer]]
+        return [self.products[i] for i in by_bucket[str(self.buckets[position])][:n]]
+
+
+class OfferIndexStore:
+    """버전별 인덱스 스냅샷 파일 저장소 (latest.json이 최신 버전을 가리킴)"""
+
+    def __init__(self, root: Optional[Path] = None, keep: Optional[int] = None):
+        self.root = Path(root) if root else DEFAULT_INDEX_DIR
+        self.keep = keep or CrawlingConfig.OFFER_INDEX_KEEP
+
+    def save(self, snapshot: Dict) -> Path:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / f"{snapshot['version']}.json"
+        self._write_atomic(path, snapshot)
+        self._write_atomic(self.root / LATEST_FILE, {'version': snapshot['version'], 'path': path.name})
+        self.prune()
+        return path
+
+    def versions(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.stem for p in self.root.glob('*.json') if p.name != LATEST_FILE)
+
+    def load(self, version: str) -> Dict:
+        with open(self.root / f"{version}.json", 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load_latest(self) -> Optional[Dict]:
+        pointer = self.root / LATEST_FILE
+        if not pointer.exists():
+            return None
+        with open(pointer, 'r', encoding='utf-8') as f:
+            return self.load(json.load(f)['version'])
+
+    def prune(self):
+        """오래된 스냅샷 정리 (최근 keep개 유지)"""
+        for version in self.versions()[:-self.keep]:
+            (self.root / f"{version}.json").unlink(missing_ok=True)
+
+    @staticmethod
+    def _write_atomic(path: Path, data: Dict):
+        tmp_path = path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+
+def publish_offer_index(supabase, version: str, store: Optional[OfferIndexStore] = None) -> Optional[Dict]:
+    """적재 후 단계: 전체 상품으로 인덱스를 만들어 로컬/DB에 스냅샷 저장"""
+    products = supabase.get_latest_products()
+    if not products:
+        logger.warning("⚠️ 상품이 없어 최적 상품 인덱스를 갱신하지 않습니다.")
+        return None
+    snapshot = build_offer_index(products, version)
+    path = (store or OfferIndexStore()).save(snapshot)
+    supabase.save_offer_index(snapshot)
+    logger.info(f"🗂️ 최적 상품 인덱스 v{version} 생성: 상품 {snapshot['product_count']}개 → {path}")
+    return snapshot
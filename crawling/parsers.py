@@ -0,0 +1,221 @@
+"""
+목록 페이지 파서 (Parser Backend)
+- 크롤러는 상품 블록/필드 선택자를 ItemSelector로 한 번만 선언하고, 백엔드별로 한 번만 컴파일해 재사용합니다.
+- 설치된 백엔드 중 가장 빠른 것을 자동 선택: selectolax(lexbor) > lxml(cssselect) > BeautifulSoup
+- 전체 soup 트리를 만들지 않고 필요한 필드 텍스트와 상품 HTML 조각(변경 감지 지문용)만 추출합니다.
+
+주의: 상품 HTML 조각의 직렬화 결과는 백엔드마다 조금씩 달라서, 백엔드를 바꾸면
+      첫 실행에서는 모든 상품이 변경된 것으로 판단되어 한 번 전체 수집됩니다.
+"""
+import logging
+import re
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from .config import CrawlingConfig
+
+logger = logging.getLogger(__name__)
+
+# '.class' / '#id' 단일 선택자 (fetchers.contains_selector도 같은 정의를 사용)
+SIMPLE_SELECTOR = re.compile(r'^([.#])([\w-]+)$')
+# 'a.title@href' -> (CSS 선택자, 속성 이름)
+_ATTRIBUTE_SELECTOR = re.compile(r'^(.+?)@([\w:-]+)$')
+
+# 자동 선택 우선순위 (빠른 순)
+BACKEND_PRIORITY = ('selectolax', 'lxml', 'bs4')
+
+
+def _join_text(strings, separator: str) -> str:
+    """BeautifulSoup get_text(separator, strip=True)와 같은 규칙으로 텍스트 조각 결합"""
+    return separator.join(s.strip() for s in strings if s.strip())
+
+
+class ItemSelector:
+    """
+    목록 페이지 선택자 선언
+    사용 예:
+        ItemSelector('.area1', {'product_name': 'a.title strong', 'limit': '.info-data2',
+                                'detail_url': 'a.title@href'},
+                     separators={'limit': ' '})
+    - item: 상품 하나를 감싸는 블록 선택자
+    - fields: 결과 키 -> 블록 안의 CSS 선택자 (요소가 없으면 값은 None)
+              '선택자@속성' 형태면 텍스트 대신 첫 요소의 속성 값을 추출 (속성이 없어도 None)
+    - separators: 필드별 텍스트 조각 구분자 (기본 '', '<span>3.5</span>억원' 같은 구조는 ' ' 권장)
+    """
+
+    def __init__(self, item: str, fields: Dict[str, str], separators: Optional[Dict[str, str]] = None):
+        self.item = item
+        self.fields: Dict[str, str] = {}
+        self.attributes: Dict[str, str] = {}
+        for field, selector in fields.items():
+            match = _ATTRIBUTE_SELECTOR.match(selector.strip())
+            if match:
+                selector, self.attributes[field] = match.groups()
+            self.fields[field] = selector
+        self.separators = dict(separators or {})
+        self._compiled: Dict[str, 'BaseParser'] = {}
+        self._lock = threading.Lock()
+
+    def compile(self, backend: Optional[str] = None) -> 'BaseParser':
+        """백엔드별 파서를 한 번만 만들어 재사용 (선택자 사전 컴파일)"""
+        requested = backend or CrawlingConfig.PARSER_BACKEND
+        with self._lock:
+            if requested not in self._compiled:
+                self._compiled[requested] = PARSER_BACKENDS[resolve_backend(requested)](self)
+            return self._compiled[requested]
+
+    def separator(self, field: str) -> str:
+        return self.separators.get(field, '')
+
+
+class BaseParser(ABC):
+    """파서 백엔드 베이스 클래스"""
+
+    backend = ''
+
+    def __init__(self, spec: ItemSelector):
+        self.spec = spec
+
+    @abstractmethod
+    def extract(self, html: str) -> List[Dict]:
+        """
+        상품 블록별 필드 추출
+        [{'html': 상품 HTML 조각, <field>: 텍스트 또는 None, ...}]
+        """
+        pass
+
+
+class SelectolaxParser(BaseParser):
+    """selectolax(lexbor, C 구현 HTML5 파서)"""
+
+    backend = 'selectolax'
+
+    def __init__(self, spec: ItemSelector):
+        super().__init__(spec)
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser_class = LexborHTMLParser
+
+    def extract(self, html: str) -> List[Dict]:
+        tree = self._parser_class(html)
+        items = []
+        for node in tree.css(self.spec.item):
+            item = {'html': node.html}
+            for field, selector in self.spec.fields.items():
+                found = node.css_first(selector)
+                if found is not None and field in self.spec.attributes:
+                    item[field] = found.attributes.get(self.spec.attributes[field])
+                    continue
+                item[field] = None if found is None else _join_text(
+                    (text.text_content or '' for text in found.traverse(include_text=True) if text.tag == '-text'),
+                    self.spec.separator(field)
+                )
+            items.append(item)
+        return items
+
+
+class LxmlParser(BaseParser):
+    """lxml.html + cssselect (선택자를 XPath로 미리 컴파일)"""
+
+    backend = 'lxml'
+
+    def __init__(self, spec: ItemSelector):
+        super().__init__(spec)
+        import lxml.html
+        from lxml.cssselect import CSSSelector
+        self._html = lxml.html
+        self._item = CSSSelector(spec.item)
+        self._fields = {field: CSSSelector(selector) for field, selector in spec.fields.items()}
+
+    def extract(self, html: str) -> List[Dict]:
+        if not html or not html.strip():
+            return []
+        root = self._html.document_fromstring(html)
+        items = []
+        for node in self._item(root):
+            item = {'html': self._html.tostring(node, encoding='unicode', with_tail=False)}
+            for field, selector in self._fields.items():
+                found = selector(node)
+                if found and field in self.spec.attributes:
+                    item[field] = found[0].get(self.spec.attributes[field])
+                    continue
+                item[field] = _join_text(found[0].itertext(), self.spec.separator(field)) if found else None
+            items.append(item)
+        return items
+
+
+class SoupParser(BaseParser):
+    """
+    BeautifulSoup (항상 사용 가능한 대체 백엔드)
+    - 상품 블록 선택자가 .class / #id 형태면 SoupStrainer로 해당 블록만 트리로 만듦
+    - lxml이 설치되어 있으면 트리 빌더로 lxml 사용
+    """
+
+    backend = 'bs4'
+
+    def __init__(self, spec: ItemSelector):
+        super().__init__(spec)
+        from bs4 import BeautifulSoup, SoupStrainer
+        self._soup_class = BeautifulSoup
+        self._builder = 'lxml' if _installed('lxml') else 'html.parser'
+        self._strainer = None
+        match = SIMPLE_SELECTOR.match(spec.item.strip())
+        if match:
+            kind, name = match.groups()
+            self._strainer = SoupStrainer(class_=name) if kind == '.' else SoupStrainer(id=name)
+
+    def extract(self, html: str) -> List[Dict]:
+        soup = self._soup_class(html, self._builder, parse_only=self._strainer)
+        items = []
+        for node in soup.select(self.spec.item):
+            item = {'html': str(node)}
+            for field, selector in self.spec.fields.items():
+                found = node.select_one(selector)
+                if found is not None and field in self.spec.attributes:
+                    value = found.get(self.spec.attributes[field])
+                    # class 같은 다중 값 속성은 목록으로 반환되므로 공백으로 결합
+                    item[field] = ' '.join(value) if isinstance(value, list) else value
+                    continue
+                item[field] = None if found is None else found.get_text(self.spec.separator(field), strip=True)
+            items.append(item)
+        return items
+
+
+PARSER_BACKENDS = {
+    'selectolax': SelectolaxParser,
+    'lxml': LxmlParser,
+    'bs4': SoupParser,
+}
+
+_BACKEND_MODULES = {
+    'selectolax': 'selectolax.lexbor',
+    'lxml': 'lxml.cssselect',
+    'bs4': 'bs4',
+}
+
+
+def _installed(module: str) -> bool:
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+
+def available_backends() -> List[str]:
+    """설치된 백엔드 목록 (빠른 순)"""
+    return [name for name in BACKEND_PRIORITY if _installed(_BACKEND_MODULES[name])]
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """설정값(PARSER_BACKEND)에 맞는 백엔드 이름 ('auto'면 설치된 것 중 가장 빠른 것)"""
+    backend = (backend or CrawlingConfig.PARSER_BACKEND).lower()
+    if backend == 'auto':
+        return available_backends()[0]
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"지원하지 않는 파서 백엔드: {backend}")
+    if not _installed(_BACKEND_MODULES[backend]):
+        fallback = available_backends()[0]
+        logger.warning(f"{backend} 패키지가 없어 {fallback} 파서를 사용합니다.")
+        return fallback
+    return backend
@@ -0,0 +1,247 @@
+"""
+단계별 크롤링 파이프라인 (추출 → 정제 → 적재)
+- 은행 하나의 수집이 끝나는 즉시 그 은행 상품을 정제하고 DB에 적재합니다.
+  (느린 은행을 기다리는 동안 먼저 끝난 은행의 정제/적재가 함께 진행됨)
+- 단계 사이는 크기가 제한된 큐로 연결되어, 뒤 단계가 밀리면 앞 단계가 기다립니다 (backpressure).
+- 종료 신호(_STOP)가 추출 → 정제 → 적재 순서로 전달되어 남은 배치를 모두 처리한 뒤 종료합니다.
+- 금리 이력 저장소(history)를 넘기면 정제 직후 마지막 상태와 비교해 바뀐 상품만 적재하고,
+  적재에 성공한 상품의 변경 필드를 이벤트로 기록합니다.
+- 스냅샷 저장소(snapshots)를 넘기면 변경 비교 전의 정제 결과를 은행별 Parquet 파티션으로 남깁니다.
+  스냅샷은 실행마다 그날의 전체 상품이어야 하므로, 이때는 크롤러의 지문 기반 건너뛰기(페이지/상품)를 끕니다.
+  (바뀌지 않은 상품의 재적재는 금리 이력 비교가 계속 걸러냄)
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .cleansing import LoanDataCleaner
+from .config import CrawlingConfig
+from .metrics import METRICS
+from .rate_history import RateHistoryStore, loaded_events
+from .records import ProductBatch
+from .scheduler import CrawlScheduler
+from .snapshot_store import ProductSnapshotStore
+
+logger = logging.getLogger(__name__)
+
+# 단계 종료 신호
+_STOP = object()
+
+
+class CrawlPipeline:
+    """
+    스케줄러 결과를 은행 단위 배치로 정제/적재하는 파이프라인
+    사용 예:
+        summary = CrawlPipeline(supabase).run(crawlers)
+    """
+
+    def __init__(
+        self,
+        supabase,
+        scheduler: Optional[CrawlScheduler] = None,
+        queue_size: Optional[int] = None,
+        config: CrawlingConfig = None,
+        history: Optional[RateHistoryStore] = None,
+        snapshots: Optional[ProductSnapshotStore] = None
+    ):
+        self.supabase = supabase
+        self.history = history
+        self.snapshots = snapshots
+        self.config = config or CrawlingConfig()
+        self.scheduler = scheduler or CrawlScheduler(config=self.config)
+        self.queue_size = queue_size or self.config.PIPELINE_QUEUE_SIZE
+        self.banks: List[Dict] = []
+        self._busy = {'clean': 0.0, 'load': 0.0}
+
+    def run(self, crawlers: List) -> Dict:
+        """전체 파이프라인 실행 후 요약 반환 (은행별 결과는 끝난 순서대로 banks에 기록)"""
+        started = time.perf_counter()
+        self.banks = []
+        self._busy = {'clean': 0.0, 'load': 0.0}
+        if self.snapshots is not None:
+            self._require_full_crawl(crawlers)
+        clean_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        load_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stages = [
+            threading.Thread(target=self._clean_stage, args=(clean_queue, load_queue), name='pipeline-clean'),
+            threading.Thread(target=self._load_stage, args=(load_queue,), name='pipeline-load'),
+        ]
+        for stage in stages:
+            stage.start()
+
+        # 1. 추출: 스케줄러가 은행별 결과를 끝나는 순서대로 넘겨줌
+        try:
+            for result in self.scheduler.iter_results(crawlers):
+                clean_queue.put(result)
+        finally:
+            extract_sec = time.perf_counter() - started
+            clean_queue.put(_STOP)
+            for stage in stages:
+                stage.join()
+        self.scheduler.log_summary(extract_sec)
+
+        summary = {
+            # 처리한 은행이 없으면(대상 은행/작업 큐 실행 ID 오류 등) 실패로 보고
+            'success': bool(self.banks) and all(
+                bank['load_status'] != 'failed' and not bank['failed_rows'] for bank in self.banks
+            ),
+            'banks': self.banks,
+            'crawled_rows': sum(bank['crawled'] for bank in self.banks),
+            'cleaned_rows': sum(bank['cleaned'] for bank in self.banks),
+            'loaded_rows': sum(bank['loaded'] for bank in self.banks),
+            'failed_rows': sum(bank['failed_rows'] for bank in self.banks),
+            'unchanged_rows': sum(bank['unchanged'] for bank in self.banks),
+            'history_events': sum(bank['history_events'] for bank in self.banks),
+            'extract_sec': round(extract_sec, 3),
+            'clean_busy_sec': round(self._busy['clean'], 3),
+            'load_busy_sec': round(self._busy['load'], 3),
+            'elapsed_sec': round(time.perf_counter() - started, 3)
+        }
+        self.log_summary(summary)
+        return summary
+
+    @staticmethod
+    def _require_full_crawl(crawlers: List):
+        """지문으로 건너뛴 상품은 스냅샷에 빠지므로, 스냅샷을 남기는 실행은 모든 상품을 파싱"""
+        for crawler in crawlers:
+            if getattr(crawler, 'fingerprints', None) is not None:
+                logger.info(f"🗄️ {crawler.bank_name} 스냅샷 저장을 위해 변경 감지 건너뛰기 없이 전체 상품을 수집합니다.")
+                crawler.fingerprints = None
+
+    @staticmethod
+    def clean(products: List) -> ProductBatch:
+        """
+        은행 하나의 상품을 정제해 적재용 레코드로 변환 (중복 기준에 bank_name이 포함되어 은행별 정제와 전체 정제 결과가 같음)
+        LoanProduct에는 crawled_at 필드가 없으므로 DB 스키마의 'DEFAULT NOW()'가 값을 채웁니다. (PGRST204 회피)
+        """
+        if not products:
+            return ProductBatch()
+        return LoanDataCleaner.clean_products(products)
+
+    def _clean_stage(self, inbox: queue.Queue, outbox: queue.Queue):
+        """2. 정제: 은행 단위로 validate_and_clean 후 적재 큐로 전달"""
+        while True:
+            result = inbox.get()
+            if result is _STOP:
+                outbox.put(_STOP)
+                return
+            started = time.perf_counter()
+            batch = {'metrics': result['metrics'], 'crawled': len(result['products']), 'cleaned': 0,
+                     'records': [], 'events': [], 'error': None}
+            try:
+                batch['records'] = self.clean(result['products'])
+                batch['cleaned'] = len(batch['records'])
+                if batch['records']:
+                    logger.info(f"🧹 {result['bank_name']} 정제 완료: {len(batch['records'])}건")
+                if self.snapshots and batch['records']:
+                    self._write_snapshot(result['bank_name'], batch['records'])
+                if self.history and batch['records']:
+                    # 2-1. 변경 비교: 마지막 상태와 같은 상품은 적재 대상에서 제외
+                    with METRICS.span('diff', bank=result['bank_name']):
+                        batch['events'], batch['records'] = self.history.diff(batch['records'])
+                    logger.info(f"🔍 {result['bank_name']} 변경 상품 {len(batch['records'])}/{batch['cleaned']}건")
+            except Exception as e:
+                batch['error'] = f"정제 실패: {e}"
+                logger.error(f"❌ {result['bank_name']} 정제 실패: {e}")
+            self._busy['clean'] += time.perf_counter() - started
+            outbox.put(batch)
+
+    def _write_snapshot(self, bank_name: str, records: List[Dict]):
+        """2-0. 정제 결과 스냅샷 (분석용 로컬 사본이므로 실패해도 적재는 계속)"""
+        try:
+            self.snapshots.write(records)
+        except Exception as e:
+            logger.warning(f"⚠️ {bank_name} 상품 스냅샷 저장 실패: {e}")
+
+    def _load_stage(self, inbox: queue.Queue):
+        """3. 적재: 은행 단위 대량 UPSERT 후 크롤링 로그 기록"""
+        while True:
+            batch = inbox.get()
+            if batch is _STOP:
+                return
+            started = time.perf_counter()
+            try:
+                self.banks.append(self._load_batch(batch))
+            except Exception as e:
+                metric = batch['metrics']
+                logger.error(f"❌ {metric['bank_name']} 적재 단계 오류: {e}")
+                self.banks.append(self._bank_result(batch, 'failed', error=str(e)))
+            self._busy['load'] += time.perf_counter() - started
+
+    def _load_batch(self, batch: Dict) -> Dict:
+        metric = batch['metrics']
+        bank_name = metric['bank_name']
+
+        if metric['status'] == 'failed' or batch['error']:
+            error = metric['error'] or batch['error']
+            self.supabase.log_crawling_result(bank_name, 'failed', 0, error)
+            return self._bank_result(batch, 'failed', error=error)
+
+        records = batch['records']
+        if not records:
+            if metric['status'] == 'unchanged' or batch['cleaned']:
+                logger.info(f"⏭️ {bank_name} 지난 실행 이후 변경된 상품이 없어 적재를 생략합니다.")
+            else:
+                logger.warning(f"⚠️ {bank_name} 적재할 유효 데이터가 없습니다.")
+            self.supabase.log_crawling_result(bank_name, 'success', 0)
+            return self._bank_result(batch, 'skipped')
+
+        report = self.supabase.bulk_upsert_loan_products(records)
+        loaded, failed = report['loaded_rows'], report['failed_row_count']
+        if self.history and batch['events']:
+            self._record_history(batch, report)
+        if not failed:
+            self.supabase.log_crawling_result(bank_name, 'success', loaded)
+            status = 'success'
+        elif loaded:
+            self.supabase.log_crawling_result(bank_name, 'partial', loaded, f"{failed}건 적재 실패")
+            status = 'partial'
+        else:
+            self.supabase.log_crawling_result(bank_name, 'failed', 0, f"{failed}건 적재 실패")
+            status = 'failed'
+        return self._bank_result(batch, status, loaded=loaded, failed=failed)
+
+    def _record_history(self, batch: Dict, report: Dict):
+        """적재에 성공한 상품의 변경 이벤트만 기록 (실패 상품은 다음 실행에서 다시 비교)"""
+        events = loaded_events(batch['events'], report['failed_rows'])
+        batch['events'] = events
+        self.history.commit(events)
+        if events and self.config.RATE_HISTORY_TO_DB:
+            self.supabase.insert_rate_history(events)
+
+    @staticmethod
+    def _bank_result(batch: Dict, load_status: str, loaded: int = 0, failed: int = 0,
+                     error: Optional[str] = None) -> Dict:
+        metric = batch['metrics']
+        return {
+            'bank_name': metric['bank_name'],
+            'crawl_status': metric['status'],
+            'load_status': load_status,
+            'crawled': batch['crawled'],
+            'cleaned': batch['cleaned'],
+            'loaded': loaded,
+            'failed_rows': failed,
+            'unchanged': metric['unchanged_count'] + batch['cleaned'] - len(batch['records']),
+            'history_events': len(batch['events']) if load_status in ('success', 'partial') else 0,
+            'crawl_sec': metric['elapsed_sec'],
+            'error': error or metric['error'] or batch['error']
+        }
+
+    @staticmethod
+    def log_summary(summary: Dict):
+        logger.info("📈 파이프라인 결과")
+        if not summary['banks']:
+            logger.error("   - ❌ 처리한 은행이 없습니다. (대상 은행 / 작업 큐 실행 ID 확인)")
+        for bank in summary['banks']:
+            logger.info(
+                f"   - {bank['bank_name']}: 수집 {bank['crawl_status']} {bank['crawled']}건 → "
+                f"정제 {bank['cleaned']}건 → 적재 {bank['load_status']} {bank['loaded']}건"
+            )
+        logger.info(
+            f"   - 추출 {summary['extract_sec']:.1f}초 / 정제 {summary['clean_busy_sec']:.1f}초 / "
+            f"적재 {summary['load_busy_sec']:.1f}초 → 전체 {summary['elapsed_sec']:.1f}초"
+        )
+        if summary['history_events']:
+            logger.info(f"   - 변경 이력 이벤트 {summary['history_events']}건 기록")
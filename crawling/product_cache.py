@@ -0,0 +1,140 @@
+"""
+상품 조회 캐시 (Read-through Product Cache)
+- get_latest_products() 결과를 bank_name 필터별로 보관합니다. (TTL 만료 + 최대 개수 초과 시 LRU 제거)
+- 스냅샷 파일을 켜 두면 새 프로세스도 TTL 이내의 조회 결과를 DB 왕복 없이 재사용합니다.
+- 상품 적재가 성공하면 SupabaseManager가 invalidate()를 호출해 메모리/스냅샷을 모두 비웁니다.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .config import CrawlingConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_PATH = Path(__file__).resolve().parent / 'state' / 'product_cache.json'
+
+# bank_name=None(전체 조회)의 캐시 키
+ALL_BANKS = '*'
+
+
+class ProductCache:
+    """bank_name 필터별 조회 결과 캐시 (스레드 안전)"""
+
+    def __init__(
+        self,
+        ttl_sec: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        snapshot_path: Optional[Path] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.ttl_sec = CrawlingConfig.PRODUCT_CACHE_TTL_SEC if ttl_sec is None else ttl_sec
+        self.max_entries = max_entries or CrawlingConfig.PRODUCT_CACHE_MAX_ENTRIES
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (저장 시각(epoch), 상품 목록), 뒤쪽일수록 최근 사용
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+        self._load_snapshot()
+
+    @staticmethod
+    def key(bank_name: Optional[str]) -> str:
+        return bank_name or ALL_BANKS
+
+    def get(self, bank_name: Optional[str]) -> Optional[List[Dict]]:
+        """캐시된 상품 목록 (없거나 만료되면 None)"""
+        key = self.key(bank_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry[0]):
+                if entry is not None:
+                    del self._entries[key]
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            # 호출 측이 목록을 바꿔도 캐시는 그대로 유지되도록 목록은 복사해서 반환
+            return list(entry[1])
+
+    def put(self, bank_name: Optional[str], products: List[Dict]):
+        key = self.key(bank_name)
+        with self._lock:
+            self._entries[key] = (self._clock(), list(products))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+            self._save_snapshot()
+
+    def get_or_load(self, bank_name: Optional[str], loader: Callable[[], Optional[List[Dict]]]) -> List[Dict]:
+        """
+        캐시에 없으면 loader()로 조회 후 저장
+        loader가 None을 반환하면(조회 실패) 캐시하지 않고 빈 목록 반환
+        """
+        products = self.get(bank_name)
+        if products is not None:
+            return products
+        products = loader()
+        if products is None:
+            return []
+        self.put(bank_name, products)
+        return list(products)
+
+    def invalidate(self):
+        """모든 캐시 항목과 스냅샷 삭제 (상품 적재 성공 시 호출)"""
+        with self._lock:
+            self._entries.clear()
+            self.stats['invalidations'] += 1
+            if self.snapshot_path:
+                self.snapshot_path.unlink(missing_ok=True)
+
+    def summary(self) -> Dict:
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'entries': len(self._entries),
+                'hit_rate': round(self.stats['hits'] / lookups, 4) if lookups else 0.0
+            }
+
+    def _expired(self, stored_at: float) -> bool:
+        return self._clock() - stored_at > self.ttl_sec
+
+    def _load_snapshot(self):
+        """콜드 스타트: 스냅샷 파일에서 TTL 이내 항목만 복원"""
+        if not self.snapshot_path or not self.snapshot_path.exists():
+            return
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for key, entry in data.get('entries', {}).items():
+                if not self._expired(entry['stored_at']):
+                    self._entries[key] = (entry['stored_at'], entry['products'])
+            logger.info(f"🗃️ 상품 캐시 스냅샷 로드: {len(self._entries)}개 항목")
+        except Exception as e:
+            # 손상된 스냅샷은 무시하고 DB에서 다시 조회
+            logger.warning(f"상품 캐시 스냅샷 로드 실패: {e}")
+            self._entries.clear()
+
+    def _save_snapshot(self):
+        """락을 잡은 상태에서 호출 (임시 파일에 쓴 뒤 교체)"""
+        if not self.snapshot_path:
+            return
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_suffix('.json.tmp')
+            entries = {
+                key: {'stored_at': stored_at, 'products': products}
+                for key, (stored_at, products) in self._entries.items()
+            }
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'entries': entries}, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            logger.warning(f"상품 캐시 스냅샷 저장 실패: {e}")
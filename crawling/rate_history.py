@@ -0,0 +1,288 @@
+"""
+금리 변경 이력 (Change-only Rate History)
+- 정제된 상품을 마지막으로 알려진 상태와 비교해 바뀐 필드만 이벤트로 기록합니다.
+  (매일 전체 복사본을 쌓지 않고, 바뀐 상품만 DB에 UPSERT)
+- 저장 구조 (state/rate_history/):
+    events.jsonl            시간순 이벤트 {"ts", "bank_name", "product_name", "changes": {필드: 새 값}}
+    current.json            최신 상태 전체 + events.jsonl 바이트 위치 (비교 기준)
+    checkpoints/<ts>.json   N개 이벤트마다 남기는 전체 상태 (시점 복원 시작점)
+- 시점 복원은 그 시점 이전의 가장 가까운 체크포인트에서 시작해 이후 이벤트만 다시 적용합니다.
+
+사용 예:
+    python -m crawling.rate_history --at 2026-02-01            # 해당 시점의 전체 상품 상태
+    python -m crawling.rate_history --bank KB --product "KB 직장인든든 신용대출"   # 상품 변경 이력
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .config import CrawlingConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_DIR = Path(__file__).resolve().parent / 'state' / 'rate_history'
+EVENTS_FILE = 'events.jsonl'
+CURRENT_FILE = 'current.json'
+CHECKPOINT_DIR = 'checkpoints'
+
+# 비교 대상에서 제외하는 필드 (상품 키 / DB가 채우는 값)
+IGNORED_FIELDS = {'bank_name', 'product_name', 'id', 'crawled_at', 'created_at', 'updated_at'}
+
+
+def product_key(bank_name: str, product_name: str) -> str:
+    return f"{bank_name}\t{product_name}"
+
+
+def changed_fields(previous: Optional[Dict], record: Dict) -> Dict:
+    """이전 상태 대비 바뀐 필드 (새 상품이면 전체 필드)"""
+    previous = previous or {}
+    return {
+        field: value for field, value in record.items()
+        if field not in IGNORED_FIELDS and (field not in previous or previous[field] != value)
+    }
+
+
+def loaded_events(events: List[Dict], failed_rows: List[Dict]) -> List[Dict]:
+    """적재에 성공한 상품의 이벤트만 남김 (실패 상품은 다음 실행에서 다시 비교)"""
+    failed_keys = {product_key(row['bank_name'], row['product_name']) for row in failed_rows}
+    return [event for event in events if product_key(event['bank_name'], event['product_name']) not in failed_keys]
+
+
+def _checkpoint_name(ts: str) -> str:
+    """체크포인트 파일명 (':' 제외, 사전순 = 시간순)"""
+    return ts.replace(':', '')
+
+
+def _write_json_atomic(path: Path, data: Dict):
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'), default=str)
+    os.replace(tmp_path, path)
+
+
+class RateHistoryStore:
+    """변경 이벤트 저장소 (스레드 안전)"""
+
+    def __init__(self, root: Optional[Path] = None, checkpoint_every: Optional[int] = None):
+        self.root = Path(root) if root else DEFAULT_HISTORY_DIR
+        self.checkpoint_every = checkpoint_every or CrawlingConfig.RATE_HISTORY_CHECKPOINT_EVERY
+        self._lock = threading.Lock()
+        self.state: Dict[str, Dict] = {}
+        self.event_count = 0
+        self._offset = 0
+        self._last_checkpoint = 0
+        self.load()
+
+    @property
+    def events_path(self) -> Path:
+        return self.root / EVENTS_FILE
+
+    def load(self):
+        path = self.root / CURRENT_FILE
+        if not path.exists():
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.state = data['state']
+            self.event_count = data['event_count']
+            self._offset = data['offset']
+            self._last_checkpoint = data.get('last_checkpoint', 0)
+            logger.info(f"📜 금리 이력 로드: 상품 {len(self.state)}개 / 이벤트 {self.event_count}건")
+        except Exception as e:
+            # 최신 상태가 손상되면 이벤트 로그에서 다시 만듦
+            logger.warning(f"금리 이력 상태 로드 실패, 이벤트 로그로 복구합니다: {e}")
+            self.state, self.event_count, self._offset = self._replay(None, {}, 0, 0)
+
+    def diff(self, records: List[Dict], ts: Optional[str] = None) -> Tuple[List[Dict], List[Dict]]:
+        """
+        정제된 레코드와 최신 상태 비교 (저장소는 바꾸지 않음)
+        반환: (변경 이벤트 목록, 변경된 레코드 목록 = 적재 대상)
+        """
+        ts = ts or datetime.now().isoformat()
+        events, changed = [], []
+        with self._lock:
+            for record in records:
+                changes = changed_fields(self.state.get(product_key(record['bank_name'], record['product_name'])), record)
+                if not changes:
+                    continue
+                events.append({
+                    'ts': ts,
+                    'bank_name': record['bank_name'],
+                    'product_name': record['product_name'],
+                    'changes': changes
+                })
+                changed.append(record)
+        return events, changed
+
+    def commit(self, events: List[Dict]):
+        """적재에 성공한 이벤트를 로그에 추가하고 최신 상태 갱신"""
+        if not events:
+            return
+        with self._lock:
+            self._append(events)
+
+    def state_before(self, ts: str) -> Dict[str, Dict]:
+        """ts 직전(ts 시점 이벤트 제외)의 상품별 상태"""
+        with self._lock:
+            return self._scan_before(ts)[0]
+
+    def replace_events(self, since: str, events: List[Dict], banks: Optional[List[str]] = None):
+        """
+        since 이후(포함) 이벤트를 새 이벤트로 교체 (원본 재처리로 이력을 다시 만들 때)
+        banks를 주면 그 은행의 이벤트만 교체하고, 다른 은행 이벤트는 새 이벤트와 시간순으로 합쳐 유지합니다.
+        """
+        with self._lock:
+            state, count, offset, checkpoint_count = self._scan_before(since)
+            kept = [event for event in self.iter_events(offset) if banks and event['bank_name'] not in banks]
+            for path in self._checkpoints():
+                if path.stem >= _checkpoint_name(since):
+                    path.unlink()
+            self.state, self.event_count, self._offset, self._last_checkpoint = state, count, offset, checkpoint_count
+            self._append(sorted(kept + list(events), key=lambda event: event['ts']))
+        logger.info(f"📜 금리 이력 재구성: {since} 이후 이벤트 {len(events)}건 (다른 은행 {len(kept)}건 유지)")
+
+    def state_at(self, ts: str) -> Dict[str, Dict]:
+        """ts 시점의 상품별 상태 복원 (ts 이전 가장 가까운 체크포인트 + 이후 이벤트)"""
+        with self._lock:
+            base, offset, count = {}, 0, 0
+            checkpoints = [p for p in self._checkpoints() if p.stem <= _checkpoint_name(ts)]
+            if checkpoints:
+                with open(checkpoints[-1], 'r', encoding='utf-8') as f:
+                    checkpoint = json.load(f)
+                base, offset, count = checkpoint['state'], checkpoint['offset'], checkpoint['event_count']
+            return self._replay(ts, base, offset, count)[0]
+
+    def product_history(self, bank_name: str, product_name: str) -> List[Dict]:
+        """상품 하나의 변경 이벤트 (오래된 순)"""
+        return [
+            event for event in self.iter_events()
+            if event['bank_name'] == bank_name and event['product_name'] == product_name
+        ]
+
+    def iter_events(self, offset: int = 0, end: Optional[int] = None):
+        if not self.events_path.exists():
+            return
+        end = self._offset if end is None else end
+        with open(self.events_path, 'rb') as f:
+            f.seek(offset)
+            while f.tell() < end:
+                line = f.readline()
+                if not line:
+                    return
+                yield json.loads(line)
+
+    def _replay(self, until: Optional[str], state: Dict, offset: int, count: int) -> Tuple[Dict, int, int]:
+        """offset부터 until 시점까지 이벤트 적용 (until=None이면 로그 끝까지)"""
+        if not self.events_path.exists():
+            return state, count, offset
+        end = self.events_path.stat().st_size if until is None else self._offset
+        with open(self.events_path, 'rb') as f:
+            f.seek(offset)
+            while f.tell() < end:
+                position = f.tell()
+                line = f.readline()
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # 기록 도중 중단된 마지막 줄
+                    return state, count, position
+                if until is not None and event['ts'] > until:
+                    break
+                key = product_key(event['bank_name'], event['product_name'])
+                state.setdefault(key, {}).update(event['changes'])
+                count += 1
+            return state, count, f.tell()
+
+    def _append(self, events: List[Dict]):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.events_path, 'ab') as f:
+            f.seek(self._offset)
+            f.truncate()  # 이전 실행이 상태 저장 전에 중단되어 남은 꼬리(또는 교체할 이벤트) 제거
+            for event in events:
+                f.write((json.dumps(event, ensure_ascii=False, default=str) + '\n').encode('utf-8'))
+            self._offset = f.tell()
+        for event in events:
+            key = product_key(event['bank_name'], event['product_name'])
+            self.state.setdefault(key, {}).update(event['changes'])
+        self.event_count += len(events)
+        if events and self.event_count - self._last_checkpoint >= self.checkpoint_every:
+            self._write_checkpoint(events[-1]['ts'])
+        self._save_current()
+
+    def _scan_before(self, ts: str) -> Tuple[Dict, int, int, int]:
+        """ts 이전 이벤트까지 적용한 (상태, 이벤트 수, 바이트 위치, 기준 체크포인트 이벤트 수)"""
+        state, offset, count = {}, 0, 0
+        checkpoints = [p for p in self._checkpoints() if p.stem < _checkpoint_name(ts)]
+        if checkpoints:
+            with open(checkpoints[-1], 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            state, offset, count = checkpoint['state'], checkpoint['offset'], checkpoint['event_count']
+        checkpoint_count = count
+        if not self.events_path.exists():
+            return state, count, offset, checkpoint_count
+        with open(self.events_path, 'rb') as f:
+            f.seek(offset)
+            while offset < self._offset:
+                event = json.loads(f.readline())
+                if event['ts'] >= ts:
+                    break
+                state.setdefault(product_key(event['bank_name'], event['product_name']), {}).update(event['changes'])
+                count += 1
+                offset = f.tell()
+        return state, count, offset, checkpoint_count
+
+    def _checkpoints(self) -> List[Path]:
+        directory = self.root / CHECKPOINT_DIR
+        return sorted(directory.glob('*.json')) if directory.exists() else []
+
+    def _write_checkpoint(self, ts: str):
+        directory = self.root / CHECKPOINT_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        _write_json_atomic(directory / f"{_checkpoint_name(ts)}.json", {
+            'ts': ts, 'event_count': self.event_count, 'offset': self._offset, 'state': self.state
+        })
+        self._last_checkpoint = self.event_count
+
+    def _save_current(self):
+        _write_json_atomic(self.root / CURRENT_FILE, {
+            'event_count': self.event_count,
+            'offset': self._offset,
+            'last_checkpoint': self._last_checkpoint,
+            'state': self.state
+        })
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="금리 변경 이력 조회 / 시점 복원")
+    parser.add_argument('--at', help="복원 시점 (ISO 형식, 예: 2026-02-01 또는 2026-02-01T09:00:00)")
+    parser.add_argument('--bank', help="은행명 필터")
+    parser.add_argument('--product', help="상품명 (--bank와 함께 지정하면 변경 이력 출력)")
+    parser.add_argument('--root', type=Path, default=None, help="이력 저장소 경로")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s')
+    store = RateHistoryStore(args.root)
+
+    if args.bank and args.product:
+        rows = store.product_history(args.bank, args.product)
+    else:
+        state = store.state_at(args.at) if args.at else store.state
+        rows = [
+            {'bank_name': key.split('\t')[0], 'product_name': key.split('\t')[1], **record}
+            for key, record in sorted(state.items())
+            if not args.bank or key.split('\t')[0] == args.bank
+        ]
+    for row in rows:
+        sys.stdout.write(json.dumps(row, ensure_ascii=False, default=str) + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
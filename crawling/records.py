@@ -0,0 +1,222 @@
+"""
+정제 상품 레코드 (LoanProduct / ProductBatch)
+- parse_product_row()부터 validate → 중복 제거 → 적재까지 상품 하나를 __slots__ 레코드 하나로 전달합니다.
+  (dict → DataFrame → dict 왕복 없이, 상품마다 키 해시 테이블을 따로 들고 있지 않음)
+- LoanProduct는 읽기 전용 Mapping이라 기존 코드의 record['bank_name'] / record.get(...) / record.items()가 그대로 동작합니다.
+- DB/JSON으로 보낼 때만 to_dict()로 변환하며, BulkLoader는 전송하는 청크 단위로만 변환합니다.
+- ProductBatch는 레코드 목록 + 컬럼 배열(array.array) 뷰를 제공하고, clean()이 validate_and_clean()과 같은 규칙을
+  레코드에 바로 적용합니다. (DataFrame 복사 없이 통과한 레코드 객체를 그대로 재사용)
+"""
+import logging
+import math
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# crawled_loan_products 컬럼 순서 (parse_product_row 결과와 동일)
+PRODUCT_FIELDS = (
+    'bank_name', 'product_name', 'product_type', 'base_rate', 'additional_rate', 'max_limit',
+    'early_repay_fee_rate', 'fee_waiver_months', 'salary_transfer_discount'
+)
+# 숫자 컬럼 -> array.array 타입 코드 (column() 뷰)
+NUMERIC_TYPECODES = {
+    'base_rate': 'd', 'additional_rate': 'd', 'max_limit': 'q', 'early_repay_fee_rate': 'd',
+    'fee_waiver_months': 'q', 'salary_transfer_discount': 'd',
+}
+_FIELD_SET = frozenset(PRODUCT_FIELDS)
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _to_float(value, default: float) -> float:
+    """pd.to_numeric(errors='coerce').fillna(default)와 같은 변환"""
+    if isinstance(value, float):
+        return default if math.isnan(value) else value
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return default
+    return default if math.isnan(value) else value
+
+
+def _to_int(value, default: int) -> int:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    value = _to_float(value, float('nan'))
+    return default if math.isnan(value) or math.isinf(value) else int(value)
+
+
+class LoanProduct(Mapping):
+    """정제된 대출 상품 하나 (고정 필드, 읽기 전용 Mapping)"""
+
+    __slots__ = PRODUCT_FIELDS
+
+    def __init__(self, bank_name, product_name, product_type='신용대출', base_rate=4.0, additional_rate=0.0,
+                 max_limit=0, early_repay_fee_rate=1.5, fee_waiver_months=36, salary_transfer_discount=0.3):
+        set_field = object.__setattr__
+        set_field(self, 'bank_name', bank_name)
+        set_field(self, 'product_name', product_name)
+        set_field(self, 'product_type', product_type)
+        set_field(self, 'base_rate', base_rate)
+        set_field(self, 'additional_rate', additional_rate)
+        set_field(self, 'max_limit', max_limit)
+        set_field(self, 'early_repay_fee_rate', early_repay_fee_rate)
+        set_field(self, 'fee_waiver_months', fee_waiver_months)
+        set_field(self, 'salary_transfer_discount', salary_transfer_discount)
+
+    @classmethod
+    def from_dict(cls, record: Mapping) -> 'LoanProduct':
+        """dict(기존 백업/DB 로우 등)에서 생성 (PRODUCT_FIELDS 외의 키는 버림)"""
+        if isinstance(record, cls):
+            return record
+        return cls(*(record.get(field) for field in PRODUCT_FIELDS))
+
+    def replace(self, **changes) -> 'LoanProduct':
+        values = [changes.pop(field, getattr(self, field)) for field in PRODUCT_FIELDS]
+        if changes:
+            raise TypeError(f"알 수 없는 필드: {', '.join(changes)}")
+        return LoanProduct(*values)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("LoanProduct는 읽기 전용입니다. replace()를 사용하세요.")
+
+    # Mapping 인터페이스 (record['base_rate'], record.get(...), dict(record))
+    def __getitem__(self, field: str):
+        if field not in _FIELD_SET:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(PRODUCT_FIELDS)
+
+    def __len__(self) -> int:
+        return len(PRODUCT_FIELDS)
+
+    def __contains__(self, field) -> bool:
+        return field in _FIELD_SET
+
+    def values_tuple(self) -> tuple:
+        return tuple(getattr(self, field) for field in PRODUCT_FIELDS)
+
+    def to_dict(self) -> Dict:
+        """JSON/DB 전송용 dict (전송 직전에만 만듦)"""
+        return dict(zip(PRODUCT_FIELDS, self.values_tuple()))
+
+    @property
+    def key(self) -> tuple:
+        """중복 기준 (bank_name, product_name) = crawled_loan_products의 on_conflict 키"""
+        return self.bank_name, self.product_name
+
+    def __reduce__(self):
+        # 프로세스 풀(replay/작업 큐) 전달 시 필드 값만 직렬화
+        return LoanProduct, self.values_tuple()
+
+    def __repr__(self) -> str:
+        return f"LoanProduct({', '.join(f'{field}={getattr(self, field)!r}' for field in PRODUCT_FIELDS)})"
+
+
+ProductLike = Union[LoanProduct, Mapping]
+
+
+def json_row(row: ProductLike) -> Dict:
+    """적재 직전 JSON 직렬화용 dict (dict는 그대로)"""
+    return row.to_dict() if isinstance(row, LoanProduct) else row
+
+
+class ProductBatch:
+    """
+    은행 하나(또는 전체)의 상품 레코드 묶음
+    사용 예:
+        batch = ProductBatch(products).clean()
+        supabase.bulk_upsert_loan_products(batch)
+        rates = batch.column('base_rate')    # array('d')
+    """
+
+    __slots__ = ('records',)
+
+    def __init__(self, records: Optional[Iterable[ProductLike]] = None):
+        self.records: List[LoanProduct] = [LoanProduct.from_dict(record) for record in records or ()]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[LoanProduct]:
+        return iter(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def append(self, record: ProductLike):
+        self.records.append(LoanProduct.from_dict(record))
+
+    def extend(self, records: Iterable[ProductLike]):
+        self.records.extend(LoanProduct.from_dict(record) for record in records)
+
+    def column(self, field: str) -> Union[array, List]:
+        """컬럼 하나 (숫자 컬럼은 타입이 고정된 array.array, 문자열 컬럼은 list)"""
+        values = [getattr(record, field) for record in self.records]
+        typecode = NUMERIC_TYPECODES.get(field)
+        return array(typecode, values) if typecode else values
+
+    def to_dicts(self) -> List[Dict]:
+        return [record.to_dict() for record in self.records]
+
+    def clean(self) -> 'ProductBatch':
+        """
+        validate_and_clean()과 같은 규칙을 레코드에 바로 적용
+            1. base_rate/additional_rate/max_limit 숫자 변환 (결측 4.0 / 0.0 / 0)
+            2. max_limit > 0 (DB CHECK 제약 조건)
+            3. (bank_name, product_name) 중복 제거 - 마지막 수집분 유지, 위치도 마지막 기준
+            4. bank_name/product_name 결측 제외
+        값이 바뀌지 않은 레코드는 같은 객체를 그대로 씁니다.
+        """
+        logger.info("--- 전처리 및 데이터 품질 검사 시작 ---")
+        initial_count = len(self.records)
+
+        with METRICS.span('clean_step', step='coerce'):
+            coerced = []
+            for record in self.records:
+                base_rate = _to_float(record.base_rate, 4.0)
+                additional_rate = _to_float(record.additional_rate, 0.0)
+                max_limit = _to_int(record.max_limit, 0)
+                if (base_rate is not record.base_rate or additional_rate is not record.additional_rate
+                        or max_limit is not record.max_limit):
+                    record = record.replace(base_rate=base_rate, additional_rate=additional_rate, max_limit=max_limit)
+                coerced.append(record)
+
+        with METRICS.span('clean_step', step='limit_filter'):
+            valid = [record for record in coerced if record.max_limit > 0]
+        limit_filtered = initial_count - len(valid)
+        if limit_filtered > 0:
+            logger.info(f"   ⚠️ [필터링] 한도 정보 미비(0원) 상품 {limit_filtered}건 제외")
+
+        with METRICS.span('clean_step', step='dedup'):
+            last_position = {self._dedup_key(record): i for i, record in enumerate(valid)}
+            unique = [record for i, record in enumerate(valid) if last_position[self._dedup_key(record)] == i]
+            dedup_count = len(valid) - len(unique)
+        if dedup_count > 0:
+            logger.info(f"   ⚠️ [필터링] 중복 수집 상품 {dedup_count}건 제거")
+
+        with METRICS.span('clean_step', step='required'):
+            cleaned = ProductBatch()
+            cleaned.records = [
+                record for record in unique
+                if not _is_missing(record.bank_name) and not _is_missing(record.product_name)
+            ]
+
+        logger.info("📊 전처리 분석 결과:")
+        logger.info(f"   - 원본 수치: {initial_count}건")
+        logger.info(f"   - 유효 수치: {len(cleaned)}건")
+        logger.info(f"   - 탈락 수치: {initial_count - len(cleaned)}건")
+        return cleaned
+
+    @staticmethod
+    def _dedup_key(record: LoanProduct) -> tuple:
+        # drop_duplicates처럼 결측값(None/NaN)끼리는 같은 값으로 취급
+        return tuple(None if _is_missing(value) else value for value in record.key)
@@ -0,0 +1,314 @@
+"""
+원본 아카이브 재처리 (Replay / Backfill)
+- 은행 사이트에 다시 접속하지 않고 보관된 원본(raw_data/)을 LoanDataCleaner로 다시 정제해 적재합니다.
+- 파서 버그 수정 후 과거 데이터를 다시 만들 때 사용합니다.
+- 실행(run)마다 금리 이력 이벤트와 상품 스냅샷을 그 실행 시각으로 다시 만들고,
+  운영 테이블(crawled_loan_products)은 범위에 가장 최근 보관 실행이 있을 때만 적재합니다. (--load-live로 강제)
+
+사용 예:
+    python -m crawling.replay --since 2026-01-01 --until 2026-02-12 --dry-run
+    python -m crawling.replay --since 2026-01-01                 # 1월 이후 이력 재구성 + 운영 테이블 적재
+    python -m crawling.replay crawling/raw_data/20260212_113110 --workers 4
+    python -m crawling.replay --bank KB --dry-run --output cleaned.jsonl
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .archive import RAW_DATA_DIR, INDEX_FILE, RUN_ID_FORMAT, iter_segment, list_runs
+
+logger = logging.getLogger(__name__)
+
+
+def parse_date(value: str, end_of_day: bool = False) -> datetime:
+    """YYYY-MM-DD 또는 YYYYMMDD_HHMMSS 형식 날짜 파싱"""
+    for fmt in (RUN_ID_FORMAT, '%Y-%m-%d', '%Y%m%d'):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if end_of_day and fmt != RUN_ID_FORMAT:
+            parsed += timedelta(days=1) - timedelta(microseconds=1)
+        return parsed
+    raise argparse.ArgumentTypeError(f"날짜 형식 오류: {value} (예: 2026-02-12)")
+
+
+def collect_segments(
+    paths: List[str],
+    banks: Optional[List[str]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+) -> List[Dict]:
+    """
+    재처리 대상 세그먼트 목록 (실행 순서 = 오래된 순)
+    paths가 비어 있으면 raw_data/ 전체, 실행 폴더/세그먼트 파일/기존 JSON 백업 경로를 직접 지정할 수도 있습니다.
+    """
+    segments = []
+    roots = [Path(p) for p in paths] or [RAW_DATA_DIR]
+    for root in roots:
+        if root.is_file():
+            segments.append({'run_id': root.parent.name, 'bank_name': None, 'path': root})
+            continue
+        # 실행 폴더 하나를 직접 지정한 경우
+        runs = list_runs(root.parent) if (root / INDEX_FILE).exists() else list_runs(root)
+        for run in runs:
+            if (root / INDEX_FILE).exists() and run['run_id'] != root.name:
+                continue
+            started_at = run['started_at']
+            if started_at and ((since and started_at < since) or (until and started_at > until)):
+                continue
+            for bank_name, path in run['segments'].items():
+                if banks and run['status'] != 'legacy' and bank_name not in banks:
+                    continue
+                segments.append({'run_id': run['run_id'], 'bank_name': bank_name, 'path': path})
+    return sorted(segments, key=lambda segment: segment['run_id'])
+
+
+def archive_roots(paths: List[str]) -> List[Path]:
+    """지정한 경로가 속한 raw_data 루트 (실행 폴더/세그먼트 파일이면 상위 폴더)"""
+    roots = []
+    for path in [Path(p) for p in paths] or [RAW_DATA_DIR]:
+        if path.is_file():
+            path = path.parent.parent if (path.parent / INDEX_FILE).exists() else path.parent
+        elif (path / INDEX_FILE).exists():
+            path = path.parent
+        if path not in roots:
+            roots.append(path)
+    return roots
+
+
+def latest_run_id(paths: List[str], banks: Optional[List[str]] = None) -> Optional[str]:
+    """보관된 가장 최근 실행 ID (날짜 범위와 무관하게 루트 전체 기준)"""
+    segments = collect_segments([str(root) for root in archive_roots(paths)], banks)
+    return segments[-1]['run_id'] if segments else None
+
+
+def process_segment(path: str, banks: Optional[List[str]] = None) -> Dict:
+    """
+    세그먼트 하나를 읽어 정제 (프로세스 풀에서 실행)
+    - 원본 레코드(rate/limit/fee/waiver)는 배치 전처리로 파싱
+    - 기존 백업처럼 이미 파싱된 레코드(base_rate 등)는 그대로 사용
+    """
+    from .cleansing import LoanDataCleaner
+    from .records import LoanProduct
+
+    started = time.perf_counter()
+    raw_records, parsed_records = [], []
+    for record in iter_segment(Path(path)):
+        if banks and record.get('bank_name') not in banks:
+            continue
+        if 'base_rate' in record:
+            parsed_records.append(LoanProduct.from_dict(record))
+        else:
+            raw_records.append(record)
+
+    parsed_records.extend(LoanDataCleaner.parse_product_records(raw_records))
+    return {
+        'path': str(path),
+        'raw_count': len(raw_records),
+        'preparsed_count': len(parsed_records) - len(raw_records),
+        'products': parsed_records,
+        'elapsed_sec': round(time.perf_counter() - started, 3)
+    }
+
+
+def run_started(run_id: str) -> Optional[datetime]:
+    """실행 ID의 시작 시각 (이력 이벤트/스냅샷 시점) - 실행 ID 형식이 아니면 None"""
+    try:
+        return datetime.strptime(run_id, RUN_ID_FORMAT)
+    except ValueError:
+        return None
+
+
+def replay(
+    paths: List[str],
+    banks: Optional[List[str]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    workers: int = 1,
+    dry_run: bool = False,
+    output: Optional[str] = None,
+    load_live: bool = False,
+    history_root: Optional[Path] = None,
+    snapshot_root: Optional[Path] = None,
+    supabase=None
+) -> Dict:
+    """
+    아카이브 재처리 실행 후 요약 반환
+    - 실행 순서대로 실행별 정제 결과를 금리 이력 이벤트(실행 시각 기준)와 상품 스냅샷으로 다시 만듭니다.
+    - 운영 테이블은 선택한 범위에 가장 최근 보관 실행이 있을 때(또는 load_live)만 적재합니다.
+      (--until이 과거면 이력/스냅샷만 기록)
+    """
+    from .cleansing import LoanDataCleaner
+
+    started = time.perf_counter()
+    segments = collect_segments(paths, banks, since, until)
+    logger.info(f"🔁 재처리 대상 세그먼트 {len(segments)}개")
+    if not segments:
+        return {'segments': 0, 'products': 0, 'cleaned': 0, 'loaded': 0}
+
+    # 1. 세그먼트별 병렬 정제 (결과는 실행 순서대로 모아 최신 실행이 우선하도록 함)
+    jobs = [(str(segment['path']), banks) for segment in segments]
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(process_segment, *zip(*jobs)))
+    else:
+        results = [process_segment(*job) for job in jobs]
+
+    runs: Dict[str, List] = {}
+    for segment, result in zip(segments, results):
+        runs.setdefault(segment['run_id'], []).extend(result['products'])
+        logger.info(
+            f"   - {segment['run_id']} / {segment['bank_name'] or '-'}: "
+            f"원본 {result['raw_count']}건, 기존 파싱 {result['preparsed_count']}건 ({result['elapsed_sec']:.2f}초)"
+        )
+    products = [product for run_products in runs.values() for product in run_products]
+
+    # 2. 검증/중복 제거 (같은 상품은 가장 최근 실행 값 유지)
+    summary = {'segments': len(segments), 'runs': len(runs), 'products': len(products), 'cleaned': 0, 'loaded': 0}
+    if not products:
+        return summary
+    records = LoanDataCleaner.clean_products(products)
+    summary['cleaned'] = len(records)
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record.to_dict(), ensure_ascii=False, default=str) + '\n')
+        logger.info(f"💾 정제 결과 저장: {output}")
+
+    # 3. 실행별 이력/스냅샷 재구성 + 운영 테이블 적재
+    if dry_run:
+        logger.info(f"🧪 드라이런: {len(records)}건 적재 생략")
+        by_bank = Counter(records.column('bank_name'))
+        for bank_name, count in sorted(by_bank.items()):
+            logger.info(f"   - {bank_name}: {count}건")
+    else:
+        latest = latest_run_id(paths, banks)
+        live = load_live or segments[-1]['run_id'] == latest
+        if not live:
+            logger.warning(f"⏸️ 선택한 범위에 가장 최근 보관 실행({latest})이 없어 운영 테이블 적재를 생략합니다. (이력/스냅샷만 기록)")
+        elif segments[-1]['run_id'] != latest:
+            logger.warning(f"⚠️ --load-live: 가장 최근 실행({latest}) 이전 값으로 운영 테이블을 덮어씁니다.")
+        run_records = [
+            (run_id, LoanDataCleaner.clean_products(run_products))
+            for run_id, run_products in runs.items() if run_products
+        ]
+        summary['snapshots'] = write_snapshots(run_records, snapshot_root)
+        summary.update(rebuild_history(run_records, records, banks, live, history_root, supabase))
+
+    summary['elapsed_sec'] = round(time.perf_counter() - started, 3)
+    logger.info(f"🏁 재처리 완료: {summary}")
+    return summary
+
+
+def write_snapshots(runs: List[Tuple[str, List]], root: Optional[Path] = None) -> int:
+    """실행별 정제 결과를 그 실행 시각의 스냅샷 파티션으로 기록 (SNAPSHOT_STORE_ENABLED + pyarrow일 때)"""
+    from .config import CrawlingConfig
+    from .snapshot_store import ProductSnapshotStore
+
+    if not (CrawlingConfig.SNAPSHOT_STORE_ENABLED and ProductSnapshotStore.available()):
+        return 0
+    store = ProductSnapshotStore(root)
+    return sum(len(store.write(records, run_id=run_id, snapshot_at=run_started(run_id))) for run_id, records in runs)
+
+
+def rebuild_history(
+    runs: List[Tuple[str, List]],
+    records,
+    banks: Optional[List[str]] = None,
+    live: bool = False,
+    history_root: Optional[Path] = None,
+    supabase=None
+) -> Dict:
+    """
+    실행별 금리 이력 재구성 (+ live면 운영 테이블 적재)
+    - 첫 실행 직전 상태에서 시작해 실행마다 바뀐 필드를 그 실행 시각의 이벤트로 만들고,
+      저장소의 해당 은행 이벤트(첫 실행 시각 이후)를 교체합니다.
+    - 운영 테이블은 재구성 전 이력 상태(= 운영 테이블 상태)와 비교해 바뀐 상품만 UPSERT하고,
+      적재에 실패한 상품의 이벤트는 기록하지 않습니다. (파이프라인 적재 단계와 같은 규칙)
+    - 과거 범위의 이력은 운영 이력 옆의 별도 저장소(<이력 경로>_replay/<첫 실행>-<마지막 실행>)에 씁니다.
+      (운영 이력을 과거로 되돌리면 다음 수집의 비교 기준이 운영 테이블과 어긋남)
+    """
+    from .config import CrawlingConfig
+    from .rate_history import DEFAULT_HISTORY_DIR, RateHistoryStore, changed_fields, loaded_events, product_key
+
+    result = {'loaded': 0, 'failed': 0, 'history_events': 0}
+    history = None
+    if CrawlingConfig.RATE_HISTORY_ENABLED:
+        root = Path(history_root) if history_root else DEFAULT_HISTORY_DIR
+        if not live:
+            root = root.with_name(f"{root.name}_replay") / f"{runs[0][0]}-{runs[-1][0]}"
+        history = RateHistoryStore(root)
+
+    events = []
+    if history:
+        since = (run_started(runs[0][0]) or datetime.now()).isoformat()
+        state = history.state_before(since)
+        for run_id, run_records in runs:
+            ts = run_started(run_id).isoformat() if run_started(run_id) else since
+            for record in run_records:
+                key = product_key(record['bank_name'], record['product_name'])
+                changes = changed_fields(state.get(key), record)
+                if changes:
+                    events.append({'ts': ts, 'bank_name': record['bank_name'],
+                                   'product_name': record['product_name'], 'changes': changes})
+                    state.setdefault(key, {}).update(changes)
+
+    if live:
+        if supabase is None:
+            from .supabase_client import SupabaseManager, load_project_env
+            load_project_env()
+            supabase = SupabaseManager()
+        changed = [
+            record for record in records
+            if not history or changed_fields(history.state.get(product_key(record['bank_name'], record['product_name'])), record)
+        ]
+        logger.info(f"🔍 변경 상품 {len(changed)}/{len(records)}건 적재")
+        report = supabase.bulk_upsert_loan_products(changed)
+        events = loaded_events(events, report['failed_rows'])
+        result.update(loaded=report['loaded_rows'], failed=report['failed_row_count'])
+
+    if history:
+        history.replace_events(since, events, banks)
+        result['history_events'] = len(events)
+    return result
+
+
+def build_parser() -> argparse.ArgumentParser:
+    return add_arguments(argparse.ArgumentParser(description='보관된 원본 데이터를 다시 정제/적재합니다.'))
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """재처리 옵션 등록 (python -m crawling replay/clean 서브커맨드와 공용)"""
+    parser.add_argument('paths', nargs='*', help='실행 폴더, 세그먼트 파일 또는 raw_data 루트 (기본: crawling/raw_data)')
+    parser.add_argument('--since', type=parse_date, help='시작일 (YYYY-MM-DD)')
+    parser.add_argument('--until', type=lambda v: parse_date(v, end_of_day=True), help='종료일 (YYYY-MM-DD, 해당일 포함)')
+    parser.add_argument('--bank', action='append', dest='banks', help='은행 코드 (여러 번 지정 가능)')
+    parser.add_argument('--workers', type=int, default=1, help='병렬 처리 프로세스 수')
+    parser.add_argument('--dry-run', action='store_true', help='DB에 적재하지 않고 결과만 출력')
+    parser.add_argument('--output', help='정제 결과를 JSON Lines 파일로 저장')
+    parser.add_argument('--load-live', action='store_true',
+                        help='범위에 가장 최근 보관 실행이 없어도 운영 테이블에 적재 (과거 값으로 덮어씀)')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+    replay(args.paths, args.banks, args.since, args.until, args.workers, args.dry_run, args.output, args.load_live)
+
+
+if __name__ == '__main__':
+    main()
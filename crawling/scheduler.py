@@ -0,0 +1,226 @@
+"""
+멀티 은행 동시 크롤링 스케줄러
+- 재사용 가능한 WebDriver 세션 풀 (Chrome 콜드 스타트 최소화)
+- 은행별 적응형 요청 간격 + 서킷 브레이커 (crawling/throttle.py)
+- 은행별 소요 시간 및 성공 여부 메트릭 수집
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+from .browser import ChromeDriverFactory
+from .config import CrawlingConfig
+from .metrics import METRICS
+from .throttle import HostThrottle
+
+logger = logging.getLogger(__name__)
+
+
+class WebDriverPool:
+    """
+    재사용 가능한 WebDriver 세션 풀 (최대 size개까지 지연 생성)
+    - 세션은 브라우저 프로필별로 보관하고, 같은 프로필 세션만 재사용합니다. (factory(profile)로 생성)
+    - 요청한 프로필의 대기 세션이 없고 풀이 가득 차 있으면 다른 프로필의 대기 세션을 종료하고 새로 만듭니다.
+    """
+
+    def __init__(self, size: int, factory: Callable, acquire_timeout: Optional[float] = None):
+        if size < 1:
+            raise ValueError("드라이버 풀 크기는 1 이상이어야 합니다.")
+        self.size = size
+        self.factory = factory
+        self.acquire_timeout = acquire_timeout
+        # 프로필별 대기 세션 (가장 최근에 반납된(워밍된) 세션부터 재사용)
+        self._idle: Dict[Optional[str], List] = {}
+        self._profiles: Dict[int, Optional[str]] = {}
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+    def acquire(self, profile: Optional[str] = None):
+        """세션 대여. 남은 슬롯이 없으면 반납될 때까지 대기"""
+        if self._closed:
+            raise RuntimeError("이미 종료된 드라이버 풀입니다.")
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError(f"{self.acquire_timeout}초 동안 사용 가능한 드라이버가 없습니다.")
+        evicted = None
+        with self._lock:
+            idle = self._idle.get(profile)
+            if idle:
+                return idle.pop()
+            if self._created >= self.size:
+                # 대여 중인 세션 수 < size이므로 다른 프로필의 대기 세션이 반드시 있음
+                evicted = next(sessions for sessions in self._idle.values() if sessions).pop(0)
+                self._profiles.pop(id(evicted), None)
+            else:
+                # 생성 전에 자리를 먼저 예약 (동시에 대기 세션을 못 찾은 스레드들이 size를 넘겨 만들지 않도록)
+                self._created += 1
+        if evicted is not None:
+            # 종료한 세션의 자리를 그대로 새 세션에 넘김 (_created 유지)
+            self._quit(evicted, keep_reserved=True)
+        try:
+            driver = self.factory(profile)
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            self._slots.release()
+            raise
+        with self._lock:
+            self._profiles[id(driver)] = profile
+            created = self._created
+        logger.info(f"🧩 드라이버 풀 세션 생성 ({created}/{self.size}, 프로필 {profile or '기본'})")
+        return driver
+
+    def release(self, driver, discard: bool = False):
+        """세션 반납. discard=True이거나 초기화에 실패하면 세션을 폐기"""
+        try:
+            if not discard and not self._closed:
+                try:
+                    # 다음 은행이 이전 은행의 쿠키/세션을 물려받지 않도록 초기화
+                    driver.delete_all_cookies()
+                    with self._lock:
+                        self._idle.setdefault(self._profiles.get(id(driver)), []).append(driver)
+                    return
+                except Exception as e:
+                    logger.warning(f"드라이버 세션 초기화 실패, 폐기합니다: {e}")
+            self._quit(driver)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """대기 중인 모든 세션 종료"""
+        self._closed = True
+        with self._lock:
+            drivers = [driver for sessions in self._idle.values() for driver in sessions]
+            self._idle.clear()
+        for driver in drivers:
+            self._quit(driver)
+
+    def _quit(self, driver, keep_reserved: bool = False):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"드라이버 종료 중 오류: {e}")
+        # 생성기가 드라이버별 자원(예: user-data-dir)을 관리하면 반납
+        release = getattr(self.factory, 'release', None)
+        if release is not None:
+            release(driver)
+        with self._lock:
+            if not keep_reserved:
+                self._created -= 1
+            self._profiles.pop(id(driver), None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CrawlScheduler:
+    """
+    은행 크롤러 동시 실행 스케줄러
+    - 전체 소요 시간이 '모든 은행의 합'이 아니라 '가장 느린 은행' 수준이 되도록 합니다.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        pool_size: Optional[int] = None,
+        config: CrawlingConfig = None,
+        driver_factory: Optional[Callable] = None
+    ):
+        self.config = config or CrawlingConfig()
+        self.max_workers = max_workers or self.config.MAX_CONCURRENT_BANKS
+        self.pool_size = pool_size or self.config.DRIVER_POOL_SIZE
+        self.driver_factory = driver_factory
+        self._throttles: Dict[str, HostThrottle] = {}
+        self.metrics: List[Dict] = []
+
+    def throttle_for(self, bank_name: str) -> HostThrottle:
+        """은행별 요청 제어 (시작 간격은 BANK_CRAWL_DELAY > CRAWL_DELAY 순으로 적용)"""
+        if bank_name not in self._throttles:
+            delay = self.config.BANK_CRAWL_DELAY.get(bank_name, self.config.CRAWL_DELAY)
+            self._throttles[bank_name] = HostThrottle(bank_name, delay, self.config)
+        return self._throttles[bank_name]
+
+    def iter_results(self, crawlers: List) -> Iterator[Dict]:
+        """크롤러를 동시에 실행하고, 끝나는 순서대로 결과를 반환"""
+        if not crawlers:
+            return
+        self.metrics = []
+        factory = self.driver_factory or ChromeDriverFactory(self.config)
+        pool = WebDriverPool(self.pool_size, factory, self.config.DRIVER_ACQUIRE_TIMEOUT)
+        workers = min(self.max_workers, len(crawlers))
+        logger.info(f"🗓️ 스케줄러 시작: 은행 {len(crawlers)}곳, 동시 실행 {workers}, 드라이버 풀 {self.pool_size}")
+
+        with pool, ThreadPoolExecutor(max_workers=workers, thread_name_prefix='crawl') as executor:
+            futures = {}
+            for crawler in crawlers:
+                crawler.driver_pool = pool
+                crawler.politeness = self.throttle_for(crawler.bank_name)
+                futures[executor.submit(self._run_one, crawler)] = crawler
+            for future in as_completed(futures):
+                result = future.result()
+                self.metrics.append(result['metrics'])
+                yield result
+
+    def run(self, crawlers: List) -> List[Dict]:
+        """모든 크롤러 실행 후 입력 순서대로 결과 반환"""
+        started = time.perf_counter()
+        results = {id(r['crawler']): r for r in self.iter_results(crawlers)}
+        ordered = [results[id(c)] for c in crawlers]
+        self.log_summary(time.perf_counter() - started)
+        return ordered
+
+    def _run_one(self, crawler) -> Dict:
+        started_at = datetime.now()
+        started = time.perf_counter()
+        products = []
+        try:
+            products = crawler.safe_crawl()
+            error = crawler.last_error
+        except Exception as e:
+            error = str(e)
+            logger.error(f"❌ {crawler.bank_name} 치명적 오류: {e}")
+        elapsed = time.perf_counter() - started
+
+        unchanged = getattr(crawler, 'unchanged_count', 0)
+        if error:
+            status = 'failed'
+        elif products:
+            status = 'success'
+        elif unchanged:
+            status = 'unchanged'
+        else:
+            status = 'empty'
+        METRICS.observe('crawl_bank', elapsed, bank=crawler.bank_name, status=status)
+        METRICS.incr('products_crawled', len(products), bank=crawler.bank_name)
+
+        return {
+            'crawler': crawler,
+            'bank_name': crawler.bank_name,
+            'products': products,
+            'metrics': {
+                'bank_name': crawler.bank_name,
+                'status': status,
+                'product_count': len(products),
+                'unchanged_count': unchanged,
+                'started_at': started_at.isoformat(),
+                'elapsed_sec': round(elapsed, 3),
+                'error': error
+            }
+        }
+
+    def log_summary(self, wall_clock: float):
+        """은행별 소요 시간/성공 여부 요약 출력"""
+        total = sum(m['elapsed_sec'] for m in self.metrics)
+        logger.info("📈 은행별 크롤링 메트릭")
+        for m in sorted(self.metrics, key=lambda m: m['elapsed_sec'], reverse=True):
+            logger.info(
+                f"   - {m['bank_name']}: {m['status']} / {m['product_count']}건 / {m['elapsed_sec']:.1f}초"
+            )
+        logger.info(f"   - 전체 소요 {wall_clock:.1f}초 (순차 실행 시 약 {total:.1f}초)")
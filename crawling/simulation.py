@@ -0,0 +1,528 @@
+"""
+대환대출 배치 시뮬레이터 (NumPy)
+- src/lib/services/simulation-service.ts의 simulateRefinancing / findBestRefinancingOption과 같은 계산을
+  (부채 × 상품) 배열 연산 한 번으로 수행합니다. (야간 simulation_results 사전 계산용)
+- 원리금균등/원금균등, 중도상환 수수료, 인지세, 손익분기점(BEP), 추천 액션
+- Big.js 설정(DP = 4, ROUND_HALF_UP)과 같은 위치에서 나눗셈 결과를 소수 4자리로 반올림해 TS 엔진과 결과를 맞춥니다.
+  (월 이자율도 연 이자율 / 100 / 12를 각각 4자리로 반올림한 값)
+- 월별 루프(원금균등 총이자 등)는 같은 합을 닫힌 식으로 계산하므로 개월 축 배열을 만들지 않습니다.
+- TS 엔진 결과 픽스처(fixtures/simulation_parity.json, 생성: npx tsx src/tests/simulation-parity.ts)와
+  tests/test_simulation_parity.py에서 비교합니다.
+
+사용 예:
+    python -m crawling.simulation --debts debts.jsonl --dry-run --output results.jsonl
+    python -m crawling.simulation --check 200
+"""
+import argparse
+import json
+import logging
+import math
+import random
+import re
+import sys
+import time
+from decimal import Decimal, ROUND_HALF_UP, localcontext
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from .config import CrawlingConfig
+
+logger = logging.getLogger(__name__)
+
+REPAYMENT_TYPES = ('원리금균등', '원금균등')
+
+# Big.js 전역 설정 (src/lib/config/finance-config.ts)
+BIG_DP = 4
+
+# 인지세 구간 (대출 금액 이하 → 인지세), 마지막 구간 초과 시 STAMP_DUTY_MAX
+STAMP_DUTY_BRACKETS = [(50_000_000, 0), (100_000_000, 70_000), (1_000_000_000, 150_000)]
+STAMP_DUTY_MAX = 350_000
+
+# safeNum 기본값 (simulation-service.ts)
+DEBT_DEFAULTS = {
+    'principal': 50_000_000,
+    'interest_rate': 5.5,
+    'remaining_months': 36,
+    'total_months': 60,
+    'early_repay_fee_rate': 1.5,
+    'fee_waiver_months': 36,
+}
+PRODUCT_DEFAULTS = {
+    'base_rate': 3.5,
+    'additional_rate': 1.5,
+    'salary_transfer_discount': 0.3,
+    'user_other_discount': 0,
+}
+
+# 수수료 면제까지 이 개월 수 이하로 남았으면 '수수료_면제_대기' 추천
+WAIT_FOR_WAIVER_MONTHS = 3
+
+# JS Number()가 받아들이는 10진 문자열 (앞뒤 공백은 먼저 제거)
+_JS_DECIMAL = re.compile(r'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?')
+_JS_RADIX_PREFIXES = ('0x', '0o', '0b')
+
+
+# ----------------------------------------------------------------------
+# 입력 변환
+# ----------------------------------------------------------------------
+def js_number(value) -> float:
+    """JS Number(value) (불리언 → 0/1, 빈 문자열 → 0, 해석할 수 없으면 NaN)"""
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return 0.0
+        if text.lower().startswith(_JS_RADIX_PREFIXES) and '_' not in text:
+            try:
+                return float(int(text, 0))
+            except ValueError:
+                return math.nan
+        if text.lstrip('+-') == 'Infinity':
+            return -math.inf if text.startswith('-') else math.inf
+        return float(text) if _JS_DECIMAL.fullmatch(text) else math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def safe_column(rows: List[Dict], key: str, default: float) -> np.ndarray:
+    """safeNum과 같은 규칙으로 컬럼 배열 생성 (None/NaN/무한대/숫자 아님 → 기본값, 그 외는 JS Number() 변환)"""
+    values = np.full(len(rows), float(default))
+    for i, row in enumerate(rows):
+        value = row.get(key)
+        if value is None:
+            continue
+        value = js_number(value)
+        if math.isfinite(value):
+            values[i] = value
+    return values
+
+
+def debt_arrays(debts: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    user_debts 형태의 로우 목록 → 컬럼 배열
+    user_debts에 없는 total_months / early_repay_fee_rate / fee_waiver_months는 있으면 사용하고 없으면 TS 기본값 사용
+    """
+    arrays = {key: safe_column(debts, key, default) for key, default in DEBT_DEFAULTS.items()}
+    arrays['equal_principal'] = np.array([row.get('repayment_type') == '원금균등' for row in debts], dtype=bool)
+    # 잔여 기간/원금이 0 이하이거나 상환 방식이 잘못된 부채는 TS에서 예외 → 결과 없음
+    arrays['valid'] = (
+        (arrays['remaining_months'] > 0)
+        & (arrays['principal'] > 0)
+        & np.array([row.get('repayment_type') in REPAYMENT_TYPES for row in debts], dtype=bool)
+    )
+    return arrays
+
+
+def product_arrays(products: List[Dict]) -> Dict[str, np.ndarray]:
+    """crawled_loan_products 로우 목록 → 컬럼 배열"""
+    return {key: safe_column(products, key, default) for key, default in PRODUCT_DEFAULTS.items()}
+
+
+# ----------------------------------------------------------------------
+# 계산 (Big.js DP=4 반올림 재현)
+# ----------------------------------------------------------------------
+def round_half_up(values, dp: int = BIG_DP) -> np.ndarray:
+    """Big.roundHalfUp과 같은 반올림 (0에서 먼 쪽, 이진 부동소수점 오차로 .5가 .4999...가 되는 경우 보정)"""
+    values = np.asarray(values, dtype=float)
+    scaled = np.abs(values) * 10 ** dp
+    return np.sign(values) * np.floor(scaled + 0.5 + scaled * 1e-12 + 1e-9) / 10 ** dp
+
+
+def monthly_rate(annual_rate) -> np.ndarray:
+    """annualRate.div(100).div(12)"""
+    return round_half_up(round_half_up(np.asarray(annual_rate, dtype=float) / 100) / 12)
+
+
+def stamp_duty(principal) -> np.ndarray:
+    """FinanceConfig.calculateStampDuty"""
+    principal = np.asarray(principal, dtype=float)
+    duty = np.full(principal.shape, float(STAMP_DUTY_MAX))
+    for limit, amount in reversed(STAMP_DUTY_BRACKETS):
+        duty = np.where(principal <= limit, float(amount), duty)
+    return duty
+
+
+def monthly_payment(principal, annual_rate, months, equal_principal) -> np.ndarray:
+    """calculateMonthlyPayment (원금균등은 첫 달 상환액)"""
+    r = monthly_rate(annual_rate)
+    principal, months = np.asarray(principal, dtype=float), np.asarray(months, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        growth = np.power(1 + r, months)
+        annuity = round_half_up(principal * r * growth / (growth - 1))
+        level = round_half_up(principal / months)
+    annuity = np.where(r == 0, level, annuity)
+    return np.where(equal_principal, level + principal * r, annuity)
+
+
+def total_interest(principal, annual_rate, months, equal_principal) -> np.ndarray:
+    """
+    calculateTotalInterest
+    - 원리금균등: 월 상환액 × n - 원금
+    - 원금균등: Σ(잔여원금 × r) = r × (n × P - 월원금 × n(n-1)/2)  (TS 월별 루프와 같은 합)
+    """
+    r = monthly_rate(annual_rate)
+    principal, months = np.asarray(principal, dtype=float), np.asarray(months, dtype=float)
+    payment = monthly_payment(principal, annual_rate, months, False)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        level = round_half_up(principal / months)
+    by_level = r * (months * principal - level * months * (months - 1) / 2)
+    return np.where(equal_principal, by_level, payment * months - principal)
+
+
+def early_repay_fee(principal, fee_rate, remaining_months, total_months, fee_waiver_months) -> np.ndarray:
+    """calculateEarlyRepayFee (면제 기간 경과 시 0, 잔여 기간 비례 감면)"""
+    elapsed = np.asarray(total_months, dtype=float) - remaining_months
+    base_fee = round_half_up(np.asarray(principal, dtype=float) * fee_rate / 100)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        time_ratio = round_half_up(np.asarray(remaining_months, dtype=float) / total_months)
+    return np.where(elapsed >= fee_waiver_months, 0.0, base_fee * time_ratio)
+
+
+def new_rates(products: Dict[str, np.ndarray], salary_transfer) -> np.ndarray:
+    """
+    (부채 × 상품) 신규 금리 = 기본 + 가산 - 급여이체 우대(해당 시) - 기타 우대, 0 미만은 0
+    salary_transfer: 부채별 bool 배열
+    """
+    rate = products['base_rate'] + products['additional_rate'] - products['user_other_discount']
+    rate = rate[None, :] - np.where(np.asarray(salary_transfer)[:, None], products['salary_transfer_discount'][None, :], 0.0)
+    # 소수 연산 결과(3.5 + 1.2 등)의 이진 오차 제거 (Big은 덧셈/뺄셈이 정확)
+    return np.maximum(np.round(rate, 10), 0.0)
+
+
+def simulate_batch(
+    debts: List[Dict],
+    products: List[Dict],
+    has_salary_transfer: Union[bool, List[bool]] = True
+) -> Dict[str, np.ndarray]:
+    """
+    모든 (부채, 상품) 쌍의 simulateRefinancing 결과를 (부채 수 × 상품 수) 배열로 반환
+    유효하지 않은 부채(잔여 기간/원금 0 이하 등)의 행은 NaN, recommended_action은 ''
+    """
+    d = debt_arrays(debts)
+    p = product_arrays(products)
+    salary_transfer = np.broadcast_to(np.asarray(has_salary_transfer, dtype=bool), (len(debts),))
+    # 유효하지 않은 부채의 0 나눗셈 등은 마지막에 NaN으로 덮으므로 경고 생략
+    with np.errstate(all='ignore'):
+        return _simulate_arrays(d, p, salary_transfer, (len(debts), len(products)))
+
+
+def _simulate_arrays(d: Dict[str, np.ndarray], p: Dict[str, np.ndarray], salary_transfer: np.ndarray,
+                     shape: tuple) -> Dict[str, np.ndarray]:
+    # 부채 축 (n_debts, 1) / 상품 축 (1, n_products)로 브로드캐스트
+    principal = d['principal'][:, None]
+    remaining = d['remaining_months'][:, None]
+    equal_principal = d['equal_principal'][:, None]
+    current_rate = d['interest_rate'][:, None]
+    new_rate = new_rates(p, salary_transfer)
+
+    # 현재 대출 (부채별로 한 번만 계산)
+    current_interest = total_interest(principal, current_rate, remaining, equal_principal)
+    current_payment = monthly_payment(principal, current_rate, remaining, equal_principal)
+    fee = early_repay_fee(
+        principal, d['early_repay_fee_rate'][:, None], remaining,
+        d['total_months'][:, None], d['fee_waiver_months'][:, None]
+    )
+    duty = stamp_duty(principal)
+    refinance_cost = fee + duty
+
+    # 신규 대출 (부채 × 상품)
+    new_interest = total_interest(principal, new_rate, remaining, equal_principal)
+    new_payment = monthly_payment(principal, new_rate, remaining, equal_principal)
+    interest_savings = current_interest - new_interest
+    net_savings = interest_savings - refinance_cost
+    monthly_savings = current_payment - new_payment
+
+    # 손익분기점: ceil(총 대환 비용 / 월 절감액), 월 절감액이 없으면 -1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bep = np.ceil(round_half_up(refinance_cost / monthly_savings))
+    break_even = np.where(monthly_savings > 0, bep, -1.0)
+
+    # 추천 액션
+    months_until_waiver = d['fee_waiver_months'][:, None] - (d['total_months'][:, None] - remaining)
+    refinance_now = (net_savings > 0) & (break_even > 0) & (break_even <= remaining)
+    wait_for_waiver = (fee > 0) & (months_until_waiver > 0) & (months_until_waiver <= WAIT_FOR_WAIVER_MONTHS)
+    action = np.where(refinance_now, '즉시_대환', np.where(wait_for_waiver, '수수료_면제_대기', '현재_유지'))
+
+    result = {
+        'total_debt_before': principal + current_interest,
+        'monthly_payment_before': current_payment,
+        'total_debt_after': principal + new_interest + refinance_cost,
+        'monthly_payment_after': new_payment,
+        'early_repay_fee': fee,
+        'stamp_duty': duty,
+        'total_refinance_cost': refinance_cost,
+        'interest_savings': interest_savings,
+        'net_savings': net_savings,
+        'monthly_savings': monthly_savings,
+        'break_even_months': break_even,
+        'current_rate': current_rate,
+        'new_rate': new_rate,
+    }
+    invalid = ~d['valid'][:, None]
+    for key, values in result.items():
+        result[key] = np.where(invalid, np.nan, np.broadcast_to(values, shape).astype(float))
+    result['recommended_action'] = np.where(invalid, '', np.broadcast_to(action, shape))
+    return result
+
+
+def best_product_indices(result: Dict[str, np.ndarray]) -> np.ndarray:
+    """findBestRefinancingOption: 부채별 순이익이 가장 큰 상품 인덱스 (동률이면 앞 상품, 없으면 -1)"""
+    net = np.where(np.isfinite(result['net_savings']), result['net_savings'], -np.inf)
+    if net.shape[1] == 0:
+        return np.full(net.shape[0], -1)
+    best = np.argmax(net, axis=1)
+    return np.where(np.isfinite(net[np.arange(len(net)), best]), best, -1)
+
+
+# ----------------------------------------------------------------------
+# simulation_results 사전 계산
+# ----------------------------------------------------------------------
+def _to_won(value: float) -> int:
+    return int(Decimal(repr(float(value))).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def recommend(
+    debts: List[Dict],
+    products: List[Dict],
+    has_salary_transfer: Union[bool, List[bool]] = True,
+    top_n: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> List[Dict]:
+    """
+    부채별 최적 상품 시뮬레이션 결과를 simulation_results 로우 형태로 반환 (결과 없는 부채는 제외)
+    메모리 사용량을 (chunk_size × 상품 수)로 제한하기 위해 부채를 나누어 계산합니다.
+    """
+    top_n = top_n or CrawlingConfig.SIMULATION_TOP_N
+    chunk_size = chunk_size or CrawlingConfig.SIMULATION_CHUNK_SIZE
+    salary_transfer = np.broadcast_to(np.asarray(has_salary_transfer, dtype=bool), (len(debts),))
+    rows = []
+    for start in range(0, len(debts), chunk_size):
+        chunk = debts[start:start + chunk_size]
+        result = simulate_batch(chunk, products, salary_transfer[start:start + chunk_size])
+        net = np.where(np.isfinite(result['net_savings']), result['net_savings'], -np.inf)
+        # 순이익 내림차순 (동률이면 앞 상품 우선 = findBestRefinancingOption과 같은 최적 상품)
+        ranking = np.argsort(-net, axis=1, kind='stable')[:, :top_n]
+        for i, debt in enumerate(chunk):
+            best = ranking[i, 0] if len(products) else -1
+            if best < 0 or not np.isfinite(net[i, best]):
+                continue
+            break_even = int(result['break_even_months'][i, best])
+            rows.append({
+                'session_id': debt.get('session_id'),
+                'total_debt_before': _to_won(result['total_debt_before'][i, best]),
+                'total_debt_after': _to_won(result['total_debt_after'][i, best]),
+                'total_savings': _to_won(result['net_savings'][i, best]),
+                # 스키마 CHECK (break_even_months >= 0): 손익분기점이 없으면(-1) NULL
+                'break_even_months': break_even if break_even >= 0 else None,
+                'recommended_action': str(result['recommended_action'][i, best]),
+                'recommended_products': [{
+                    'bank': products[j].get('bank_name'),
+                    'product': products[j].get('product_name'),
+                    'rate': float(result['new_rate'][i, j])
+                } for j in ranking[i] if np.isfinite(net[i, j])]
+            })
+    return rows
+
+
+# ----------------------------------------------------------------------
+# 스칼라 기준 구현 (TS 코드를 Decimal로 한 줄씩 옮긴 것, 배치 결과 검증용)
+# ----------------------------------------------------------------------
+def _big_div(a: Decimal, b: Decimal) -> Decimal:
+    return (a / b).quantize(Decimal(1).scaleb(-BIG_DP), rounding=ROUND_HALF_UP)
+
+
+def _decimal(value, default) -> Decimal:
+    value = safe_column([{'v': value}], 'v', default)[0]
+    return Decimal(repr(float(value)))
+
+
+def simulate_pair(debt: Dict, product: Dict, has_salary_transfer: bool = True) -> Optional[Dict]:
+    """simulateRefinancing 스칼라 버전 (Big.js와 같은 정확한 10진 연산, 유효하지 않은 입력은 None)"""
+    with localcontext() as ctx:
+        ctx.prec = 20000
+        principal = _decimal(debt.get('principal'), DEBT_DEFAULTS['principal'])
+        current_rate = _decimal(debt.get('interest_rate'), DEBT_DEFAULTS['interest_rate'])
+        remaining = int(_decimal(debt.get('remaining_months'), DEBT_DEFAULTS['remaining_months']))
+        total = int(_decimal(debt.get('total_months'), DEBT_DEFAULTS['total_months']))
+        fee_rate = _decimal(debt.get('early_repay_fee_rate'), DEBT_DEFAULTS['early_repay_fee_rate'])
+        waiver = int(_decimal(debt.get('fee_waiver_months'), DEBT_DEFAULTS['fee_waiver_months']))
+        equal_principal = debt.get('repayment_type') == '원금균등'
+        if remaining <= 0 or principal <= 0 or debt.get('repayment_type') not in REPAYMENT_TYPES:
+            return None
+
+        new_rate = (_decimal(product.get('base_rate'), PRODUCT_DEFAULTS['base_rate'])
+                    + _decimal(product.get('additional_rate'), PRODUCT_DEFAULTS['additional_rate']))
+        if has_salary_transfer:
+            new_rate -= _decimal(product.get('salary_transfer_discount'), PRODUCT_DEFAULTS['salary_transfer_discount'])
+        new_rate -= _decimal(product.get('user_other_discount'), PRODUCT_DEFAULTS['user_other_discount'])
+        new_rate = max(new_rate, Decimal(0))
+
+        def payment(rate: Decimal) -> Decimal:
+            r = _big_div(_big_div(rate, Decimal(100)), Decimal(12))
+            if equal_principal:
+                return _big_div(principal, Decimal(remaining)) + principal * r
+            if r == 0:
+                return _big_div(principal, Decimal(remaining))
+            growth = (r + 1) ** remaining
+            return _big_div(principal * r * growth, growth - 1)
+
+        def interest(rate: Decimal) -> Decimal:
+            r = _big_div(_big_div(rate, Decimal(100)), Decimal(12))
+            if not equal_principal:
+                return payment(rate) * remaining - principal
+            level = _big_div(principal, Decimal(remaining))
+            result, balance = Decimal(0), principal
+            for _ in range(remaining):
+                result += balance * r
+                balance -= level
+            return result
+
+        fee = Decimal(0)
+        if total - remaining < waiver:
+            fee = _big_div(principal * fee_rate, Decimal(100)) * _big_div(Decimal(remaining), Decimal(total))
+        duty = Decimal(int(stamp_duty(float(principal))))
+        cost = fee + duty
+        current_interest, new_interest = interest(current_rate), interest(new_rate)
+        net_savings = current_interest - new_interest - cost
+        monthly_savings = payment(current_rate) - payment(new_rate)
+        break_even = math.ceil(_big_div(cost, monthly_savings)) if monthly_savings > 0 else -1
+
+        months_until_waiver = waiver - (total - remaining)
+        if net_savings > 0 and 0 < break_even <= remaining:
+            action = '즉시_대환'
+        elif fee > 0 and 0 < months_until_waiver <= WAIT_FOR_WAIVER_MONTHS:
+            action = '수수료_면제_대기'
+        else:
+            action = '현재_유지'
+
+        return {
+            'total_debt_before': float(principal + current_interest),
+            'monthly_payment_before': float(payment(current_rate)),
+            'total_debt_after': float(principal + new_interest + cost),
+            'monthly_payment_after': float(payment(new_rate)),
+            'early_repay_fee': float(fee),
+            'stamp_duty': float(duty),
+            'total_refinance_cost': float(cost),
+            'interest_savings': float(current_interest - new_interest),
+            'net_savings': float(net_savings),
+            'monthly_savings': float(monthly_savings),
+            'break_even_months': float(break_even),
+            'current_rate': float(current_rate),
+            'new_rate': float(new_rate),
+            'recommended_action': action
+        }
+
+
+def check_against_reference(debts: List[Dict], products: List[Dict], samples: int = 100,
+                            tolerance: float = 1.0, seed: int = 0) -> List[Dict]:
+    """무작위 (부채, 상품) 쌍을 스칼라 기준 구현과 비교해 tolerance(원)를 넘는 차이 목록 반환"""
+    result = simulate_batch(debts, products)
+    rng = random.Random(seed)
+    mismatches = []
+    for _ in range(samples):
+        i, j = rng.randrange(len(debts)), rng.randrange(len(products))
+        expected = simulate_pair(debts[i], products[j])
+        if expected is None:
+            if not np.isnan(result['net_savings'][i, j]):
+                mismatches.append({'debt': i, 'product': j, 'field': 'valid'})
+            continue
+        for field, value in expected.items():
+            actual = result[field][i, j]
+            if field == 'recommended_action' or field == 'break_even_months':
+                if actual != value:
+                    mismatches.append({'debt': i, 'product': j, 'field': field, 'expected': value, 'actual': actual})
+            elif abs(actual - value) > tolerance:
+                mismatches.append({'debt': i, 'product': j, 'field': field, 'expected': value, 'actual': float(actual)})
+    return mismatches
+
+
+def sample_debts(count: int, seed: int = 0) -> List[Dict]:
+    """user_debts 형태의 무작위 부채 (성능/정합성 점검용)"""
+    rng = random.Random(seed)
+    debts = []
+    for i in range(count):
+        total = rng.choice([12, 24, 36, 60, 120, 240, 360])
+        debts.append({
+            'session_id': f'sample-{i}',
+            'principal': rng.randrange(1_000_000, 500_000_000, 10_000),
+            'interest_rate': round(rng.uniform(2.0, 15.0), 2),
+            'remaining_months': rng.randint(1, total),
+            'total_months': total,
+            'repayment_type': rng.choice(REPAYMENT_TYPES),
+            'early_repay_fee_rate': rng.choice([0.5, 1.0, 1.2, 1.5]),
+            'fee_waiver_months': rng.choice([12, 24, 36]),
+        })
+    return debts
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+def _read_jsonl(path: str) -> List[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='모든 부채 × 수집 상품 대환 시뮬레이션 (simulation_results 사전 계산)')
+    parser.add_argument('--debts', help='user_debts 형태 JSON Lines 파일 (기본: DB의 user_debts)')
+    parser.add_argument('--products', help='상품 JSON Lines 파일 (기본: DB의 crawled_loan_products)')
+    parser.add_argument('--no-salary-transfer', action='store_true', help='급여이체 우대 금리 미적용')
+    parser.add_argument('--top-n', type=int, help='부채별 추천 상품 수')
+    parser.add_argument('--dry-run', action='store_true', help='simulation_results에 저장하지 않음')
+    parser.add_argument('--output', help='결과를 JSON Lines 파일로 저장')
+    parser.add_argument('--check', type=int, metavar='N', help='무작위 N쌍을 스칼라 기준 구현과 비교 (샘플 부채 사용)')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+
+    supabase = None
+    needs_db = not args.products or (not args.check and (not args.debts or not args.dry_run))
+    if needs_db:
+        from .supabase_client import SupabaseManager, load_project_env
+        load_project_env()
+        supabase = SupabaseManager()
+
+    products = _read_jsonl(args.products) if args.products else supabase.get_latest_products()
+    if not products:
+        logger.error("❌ 시뮬레이션할 상품이 없습니다.")
+        return 1
+
+    if args.check:
+        mismatches = check_against_reference(sample_debts(max(args.check, 100)), products, samples=args.check)
+        for mismatch in mismatches[:20]:
+            logger.error(f"   - {mismatch}")
+        logger.info(f"{'❌' if mismatches else '✅'} 기준 구현 비교 {args.check}쌍: 불일치 {len(mismatches)}건")
+        return 1 if mismatches else 0
+
+    debts = _read_jsonl(args.debts) if args.debts else supabase.get_user_debts()
+    started = time.perf_counter()
+    rows = recommend(debts, products, not args.no_salary_transfer, args.top_n)
+    elapsed = time.perf_counter() - started
+    logger.info(f"🧮 부채 {len(debts)}건 × 상품 {len(products)}개 시뮬레이션 완료: 결과 {len(rows)}건 ({elapsed:.2f}초)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + '\n')
+        logger.info(f"💾 결과 저장: {args.output}")
+
+    if args.dry_run:
+        return 0
+    report = supabase.insert_simulation_results(rows)
+    return 0 if report['success'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
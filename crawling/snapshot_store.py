@@ -0,0 +1,236 @@
+"""
+정제 상품 컬럼형 스냅샷 저장소 (Parquet / Arrow)
+- 실행마다 validate_and_clean() 결과를 날짜/은행별로 파티션된 Parquet 파일로 남깁니다.
+    <root>/snapshot_date=2026-02-12/bank_name=KB/part-<run_id>.parquet
+  실행 하나는 파티션마다 파일 하나만 새로 쓰고 기존 파일은 읽거나 다시 쓰지 않습니다. (쓰기 비용이 쌓인 데이터 양과 무관,
+  쓰기가 실패해도 다른 실행의 파일은 그대로). 파일 안의 행은 product_type / base_rate순으로 정렬됩니다.
+- 컬럼은 고정 스키마(SNAPSHOT_FIELDS)로 타입이 정해져 있어, 분석 시 DB를 다시 조회하지 않고 로컬에서 바로 읽습니다.
+- 리더는 메모리 매핑(LocalFileSystem(use_mmap=True))으로 파일을 열고, 조건을 Arrow 필터로 내려보냅니다.
+    bank_name / snapshot_date : 파티션 디렉터리 단위로 걸러 해당 파일은 열지도 않음
+    product_type / base_rate  : row group 통계(min/max)로 건너뛰고 남은 행만 읽음
+- 같은 run_id로 다시 쓰면 그 실행의 파일을 교체합니다. (재처리해도 중복되지 않음)
+- pyarrow는 선택 의존성입니다. 설치되어 있지 않으면 저장을 건너뛰고 경고만 남깁니다.
+- 크롤링 실행은 SNAPSHOT_STORE_ENABLED=True일 때만 스냅샷을 남깁니다. 스냅샷에는 전체 상품이 필요하므로
+  그 실행은 지문 기반 건너뛰기 없이 모든 상품을 수집합니다. (기본은 꺼져 있어 변경 감지 이득을 유지)
+
+사용 예:
+    store = ProductSnapshotStore()
+    table = store.scan(bank_name='KB', product_type='신용대출', max_rate=4.5, since='2026-01-01')
+    python -m crawling.snapshot_store --bank KB --since 2026-01-01 --max-rate 4.5
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+from urllib.parse import quote
+
+from .config import CrawlingConfig
+from .metrics import METRICS
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_DIR = Path(__file__).resolve().parent / 'state' / 'product_snapshots'
+PART_FILE_FORMAT = 'part-{run_id}.parquet'
+
+# 파일에 저장되는 컬럼과 타입 (snapshot_date, bank_name은 파티션 디렉터리에 저장)
+SNAPSHOT_FIELDS = (
+    ('product_name', 'string'),
+    ('product_type', 'string'),
+    ('base_rate', 'float64'),
+    ('additional_rate', 'float64'),
+    ('max_limit', 'int64'),
+    ('early_repay_fee_rate', 'float64'),
+    ('fee_waiver_months', 'int32'),
+    ('salary_transfer_discount', 'float64'),
+    ('run_id', 'string'),
+    ('snapshot_at', 'timestamp[s]'),
+)
+PARTITION_FIELDS = (('snapshot_date', 'date32'), ('bank_name', 'string'))
+
+
+def _pyarrow():
+    """pyarrow는 선택 의존성 (없으면 None)"""
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.dataset
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        return None
+
+
+def _schema(pa, fields) -> 'pa.Schema':
+    types = {
+        'string': pa.string(), 'float64': pa.float64(), 'int64': pa.int64(), 'int32': pa.int32(),
+        'date32': pa.date32(), 'timestamp[s]': pa.timestamp('s'),
+    }
+    return pa.schema([(name, types[type_name]) for name, type_name in fields])
+
+
+def _as_date(value) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+class ProductSnapshotStore:
+    """날짜/은행 파티션 Parquet 저장소 (쓰기는 스레드 안전)"""
+
+    def __init__(self, root: Optional[Path] = None, run_id: Optional[str] = None,
+                 compression: Optional[str] = None):
+        self.root = Path(root or CrawlingConfig.SNAPSHOT_STORE_DIR or DEFAULT_SNAPSHOT_DIR)
+        self.run_id = run_id
+        self.compression = compression or CrawlingConfig.SNAPSHOT_COMPRESSION
+        self._lock = threading.Lock()
+        self._dataset = None
+
+    @staticmethod
+    def available() -> bool:
+        return _pyarrow() is not None
+
+    def write(self, records: List[Dict], run_id: Optional[str] = None,
+              snapshot_at: Optional[datetime] = None) -> List[Path]:
+        """
+        정제된 레코드를 실행 일자/은행 파티션에 실행별 파일로 기록 (같은 run_id의 파일은 교체)
+        반환: 기록한 파일 경로 목록
+        """
+        pa = _pyarrow()
+        if pa is None:
+            logger.warning("pyarrow 패키지가 없어 상품 스냅샷 저장을 건너뜁니다.")
+            return []
+        if not records:
+            return []
+        snapshot_at = (snapshot_at or datetime.now()).replace(microsecond=0)
+        run_id = run_id or self.run_id or snapshot_at.strftime('%Y%m%d_%H%M%S')
+        schema = _schema(pa, SNAPSHOT_FIELDS)
+
+        by_bank: Dict[str, List[Dict]] = {}
+        for record in records:
+            by_bank.setdefault(record['bank_name'], []).append(record)
+
+        paths = []
+        with METRICS.span('snapshot_write'), self._lock:
+            for bank_name, rows in by_bank.items():
+                columns = {name: [row.get(name) for row in rows] for name, _ in SNAPSHOT_FIELDS[:-2]}
+                columns['run_id'] = [run_id] * len(rows)
+                columns['snapshot_at'] = [snapshot_at] * len(rows)
+                directory = (self.root / f"snapshot_date={snapshot_at.date().isoformat()}"
+                             / f"bank_name={quote(bank_name, safe='')}")
+                paths.append(self._write_part(pa, directory, pa.table(columns, schema=schema), run_id))
+            self._dataset = None
+        logger.info(f"🗄️ 상품 스냅샷 저장: {sum(len(rows) for rows in by_bank.values())}건 / 파일 {len(paths)}개")
+        return paths
+
+    def _write_part(self, pa, directory: Path, table, run_id: str) -> Path:
+        """실행 하나의 파티션 파일을 씀 (다른 실행의 파일은 건드리지 않음, 락 안에서 호출)"""
+        part_file = PART_FILE_FORMAT.format(run_id=quote(run_id, safe=''))
+        path = directory / part_file
+        table = table.sort_by([('product_type', 'ascending'), ('base_rate', 'ascending')])
+
+        directory.mkdir(parents=True, exist_ok=True)
+        # '.'으로 시작하는 임시 파일은 리더의 파일 탐색에서 제외됨
+        tmp_path = directory / f".{part_file}.tmp"
+        pa.parquet.write_table(table, tmp_path, compression=self.compression,
+                               row_group_size=CrawlingConfig.SNAPSHOT_ROW_GROUP_SIZE)
+        os.replace(tmp_path, path)
+        return path
+
+    def dataset(self):
+        """파티션 데이터셋 (메모리 매핑, 파일 목록은 다음 write 전까지 재사용)"""
+        pa = _pyarrow()
+        if pa is None:
+            raise ImportError("상품 스냅샷 조회에는 pyarrow가 필요합니다. (pip install pyarrow)")
+        with self._lock:
+            if self._dataset is None:
+                from pyarrow import fs
+                self._dataset = pa.dataset.dataset(
+                    str(self.root),
+                    schema=pa.unify_schemas([_schema(pa, SNAPSHOT_FIELDS), _schema(pa, PARTITION_FIELDS)]),
+                    format='parquet',
+                    partitioning=pa.dataset.partitioning(_schema(pa, PARTITION_FIELDS), flavor='hive'),
+                    filesystem=fs.LocalFileSystem(use_mmap=True)
+                ) if self.root.exists() else None
+            return self._dataset
+
+    @staticmethod
+    def build_filter(bank_name=None, product_type=None, min_rate: Optional[float] = None,
+                     max_rate: Optional[float] = None, since=None, until=None):
+        """조회 조건 -> Arrow 필터 식 (조건이 없으면 None). bank_name/product_type은 목록도 가능"""
+        pc = _pyarrow().compute
+        conditions = []
+        for column, value in (('bank_name', bank_name), ('product_type', product_type)):
+            if value is None:
+                continue
+            if isinstance(value, str):
+                conditions.append(pc.field(column) == value)
+            else:
+                conditions.append(pc.field(column).isin(list(value)))
+        if min_rate is not None:
+            conditions.append(pc.field('base_rate') >= min_rate)
+        if max_rate is not None:
+            conditions.append(pc.field('base_rate') <= max_rate)
+        # 일자 파티션 조건이므로 범위 밖의 파일은 열지 않음
+        if since is not None:
+            conditions.append(pc.field('snapshot_date') >= _as_date(since))
+        if until is not None:
+            conditions.append(pc.field('snapshot_date') <= _as_date(until))
+        if not conditions:
+            return None
+        expression = conditions[0]
+        for condition in conditions[1:]:
+            expression = expression & condition
+        return expression
+
+    def scan(self, bank_name=None, product_type=None, min_rate: Optional[float] = None,
+             max_rate: Optional[float] = None, since=None, until=None,
+             columns: Optional[Sequence[str]] = None):
+        """
+        조건에 맞는 스냅샷 행을 Arrow Table로 반환 (네트워크 없이 로컬 파일만 읽음)
+        - since/until: 'YYYY-MM-DD' 또는 date (snapshot_date 기준, 양 끝 포함)
+        - min_rate/max_rate: base_rate 범위
+        """
+        dataset = self.dataset()
+        if dataset is None:
+            return _schema(_pyarrow(), SNAPSHOT_FIELDS + PARTITION_FIELDS).empty_table()
+        filter_expression = self.build_filter(bank_name, product_type, min_rate, max_rate, since, until)
+        with METRICS.span('snapshot_scan'):
+            return dataset.to_table(columns=list(columns) if columns else None, filter=filter_expression)
+
+    def to_pandas(self, **conditions):
+        """scan() 결과를 DataFrame으로 (분석용)"""
+        return self.scan(**conditions).to_pandas()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="정제 상품 스냅샷 조회 (로컬 Parquet)")
+    parser.add_argument('--bank', action='append', dest='banks', help="은행명 (여러 번 지정 가능)")
+    parser.add_argument('--type', dest='product_type', help="상품 유형 (예: 신용대출)")
+    parser.add_argument('--min-rate', type=float, help="최저 base_rate")
+    parser.add_argument('--max-rate', type=float, help="최고 base_rate")
+    parser.add_argument('--since', help="시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument('--until', help="끝 날짜 (YYYY-MM-DD)")
+    parser.add_argument('--root', type=Path, default=None, help="스냅샷 저장소 경로")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s')
+    store = ProductSnapshotStore(args.root)
+    if not store.available():
+        logger.error("❌ pyarrow가 설치되어 있지 않습니다. (pip install pyarrow)")
+        return 1
+    table = store.scan(args.banks[0] if args.banks and len(args.banks) == 1 else args.banks,
+                       args.product_type, args.min_rate, args.max_rate, args.since, args.until)
+    sys.stdout.write(table.to_pandas().to_string(index=False) + '\n')
+    logger.info(f"🗄️ {table.num_rows}건")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
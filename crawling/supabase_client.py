@@ -5,56 +5,153 @@ Supabase 데이터베이스 연동 관리 (수정본)
 """
 
 import os
-from supabase import create_client, Client
 from dotenv import load_dotenv
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Optional, Union
 import logging
 from datetime import datetime
+from pathlib import Path
+
+from .bulk_loader import BulkLoader
+from .config import CrawlingConfig
+from .product_cache import DEFAULT_SNAPSHOT_PATH, ProductCache
+from .records import ProductBatch, ProductLike
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_project_env():
+    """프로젝트 루트의 .env 또는 .env.local 로드 (main.py 외의 진입점용)"""
+    for env_file in ['.env', '.env.local']:
+        env_path = PROJECT_ROOT / env_file
+        if env_path.exists():
+            load_dotenv(dotenv_path=env_path)
+            break
+
 class SupabaseManager:
     """Supabase 연동 관리 클래스"""
     
-    def __init__(self):
+    def __init__(self, client: Optional['Client'] = None, product_cache: Optional[ProductCache] = None):
+        # 상품 조회 캐시 (적재 성공 시 자동 무효화)
+        self.product_cache = product_cache
+        if self.product_cache is None and CrawlingConfig.PRODUCT_CACHE_ENABLED:
+            snapshot_path = DEFAULT_SNAPSHOT_PATH if CrawlingConfig.PRODUCT_CACHE_SNAPSHOT else None
+            self.product_cache = ProductCache(snapshot_path=snapshot_path)
+        
+        # client를 넘기면(예: LocalSupabaseClient) 환경 변수 없이 동작
+        if client is not None:
+            self.client = client
+            logger.info("Supabase 클라이언트 주입 완료")
+            return
+        
         url = os.getenv('SUPABASE_URL')
         key = os.getenv('SUPABASE_KEY')
         
         if not url or not key:
             raise ValueError("SUPABASE_URL과 SUPABASE_KEY 환경 변수가 필요합니다.")
         
-        self.client: Client = create_client(url, key)
+        # supabase 패키지는 임포트 비용이 커서 실제로 연결할 때만 로드
+        from supabase import create_client
+        self.client: 'Client' = create_client(url, key)
         logger.info("Supabase 클라이언트 초기화 완료")
     
-    def insert_loan_products(self, products: List[Dict]) -> bool:
+    def insert_loan_products(self, products: Union[ProductBatch, List[ProductLike]]) -> bool:
         """
         대출 상품 데이터 삽입 (UPSERT 방식)
+        - 모든 로우가 적재되었을 때만 True (상세 결과는 bulk_upsert_loan_products 사용)
+        """
+        if not products:
+            logger.warning("삽입할 상품이 없습니다.")
+            return False
+        return self.bulk_upsert_loan_products(products)['success']
+    
+    def bulk_upsert_loan_products(self, products: Union[ProductBatch, List[ProductLike]], **loader_options) -> Dict:
+        """
+        대출 상품 대량 적재 (청크 분할 / 동시 전송 / 재시도 / 문제 로우 격리)
+        products: LoanProduct 목록/ProductBatch (정제 결과) 또는 dict 목록 (clean --output 파일 등)
+        loader_options: chunk_size, max_chunk_bytes, max_workers, max_retries, backoff_base
         """
+        # [중요]
+        # 파이썬에서 crawled_at을 추가하지 않습니다.
+        # DB 스키마의 DEFAULT NOW()가 작동하도록 내버려 둡니다.
+        loader = BulkLoader(
+            self.client,
+            'crawled_loan_products',
+            on_conflict='bank_name,product_name',
+            **loader_options
+        )
+        report = loader.load(products)
+        if report['loaded_rows'] and self.product_cache:
+            self.product_cache.invalidate()
+        if report['loaded_rows']:
+            logger.info(f"✅ {report['loaded_rows']}개 상품 새 테이블(crawled_loan_products) 적재 성공")
+        if not report['success']:
+            logger.error(f"❌ 상품 적재 실패 {report['failed_row_count']}건")
+        return report
+    
+    def get_user_debts(self, session_id: Optional[str] = None) -> List[Dict]:
+        """사용자 보유 대출 조회 (시뮬레이션 배치 입력)"""
         try:
-            if not products:
-                logger.warning("삽입할 상품이 없습니다.")
-                return False
-            
-            # [중요 수정] 
-            # 파이썬에서 crawled_at을 추가하지 않습니다. 
-            # DB 스키마의 DEFAULT NOW()가 작동하도록 내버려 둡니다.
-            # for product in products:
-            #     product['crawled_at'] = datetime.now().isoformat()
-            
-            # 대상 테이블을 새 테이블 이름으로 명시
-            result = self.client.table('crawled_loan_products').upsert(
-                products,
-                on_conflict='bank_name,product_name'
-            ).execute()
-            
-            logger.info(f"✅ {len(products)}개 상품 새 테이블(crawled_loan_products) 적재 성공")
+            query = self.client.table('user_debts').select('*')
+            if session_id:
+                query = query.eq('session_id', session_id)
+            return query.execute().data
+        except Exception as e:
+            logger.error(f"부채 조회 실패: {e}")
+            return []
+    
+    def insert_simulation_results(self, results: List[Dict], **loader_options) -> Dict:
+        """
+        시뮬레이션 결과 이력 대량 적재 (id는 DB 기본값으로 생성되므로 충돌 키 없이 전송)
+        충돌 키가 없어 응답이 유실된 청크는 재전송하지 않습니다. (중복 로우 방지)
+        """
+        loader = BulkLoader(self.client, 'simulation_results', on_conflict='', **loader_options)
+        return loader.load(results)
+    
+    def insert_rate_history(self, events: List[Dict], **loader_options) -> Dict:
+        """상품 변경 이벤트 대량 적재 (loan_product_history, 응답이 유실된 청크는 재전송하지 않음)"""
+        rows = [
+            {
+                'bank_name': event['bank_name'],
+                'product_name': event['product_name'],
+                'changed_at': event['ts'],
+                'changes': event['changes']
+            }
+            for event in events
+        ]
+        loader = BulkLoader(self.client, 'loan_product_history', on_conflict='', **loader_options)
+        return loader.load(rows)
+    
+    def save_offer_index(self, snapshot: Dict) -> bool:
+        """최적 상품 인덱스 스냅샷 저장 (같은 버전은 덮어씀)"""
+        try:
+            record = {
+                'version': snapshot['version'],
+                'built_at': snapshot['built_at'],
+                'product_count': snapshot['product_count'],
+                'payload': snapshot
+            }
+            self.client.table('offer_index_snapshots').upsert(record, on_conflict='version').execute()
             return True
-            
         except Exception as e:
-            logger.error(f"❌ 상품 적재 실패: {e}")
+            logger.warning(f"인덱스 스냅샷 저장 실패: {e}")
             return False
     
+    def get_offer_index(self) -> Optional[Dict]:
+        """가장 최근 최적 상품 인덱스 스냅샷 조회"""
+        try:
+            result = self.client.table('offer_index_snapshots').select('payload') \
+                .order('built_at', desc=True).limit(1).execute()
+            return result.data[0]['payload'] if result.data else None
+        except Exception as e:
+            logger.error(f"인덱스 스냅샷 조회 실패: {e}")
+            return None
+    
     def log_crawling_result(
         self, 
         bank_name: str, 
@@ -79,8 +176,31 @@ class SupabaseManager:
             logger.error(f"로그 기록 실패: {e}")
             return False
     
+    def log_run_metrics(self, summary: Dict) -> bool:
+        """실행 계측 요약 기록 (crawling_logs와 같은 실행 단위, crawling_run_metrics)"""
+        try:
+            record = {
+                'run_id': summary['run_id'],
+                'elapsed_sec': summary['elapsed_sec'],
+                'peak_rss_bytes': summary['peak_rss_bytes']['self'],
+                'spans': summary['spans'],
+                'counters': summary['counters'],
+                'created_at': datetime.now().isoformat()
+            }
+            self.client.table('crawling_run_metrics').upsert(record, on_conflict='run_id').execute()
+            return True
+        except Exception as e:
+            logger.warning(f"실행 계측 기록 실패: {e}")
+            return False
+    
     def get_latest_products(self, bank_name: Optional[str] = None) -> List[Dict]:
-        """새 테이블에서 최신 상품 조회"""
+        """새 테이블에서 최신 상품 조회 (캐시가 있으면 캐시 우선)"""
+        if self.product_cache is None:
+            return self._query_latest_products(bank_name) or []
+        return self.product_cache.get_or_load(bank_name, lambda: self._query_latest_products(bank_name))
+    
+    def _query_latest_products(self, bank_name: Optional[str] = None) -> Optional[List[Dict]]:
+        """DB 조회 (실패 시 None → 캐시하지 않음)"""
         try:
             # 테이블명 변경: crawled_loan_products
             query = self.client.table('crawled_loan_products').select('*')
@@ -92,4 +212,4 @@ class SupabaseManager:
             return result.data
         except Exception as e:
             logger.error(f"상품 조회 실패: {e}")
-            return []
\ No newline at end of file
+            return None
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""
+오프라인 테스트 공용 픽스처
+- 은행 사이트 대신 crawling/fixtures/를 제공하는 로컬 픽스처 서버
+- Chrome 없이 JS 렌더링 결과를 돌려주는 Selenium 대역 수집기
+"""
+import time
+from typing import Dict, List, Optional
+
+import pytest
+
+from ..config import CrawlingConfig
+from ..fetchers import BaseFetcher
+from ..fixture_server import FIXTURE_DIR, FixtureServer
+
+
+class StubSeleniumFetcher(BaseFetcher):
+    """
+    SeleniumFetcher 대역: 브라우저를 띄우지 않고 '렌더링된' HTML(rendered[url])을 반환
+    렌더링 결과가 등록되지 않은 URL은 실제 브라우저처럼 요소 대기 시간 초과로 실패합니다.
+    """
+
+    mode = 'selenium'
+
+    def __init__(self, rendered: Optional[Dict[str, str]] = None):
+        self.rendered = dict(rendered or {})
+        self.calls: List[str] = []
+
+    def fetch(self, url: str, wait_selector: Optional[str] = None,
+              headers: Optional[Dict[str, str]] = None) -> Dict:
+        started = time.perf_counter()
+        self.calls.append(url)
+        if url not in self.rendered:
+            raise TimeoutError(f"렌더링 결과 없음: {url}")
+        return {
+            'url': url,
+            'mode': self.mode,
+            'status': 200,
+            'html': self.rendered[url],
+            'headers': {},
+            'elapsed_sec': time.perf_counter() - started
+        }
+
+
+@pytest.fixture
+def fixture_server():
+    with FixtureServer() as server:
+        yield server
+
+
+@pytest.fixture
+def offline_config(monkeypatch):
+    """
+    테스트가 빨리 끝나도록 요청 간격/재시도 대기를 없앤 설정 (클래스 속성을 테스트 동안만 변경)
+    픽스처에는 상세 페이지가 있으므로 상세 수집을 켭니다.
+    """
+    monkeypatch.setattr(CrawlingConfig, 'DETAIL_ENABLED', True)
+    monkeypatch.setattr(CrawlingConfig, 'DETAIL_REQUEST_INTERVAL', 0.0)
+    monkeypatch.setattr(CrawlingConfig, 'THROTTLE_MAX_DELAY', 0.0)
+    monkeypatch.setattr(CrawlingConfig, 'MAX_RETRIES', 1)
+    return CrawlingConfig
+
+
+def read_fixture(name: str) -> str:
+    return (FIXTURE_DIR / name).read_text(encoding='utf-8')
@@ -0,0 +1,60 @@
+"""
+ChromeDriverFactory user-data-dir 슬롯 테스트 (Chrome 없이 슬롯 배정만 확인)
+- 작업 큐 워커처럼 생성기가 프로세스마다 따로 있어도 같은 슬롯을 동시에 빌려주지 않아야 합니다.
+"""
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from ..browser import ChromeDriverFactory
+
+PACKAGE_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_slots_are_exclusive_between_factories(tmp_path):
+    # 생성기 두 개 = 슬롯 상태를 공유하지 않는 두 워커
+    first, second = ChromeDriverFactory(user_data_root=tmp_path), ChromeDriverFactory(user_data_root=tmp_path)
+
+    assert first._acquire_slot('lean') == 0
+    assert second._acquire_slot('lean') == 1
+    assert first._acquire_slot('lean') == 2
+    # 다른 프로필은 슬롯 번호를 따로 셈
+    assert second._acquire_slot('debug') == 0
+
+    # 반납된 슬롯(워밍된 디렉터리)은 다른 생성기가 다시 씀
+    first._release_slot('lean', 0)
+    assert second._acquire_slot('lean') == 0
+
+
+def test_slot_held_by_another_process_is_skipped(tmp_path):
+    holder = subprocess.Popen(
+        [sys.executable, '-c', textwrap.dedent(f"""
+            import sys
+            from crawling.browser import ChromeDriverFactory
+            factory = ChromeDriverFactory(user_data_root={str(tmp_path)!r})
+            print(factory._acquire_slot('lean'), flush=True)
+            sys.stdin.read()
+        """)],
+        cwd=PACKAGE_ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+    )
+    try:
+        assert holder.stdout.readline().strip() == '0'
+        assert ChromeDriverFactory(user_data_root=tmp_path)._acquire_slot('lean') == 1
+    finally:
+        holder.stdin.close()
+        holder.wait(timeout=30)
+
+    # 프로세스가 끝나면 잠금이 풀려 slot-0을 다시 씀
+    assert ChromeDriverFactory(user_data_root=tmp_path)._acquire_slot('lean') == 0
+
+
+def test_broken_slot_directory_is_removed(tmp_path):
+    factory = ChromeDriverFactory(user_data_root=tmp_path)
+    slot = factory._acquire_slot('lean')
+    (tmp_path / 'lean' / f'slot-{slot}').mkdir()
+
+    factory._release_slot('lean', slot, broken=True)
+
+    assert not (tmp_path / 'lean' / f'slot-{slot}').exists()
+    assert factory._acquire_slot('lean') == slot
@@ -0,0 +1,198 @@
+"""
+BulkLoader 테스트 (LocalSupabaseClient의 장애 재현 기능 사용)
+- 청크 분할, 503 재시도/백오프, CHECK 위반 로우 격리(이분할), 413 크기 제한, 리포트 구조
+- max_retries(MAX_RETRIES)는 청크당 최대 시도 횟수, 충돌 키 없는 INSERT는 응답 유실 시 재전송하지 않음
+"""
+from ..bulk_loader import BulkLoader, is_ambiguous_error, is_transient_error, row_size
+from ..local_client import LocalAPIError, LocalSupabaseClient
+from ..records import LoanProduct
+
+TABLE = 'crawled_loan_products'
+ON_CONFLICT = 'bank_name,product_name'
+
+
+def make_rows(count: int, **overrides):
+    return [
+        {
+            'bank_name': 'KB', 'product_name': f'상품{i:03d}', 'product_type': '신용대출',
+            'base_rate': 4.0, 'additional_rate': 0.5, 'max_limit': 10000000 + i,
+            'early_repay_fee_rate': 1.5, 'fee_waiver_months': 36, 'salary_transfer_discount': 0.3,
+            **overrides
+        }
+        for i in range(count)
+    ]
+
+
+def make_loader(client, sleeps=None, **kwargs) -> BulkLoader:
+    options = {'chunk_size': 10, 'max_chunk_bytes': 1_000_000, 'max_workers': 2, 'max_retries': 3,
+               'backoff_base': 1.0}
+    options.update(kwargs)
+    return BulkLoader(client, TABLE, ON_CONFLICT,
+                      sleep=sleeps.append if sleeps is not None else (lambda delay: None), **options)
+
+
+def stored(client):
+    return client.tables.get(TABLE, [])
+
+
+def test_chunks_by_count_and_bytes():
+    rows = make_rows(25)
+    loader = make_loader(LocalSupabaseClient(), chunk_size=10)
+    chunks = loader.make_chunks(rows)
+    assert [(start, len(chunk)) for start, chunk, _ in chunks] == [(0, 10), (10, 10), (20, 5)]
+    assert all(size == sum(row_size(row) for row in chunk) for _, chunk, size in chunks)
+
+    limit = row_size(rows[0]) * 3
+    chunks = make_loader(LocalSupabaseClient(), chunk_size=100, max_chunk_bytes=limit).make_chunks(rows)
+    assert all(size <= limit for _, _, size in chunks)
+    assert sum(len(chunk) for _, chunk, _ in chunks) == 25
+
+
+def test_load_report_and_upsert_semantics():
+    client = LocalSupabaseClient()
+    rows = make_rows(25)
+    report = make_loader(client).load(rows)
+
+    assert report['success'] is True
+    assert report['table'] == TABLE
+    assert (report['total_rows'], report['loaded_rows'], report['failed_row_count']) == (25, 25, 0)
+    assert report['failed_rows'] == []
+    assert [chunk['chunk'] for chunk in report['chunks']] == [0, 1, 2]
+    assert [chunk['offset'] for chunk in report['chunks']] == [0, 10, 20]
+    assert all(chunk['status'] == 'success' and chunk['attempts'] == 1 for chunk in report['chunks'])
+    assert len(stored(client)) == 25
+
+    # 같은 키로 다시 적재하면 갱신 (on_conflict)
+    make_loader(client).load(make_rows(5, base_rate=3.5))
+    assert len(stored(client)) == 25
+    assert sorted(row['base_rate'] for row in stored(client)).count(3.5) == 5
+
+
+def test_loan_product_records_are_loaded():
+    client = LocalSupabaseClient()
+    records = [LoanProduct.from_dict(row) for row in make_rows(3)]
+    report = make_loader(client).load(records)
+    assert report['loaded_rows'] == 3
+    assert all(isinstance(row, dict) for row in stored(client))
+
+
+def test_transient_503_is_retried_with_backoff():
+    client = LocalSupabaseClient(transient_failures=2)
+    sleeps = []
+    report = make_loader(client, sleeps=sleeps, max_workers=1).load(make_rows(5))
+
+    assert report['success'] is True
+    assert report['chunks'][0]['attempts'] == 3
+    assert report['chunks'][0]['splits'] == 0
+    assert len(sleeps) == 2
+    # 지수 백오프 (지터 +-50%): 1차 0.5~1.5초, 2차 1~3초
+    assert 0.5 <= sleeps[0] <= 1.5 and 1.0 <= sleeps[1] <= 3.0
+    assert len(stored(client)) == 5
+
+
+def test_transient_errors_exhausting_retries_fail_whole_chunk_without_split():
+    client = LocalSupabaseClient(transient_failures=100)
+    report = make_loader(client, max_workers=1, max_retries=2).load(make_rows(4))
+
+    chunk = report['chunks'][0]
+    assert report['success'] is False
+    assert (chunk['status'], chunk['attempts'], chunk['splits']) == ('failed', 2, 0)
+    assert report['failed_row_count'] == 4
+    assert [row['index'] for row in report['failed_rows']] == [0, 1, 2, 3]
+    assert all('503' in row['error'] for row in report['failed_rows'])
+    assert stored(client) == []
+
+
+def test_check_violation_is_isolated_by_bisection():
+    client = LocalSupabaseClient()
+    rows = make_rows(10)
+    rows[3]['base_rate'] = 99.0          # base_rate_check 위반
+    rows[7]['fee_waiver_months'] = 120    # fee_waiver_months_check 위반
+    sleeps = []
+    report = make_loader(client, sleeps=sleeps).load(rows)
+
+    chunk = report['chunks'][0]
+    assert report['success'] is False
+    assert chunk['status'] == 'partial'
+    assert chunk['splits'] > 0
+    assert (report['loaded_rows'], report['failed_row_count']) == (8, 2)
+    assert [(row['index'], row['product_name']) for row in report['failed_rows']] == [(3, '상품003'), (7, '상품007')]
+    assert 'base_rate_check' in report['failed_rows'][0]['error']
+    assert 'fee_waiver_months_check' in report['failed_rows'][1]['error']
+    # 제약 조건 위반은 재시도하지 않음
+    assert sleeps == []
+    assert sorted(row['product_name'] for row in stored(client)) == [
+        row['product_name'] for i, row in enumerate(rows) if i not in (3, 7)
+    ]
+
+
+def test_payload_too_large_is_split_until_it_fits():
+    rows = make_rows(8)
+    limit = row_size(rows[0]) * 3
+    client = LocalSupabaseClient(max_payload_bytes=limit)
+    # 청크 바이트 상한을 서버 제한보다 크게 잡아 413을 유발
+    report = make_loader(client, max_chunk_bytes=limit * 10, max_workers=1).load(rows)
+
+    chunk = report['chunks'][0]
+    assert report['success'] is True
+    assert chunk['splits'] > 0
+    assert report['loaded_rows'] == 8
+    assert len(stored(client)) == 8
+
+
+def test_single_row_over_payload_limit_is_reported():
+    rows = make_rows(3)
+    rows[1]['product_name'] = '아주 긴 상품명' * 200
+    client = LocalSupabaseClient(max_payload_bytes=row_size(rows[0]) * 2)
+    report = make_loader(client, max_workers=1).load(rows)
+
+    assert report['loaded_rows'] == 2
+    assert [row['index'] for row in report['failed_rows']] == [1]
+    assert '413' in report['failed_rows'][0]['error']
+
+
+def test_is_transient_error():
+    assert is_transient_error(LocalAPIError('503', 'Service Unavailable'))
+    assert is_transient_error(LocalAPIError('40001', 'serialization failure'))
+    assert is_transient_error(ConnectionError())
+    assert not is_transient_error(LocalAPIError('23514', 'check violation'))
+    assert not is_transient_error(LocalAPIError('413', 'Payload Too Large'))
+    assert not is_transient_error(ValueError())
+
+
+def test_plain_insert_is_not_resent_after_lost_response():
+    # 충돌 키 없는 INSERT: 서버는 반영했지만 응답이 유실 → 재전송하면 같은 로우가 두 번 들어감
+    client = LocalSupabaseClient(lost_responses=1)
+    loader = BulkLoader(client, 'simulation_results', '', max_workers=1, max_retries=3, sleep=lambda delay: None)
+    report = loader.load(make_rows(4))
+
+    chunk = report['chunks'][0]
+    assert (chunk['status'], chunk['attempts'], chunk['splits']) == ('failed', 1, 0)
+    assert len(client.tables['simulation_results']) == 4
+
+
+def test_plain_insert_retries_errors_the_server_rejected():
+    client = LocalSupabaseClient(transient_failures=1)
+    loader = BulkLoader(client, 'simulation_results', '', max_workers=1, max_retries=3, sleep=lambda delay: None)
+    report = loader.load(make_rows(4))
+
+    assert report['success'] is True and report['chunks'][0]['attempts'] == 2
+    assert len(client.tables['simulation_results']) == 4
+
+
+def test_upsert_is_resent_after_lost_response():
+    # 충돌 키가 있으면 재전송해도 같은 로우를 갱신할 뿐이므로 재시도
+    client = LocalSupabaseClient(lost_responses=1)
+    report = make_loader(client, max_workers=1).load(make_rows(4))
+
+    assert report['success'] is True and report['chunks'][0]['attempts'] == 2
+    assert len(stored(client)) == 4
+
+
+def test_is_ambiguous_error():
+    assert is_ambiguous_error(TimeoutError())
+    assert is_ambiguous_error(ConnectionResetError())
+    assert is_ambiguous_error(LocalAPIError('504', 'Gateway Timeout'))
+    assert not is_ambiguous_error(ConnectionRefusedError())
+    assert not is_ambiguous_error(LocalAPIError('503', 'Service Unavailable'))
+    assert not is_ambiguous_error(LocalAPIError('40001', 'serialization failure'))
@@ -0,0 +1,82 @@
+"""
+변경 감지(지문)와 원본 아카이브/스냅샷 완전성 테스트
+- 지문으로 바뀌지 않은 상품의 적재를 건너뛰어도, 실행마다 남기는 원본 아카이브에는 그날의 전체 목록이 있어야 합니다.
+- 정제 상품 스냅샷도 실행마다 전체 상품이어야 합니다. ('날짜 X의 금리' 조회가 그날의 변경분만 보지 않도록)
+"""
+from datetime import date
+
+import pytest
+
+from ..archive import RawArchiveWriter, iter_archive
+from ..bank_crawlers.kb_crawler import KBCrawler
+from ..fingerprint import FingerprintStore
+from ..local_client import LocalSupabaseClient
+from ..pipeline import CrawlPipeline
+from ..rate_history import RateHistoryStore
+from ..scheduler import CrawlScheduler
+from ..snapshot_store import ProductSnapshotStore
+from ..supabase_client import SupabaseManager
+from .conftest import StubSeleniumFetcher
+
+
+def make_crawler(fixture_server, fingerprints: FingerprintStore) -> KBCrawler:
+    crawler = KBCrawler()
+    crawler.selenium_fetcher = StubSeleniumFetcher()
+    crawler.targets = [(fixture_server.url_for('kb_credit.html'), '신용대출'),
+                       (fixture_server.url_for('kb_mortgage.html'), '담보대출')]
+    crawler.fingerprints = fingerprints
+    return crawler
+
+
+def crawl_run(fixture_server, fingerprints: FingerprintStore, archive_root, run_id: str):
+    """픽스처 서버의 신용/담보 목록을 한 번 수집하고 (크롤러, 적재할 상품, 아카이브 레코드) 반환"""
+    crawler = make_crawler(fixture_server, fingerprints)
+    with RawArchiveWriter(run_id, root=archive_root) as archive:
+        crawler.archive = archive
+        products = crawler.safe_crawl()
+    fingerprints.commit()
+    return crawler, products, list(iter_archive(archive_root))
+
+
+def test_unchanged_items_are_still_archived(fixture_server, offline_config, tmp_path):
+    fingerprints = FingerprintStore(tmp_path / 'fingerprints.json')
+
+    first, first_products, first_records = crawl_run(fixture_server, fingerprints, tmp_path / 'raw1', '20260101_000000')
+    second, second_products, second_records = crawl_run(fixture_server, fingerprints, tmp_path / 'raw2', '20260102_000000')
+
+    assert len(first_products) == 16 and first.unchanged_count == 0
+    # 두 번째 실행은 바뀐 상품이 없어 적재할 상품이 없지만
+    assert second_products == [] and second.unchanged_count == 16
+    # 아카이브에는 두 실행 모두 전체 목록이 남아 재처리/백필로 그날의 카탈로그를 다시 만들 수 있음
+    assert len(second_records) == len(first_records) == 16
+    assert second_records == first_records
+
+
+def test_snapshot_holds_every_product_when_nothing_changed(fixture_server, offline_config, tmp_path):
+    pytest.importorskip('pyarrow')
+    fingerprints = FingerprintStore(tmp_path / 'fingerprints.json')
+    history = RateHistoryStore(tmp_path / 'rate_history')
+    supabase = SupabaseManager(client=LocalSupabaseClient())
+    snapshot_root = tmp_path / 'snapshots'
+
+    summaries = []
+    for day, run_id in ((1, '20260101_000000'), (2, '20260102_000000')):
+        crawler = make_crawler(fixture_server, fingerprints)
+        pipeline = CrawlPipeline(
+            supabase, scheduler=CrawlScheduler(driver_factory=lambda profile: None),
+            history=history, snapshots=ProductSnapshotStore(snapshot_root, run_id=run_id)
+        )
+        summaries.append(pipeline.run([crawler]))
+        if summaries[-1]['success']:
+            fingerprints.commit()
+
+    # 두 번째 실행은 바뀐 상품이 없어 적재하지 않지만
+    assert summaries[0]['loaded_rows'] == 15
+    assert summaries[1]['loaded_rows'] == 0 and summaries[1]['unchanged_rows'] == 15
+    # 스냅샷에는 실행마다 전체 상품이 남음
+    table = ProductSnapshotStore(snapshot_root).scan(bank_name='KB')
+    runs = table.group_by('run_id').aggregate([('product_name', 'count')]).to_pylist()
+    assert sorted((run['run_id'], run['product_name_count']) for run in runs) == [
+        ('20260101_000000', 15), ('20260102_000000', 15)
+    ]
+    assert set(table.column('snapshot_date').to_pylist()) == {date.today()}
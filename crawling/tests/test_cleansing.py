@@ -0,0 +1,48 @@
+"""
+배치 전처리(parse_product_frame) ↔ 로우 단위 파서(parse_product_row) 정합성 테스트
+- 재처리는 배치 경로, 크롤러는 로우 경로를 쓰므로 같은 원본에서 값과 타입까지 같아야 합니다.
+"""
+import itertools
+
+import pytest
+
+from ..cleansing import LoanDataCleaner
+
+# 실제 수집 원본에 나오는 형태 (단위/범위/안내 문구/빈 값/깨진 값)
+RATES = ['연 3.5% ~ 5.2%', '4.15%', '3.9~6.1', '최저 연 4.5%', '상세문의', '', '   ', '%', None, 3.5]
+LIMITS = ['3.5억원', '최대 1억원', '5천만원', '3,000만원', '500백만원', '2.5', '1,500', '상세문의', '', None]
+FEES = ['1.5%', '0.7', '중도상환수수료 없음', '', None]
+WAIVERS = ['36', '3년', '면제', '', None]
+
+
+def raw_rows():
+    rows = []
+    for i, (rate, limit) in enumerate(itertools.product(RATES, LIMITS)):
+        rows.append({
+            'bank_name': 'KB',
+            'product_name': f'상품{i:03d}',
+            'product_type': '담보대출' if i % 3 else '신용대출',
+            'rate': rate,
+            'limit': limit,
+            'fee': FEES[i % len(FEES)],
+            'waiver': WAIVERS[i % len(WAIVERS)]
+        })
+    # 키가 아예 없는 로우 (상세 페이지 미수집 등)
+    rows.append({'bank_name': 'KB', 'product_name': '키 누락'})
+    rows.append({'bank_name': 'KB', 'product_name': '유형 누락', 'rate': '4.0%', 'limit': '1억원'})
+    return rows
+
+
+def typed(record) -> dict:
+    return {field: (type(value).__name__, value) for field, value in record.to_dict().items()}
+
+
+@pytest.mark.parametrize('rows', [raw_rows(), raw_rows()[::-1], raw_rows()[:1]])
+def test_batch_parser_matches_row_parser(rows):
+    expected = [typed(LoanDataCleaner.parse_product_row(row)) for row in rows]
+    actual = [typed(record) for record in LoanDataCleaner.parse_product_records(rows)]
+    assert actual == expected
+
+
+def test_empty_input():
+    assert LoanDataCleaner.parse_product_records([]) == []
@@ -0,0 +1,81 @@
+"""
+상세 페이지 수집 테스트 (픽스처 서버)
+- 상세 페이지의 금리/중도상환해약금/면제 기간이 상품에 반영되어야 합니다.
+- 상세 필드를 읽지 못한 상품은 기본값으로 채우지 않고 제외합니다. (기본값은 DETAIL_ENABLED=False일 때만)
+- 상세 단계에서 모든 상품이 빠지면 더미 데이터 없이 은행 수집 실패로 보고합니다.
+"""
+import shutil
+
+import pytest
+
+from ..bank_crawlers.kb_crawler import KBCrawler
+from ..config import CrawlingConfig
+from ..detail import DetailExtractionError
+from ..fixture_server import FIXTURE_DIR, FixtureServer
+from .conftest import StubSeleniumFetcher
+
+
+def crawl_credit(server) -> list:
+    crawler = KBCrawler()
+    crawler.selenium_fetcher = StubSeleniumFetcher()
+    return crawler.crawl_target(server.url_for('kb_credit.html'), '신용대출')
+
+
+def by_name(products) -> dict:
+    return {product['product_name']: product for product in products}
+
+
+def test_detail_fields_are_applied(fixture_server, offline_config):
+    product = by_name(crawl_credit(fixture_server))['KB직장인든든 신용대출']
+    # 연 4.12% ~ 5.62% / 최대 0.6% / 3년 경과 시 면제
+    assert product['base_rate'] == 4.12
+    assert product['early_repay_fee_rate'] == 0.6
+    assert product['fee_waiver_months'] == 36
+
+
+def test_product_with_missing_detail_field_is_skipped(offline_config, tmp_path):
+    fixture_dir = tmp_path / 'fixtures'
+    shutil.copytree(FIXTURE_DIR, fixture_dir)
+    # 중도상환해약금 블록이 없는 상세 페이지
+    detail_path = fixture_dir / 'kb_detail' / 'LN20000160.html'
+    html = detail_path.read_text(encoding='utf-8')
+    start, end = html.index('<dl class="info-fee">'), html.index('<dl class="info-waiver">')
+    detail_path.write_text(html[:start] + html[end:], encoding='utf-8')
+
+    with FixtureServer(fixture_dir=fixture_dir) as server:
+        products = by_name(crawl_credit(server))
+
+    assert 'KB직장인든든 신용대출' not in products
+    assert len(products) == 9
+    assert products['KB 스마트 신용대출']['base_rate'] != 4.2
+
+
+def test_defaults_only_without_detail_pages(fixture_server, offline_config, monkeypatch):
+    monkeypatch.setattr(CrawlingConfig, 'DETAIL_ENABLED', False)
+    products = crawl_credit(fixture_server)
+
+    assert len(products) == 10
+    assert all((product['base_rate'], product['early_repay_fee_rate'], product['fee_waiver_months'])
+               == (4.2, 1.5, 36) for product in products)
+
+
+def test_bank_fails_without_dummy_data_when_no_detail_parses(offline_config, tmp_path):
+    fixture_dir = tmp_path / 'fixtures'
+    shutil.copytree(FIXTURE_DIR, fixture_dir)
+    # 상세 페이지 구조가 바뀌어 선택자가 아무것도 찾지 못하는 상황
+    for detail_path in (fixture_dir / 'kb_detail').glob('*.html'):
+        detail_path.write_text('<html><body><div class="renewed"></div></body></html>', encoding='utf-8')
+
+    with FixtureServer(fixture_dir=fixture_dir) as server:
+        crawler = KBCrawler()
+        crawler.selenium_fetcher = StubSeleniumFetcher()
+        crawler.targets = [(server.url_for('kb_credit.html'), '신용대출'),
+                           (server.url_for('kb_mortgage.html'), '담보대출')]
+        with pytest.raises(DetailExtractionError):
+            crawler.crawl()
+        # safe_crawl은 더미 상품 대신 빈 목록 + last_error → 스케줄러가 은행을 'failed'로 보고
+        products = crawler.safe_crawl()
+
+    assert crawler.listed_count == 16
+    assert products == []
+    assert '상세 정보를 읽은 상품이 없습니다' in crawler.last_error
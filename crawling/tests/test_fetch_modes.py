@@ -0,0 +1,77 @@
+"""
+HTTP 우선 수집 / Selenium 전환 테스트 (픽스처 서버 + Selenium 대역)
+- 정적 목록(kb_credit.html)은 HTTP로만 수집하고 브라우저를 쓰지 않아야 합니다.
+- JS 렌더링 목록(kb_credit_js.html)은 HTTP 응답에 .area1이 없으므로 Selenium으로 재수집해야 합니다.
+"""
+from ..bank_crawlers.kb_crawler import KBCrawler
+from ..fetchers import contains_selector
+from .conftest import StubSeleniumFetcher, read_fixture
+
+
+def make_crawler(stub: StubSeleniumFetcher) -> KBCrawler:
+    crawler = KBCrawler()
+    crawler.selenium_fetcher = stub
+    return crawler
+
+
+def test_contains_selector_distinguishes_rendered_list():
+    assert contains_selector(read_fixture('kb_credit.html'), '.area1')
+    # 스크립트 안의 className = 'area1' 문자열은 요소로 보지 않음
+    assert not contains_selector(read_fixture('kb_credit_js.html'), '.area1')
+    assert contains_selector('<div class="x area1 y">', '.area1')
+    assert contains_selector('<ul id="product-list">', '#product-list')
+
+
+def test_static_list_is_fetched_over_http_only(fixture_server, offline_config):
+    stub = StubSeleniumFetcher()
+    crawler = make_crawler(stub)
+    url = fixture_server.url_for('kb_credit.html')
+
+    products = crawler.crawl_target(url, '신용대출')
+
+    assert stub.calls == []
+    assert crawler.driver is None
+    assert crawler._render_modes[url] == 'static'
+    assert len(products) == 10
+    assert all(product['bank_name'] == 'KB' and product['product_type'] == '신용대출' for product in products)
+    assert all(product['max_limit'] > 0 for product in products if product['product_name'] != 'KB 나라사랑대출')
+
+
+def test_js_list_switches_to_selenium(fixture_server, offline_config):
+    url = fixture_server.url_for('kb_credit_js.html')
+    # 브라우저가 스크립트를 실행한 결과 = 같은 상품을 서버 렌더링한 정적 스냅샷
+    stub = StubSeleniumFetcher({url: read_fixture('kb_credit.html')})
+    crawler = make_crawler(stub)
+
+    products = crawler.crawl_target(url, '신용대출')
+
+    assert stub.calls == [url]
+    assert crawler._render_modes[url] == 'dynamic'
+    assert len(products) == 10
+
+    # 같은 실행 안에서는 HTTP를 다시 시도하지 않고 바로 Selenium 사용
+    crawler.crawl_target(url, '신용대출')
+    assert stub.calls == [url, url]
+
+
+def test_js_list_matches_static_list(fixture_server, offline_config):
+    static_url = fixture_server.url_for('kb_credit.html')
+    js_url = fixture_server.url_for('kb_credit_js.html')
+    static_products = make_crawler(StubSeleniumFetcher()).crawl_target(static_url, '신용대출')
+    js_products = make_crawler(
+        StubSeleniumFetcher({js_url: read_fixture('kb_credit.html')})
+    ).crawl_target(js_url, '신용대출')
+
+    assert [product.to_dict() for product in js_products] == [product.to_dict() for product in static_products]
+
+
+def test_static_mode_never_starts_selenium(fixture_server, offline_config):
+    stub = StubSeleniumFetcher()
+    crawler = make_crawler(stub)
+    url = fixture_server.url_for('kb_credit_js.html')
+    crawler._render_modes[url] = 'static'
+
+    products = crawler.crawl_target(url, '신용대출')
+
+    assert stub.calls == []
+    assert products == []
@@ -0,0 +1,124 @@
+"""
+CrawlPipeline 테스트 (스텁 크롤러 + LocalSupabaseClient, 브라우저/네트워크 없음)
+- 단계 겹침: 먼저 끝난 은행은 느린 은행의 수집이 끝나기 전에 적재되어야 합니다.
+- 오류 전달: 수집 실패/적재 실패가 은행 결과, 크롤링 로그, 전체 성공 여부에 반영되어야 합니다.
+- 처리한 은행이 없으면 성공으로 보고하지 않습니다.
+"""
+import threading
+import time
+
+from ..local_client import LocalSupabaseClient
+from ..pipeline import CrawlPipeline
+from ..records import LoanProduct
+from ..scheduler import CrawlScheduler
+from ..supabase_client import SupabaseManager
+
+WAIT_SEC = 5.0
+
+
+def make_products(bank_name: str, count: int, **overrides):
+    return [
+        LoanProduct.from_dict({
+            'bank_name': bank_name, 'product_name': f'{bank_name} 상품{i}', 'product_type': '신용대출',
+            'base_rate': 4.0, 'additional_rate': 0.5, 'max_limit': 50000000, 'early_repay_fee_rate': 1.5,
+            'fee_waiver_months': 36, 'salary_transfer_discount': 0.3, **overrides
+        })
+        for i in range(count)
+    ]
+
+
+class StubCrawler:
+    """safe_crawl()만 흉내내는 크롤러 (before_return으로 수집 종료 시점을 조절)"""
+
+    def __init__(self, bank_name: str, products=None, error: str = None, raises: bool = False, before_return=None):
+        self.bank_name = bank_name
+        self.products = products or []
+        self.error = error
+        self.raises = raises
+        self.before_return = before_return
+        self.last_error = None
+        self.unchanged_count = 0
+
+    def safe_crawl(self):
+        if self.before_return:
+            self.before_return()
+        if self.raises:
+            raise RuntimeError(self.error)
+        if self.error:
+            self.last_error = self.error
+            return []
+        return self.products
+
+
+def make_pipeline(client: LocalSupabaseClient) -> CrawlPipeline:
+    scheduler = CrawlScheduler(max_workers=4, pool_size=1, driver_factory=lambda profile=None: None)
+    return CrawlPipeline(SupabaseManager(client=client), scheduler=scheduler)
+
+
+def loaded_banks(client) -> set:
+    return {row['bank_name'] for row in client.tables.get('crawled_loan_products', [])}
+
+
+def bank_results(summary) -> dict:
+    return {bank['bank_name']: bank for bank in summary['banks']}
+
+
+def test_fast_bank_is_loaded_while_slow_bank_is_still_crawling():
+    client = LocalSupabaseClient()
+    seen_while_crawling = threading.Event()
+
+    def wait_for_fast_bank():
+        deadline = time.monotonic() + WAIT_SEC
+        while time.monotonic() < deadline:
+            if 'FAST' in loaded_banks(client):
+                seen_while_crawling.set()
+                return
+            time.sleep(0.01)
+
+    crawlers = [
+        StubCrawler('SLOW', make_products('SLOW', 3), before_return=wait_for_fast_bank),
+        StubCrawler('FAST', make_products('FAST', 2)),
+    ]
+    summary = make_pipeline(client).run(crawlers)
+
+    assert seen_while_crawling.is_set()
+    assert summary['success'] is True
+    # 적재는 끝난 순서대로 기록됨
+    assert [bank['bank_name'] for bank in summary['banks']] == ['FAST', 'SLOW']
+    assert summary['loaded_rows'] == 5 and loaded_banks(client) == {'FAST', 'SLOW'}
+
+
+def test_errors_propagate_to_bank_results_and_summary():
+    client = LocalSupabaseClient()
+    crawlers = [
+        StubCrawler('OK', make_products('OK', 2)),
+        StubCrawler('FAIL', error='목록 페이지 응답 없음'),
+        StubCrawler('CRASH', error='드라이버 종료', raises=True),
+        # 두 번째 상품이 CHECK 제약(fee_waiver_months) 위반 → 그 로우만 실패
+        StubCrawler('PARTIAL', make_products('PARTIAL', 1) + make_products('PARTIAL', 1, product_name='위반',
+                                                                          fee_waiver_months=120)),
+    ]
+    summary = make_pipeline(client).run(crawlers)
+    banks = bank_results(summary)
+
+    assert summary['success'] is False
+    assert (banks['OK']['load_status'], banks['OK']['loaded']) == ('success', 2)
+    assert (banks['FAIL']['crawl_status'], banks['FAIL']['load_status']) == ('failed', 'failed')
+    assert banks['FAIL']['error'] == '목록 페이지 응답 없음'
+    assert banks['CRASH']['load_status'] == 'failed' and banks['CRASH']['error'] == '드라이버 종료'
+    assert (banks['PARTIAL']['load_status'], banks['PARTIAL']['loaded'], banks['PARTIAL']['failed_rows']) == \
+        ('partial', 1, 1)
+    assert summary['failed_rows'] == 1
+
+    logs = {row['bank_name']: row for row in client.tables['crawling_logs']}
+    assert {bank: logs[bank]['status'] for bank in logs} == {
+        'OK': 'success', 'FAIL': 'failed', 'CRASH': 'failed', 'PARTIAL': 'partial'
+    }
+    assert logs['FAIL']['error_message'] == '목록 페이지 응답 없음'
+
+
+def test_no_banks_is_not_success():
+    summary = make_pipeline(LocalSupabaseClient()).run([])
+
+    assert summary['banks'] == []
+    assert summary['success'] is False
@@ -0,0 +1,102 @@
+"""
+ProductCache 테스트 (가짜 시계 주입)
+- TTL 만료, 최대 개수 초과 시 LRU 제거, 상품 적재 성공 시 무효화, 스냅샷 콜드 스타트
+"""
+from ..local_client import LocalSupabaseClient
+from ..product_cache import ProductCache
+from ..supabase_client import SupabaseManager
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def product(bank_name: str, product_name: str = '상품', base_rate: float = 4.0) -> dict:
+    return {
+        'bank_name': bank_name, 'product_name': product_name, 'product_type': '신용대출',
+        'base_rate': base_rate, 'additional_rate': 0.5, 'max_limit': 50000000,
+        'early_repay_fee_rate': 1.5, 'fee_waiver_months': 36, 'salary_transfer_discount': 0.3
+    }
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = ProductCache(ttl_sec=60, max_entries=10, clock=clock)
+    cache.put('KB', [product('KB')])
+
+    clock.now += 60
+    assert cache.get('KB') == [product('KB')]
+    clock.now += 0.001
+    assert cache.get('KB') is None
+    assert cache.summary()['entries'] == 0
+    assert (cache.stats['hits'], cache.stats['misses']) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ProductCache(ttl_sec=60, max_entries=2, clock=FakeClock())
+    cache.put('KB', [product('KB')])
+    cache.put('신한', [product('신한')])
+    assert cache.get('KB') is not None     # KB가 최근 사용 → 신한이 가장 오래됨
+
+    cache.put(None, [product('KB'), product('신한')])
+
+    assert cache.get('신한') is None
+    assert cache.get('KB') is not None and cache.get(None) is not None
+    assert cache.stats['evictions'] == 1
+
+
+def test_get_or_load_does_not_cache_failed_lookups():
+    cache = ProductCache(ttl_sec=60, max_entries=10, clock=FakeClock())
+    assert cache.get_or_load('KB', lambda: None) == []
+    assert cache.get_or_load('KB', lambda: [product('KB')]) == [product('KB')]
+    assert cache.get_or_load('KB', lambda: []) == [product('KB')]
+
+
+def test_successful_upsert_invalidates_cache():
+    client = LocalSupabaseClient()
+    cache = ProductCache(ttl_sec=3600, max_entries=10, clock=FakeClock())
+    supabase = SupabaseManager(client=client, product_cache=cache)
+    supabase.bulk_upsert_loan_products([product('KB', base_rate=4.0)])
+
+    assert [row['base_rate'] for row in supabase.get_latest_products('KB')] == [4.0]
+    requests = client.request_count
+    assert [row['base_rate'] for row in supabase.get_latest_products('KB')] == [4.0]
+    assert client.request_count == requests  # 두 번째 조회는 캐시 적중
+
+    supabase.bulk_upsert_loan_products([product('KB', base_rate=3.5)])
+
+    assert cache.stats['invalidations'] == 2
+    assert [row['base_rate'] for row in supabase.get_latest_products('KB')] == [3.5]
+
+
+def test_failed_upsert_keeps_cache():
+    cache = ProductCache(ttl_sec=3600, max_entries=10, clock=FakeClock())
+    supabase = SupabaseManager(client=LocalSupabaseClient(), product_cache=cache)
+    cache.put('KB', [product('KB')])
+
+    # CHECK 제약 위반으로 적재된 로우가 없으면 캐시를 비우지 않음
+    supabase.bulk_upsert_loan_products([product('KB', base_rate=99.0)])
+
+    assert cache.stats['invalidations'] == 0
+    assert cache.get('KB') == [product('KB')]
+
+
+def test_snapshot_restores_only_fresh_entries(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / 'product_cache.json'
+    cache = ProductCache(ttl_sec=60, max_entries=10, snapshot_path=path, clock=clock)
+    cache.put('KB', [product('KB')])
+    clock.now += 30
+    cache.put('신한', [product('신한')])
+
+    clock.now += 45   # KB는 75초, 신한은 45초 경과
+    restored = ProductCache(ttl_sec=60, max_entries=10, snapshot_path=path, clock=clock)
+    assert restored.get('KB') is None
+    assert restored.get('신한') == [product('신한')]
+
+    restored.invalidate()
+    assert not path.exists()
@@ -0,0 +1,126 @@
+"""
+원본 아카이브 재처리 테스트 (임시 raw_data + LocalSupabaseClient + 임시 금리 이력)
+- 재처리 적재도 파이프라인처럼 금리 이력과 비교/기록해야 다음 수집이 옛 상태와 비교하지 않습니다.
+- 선택한 범위에 가장 최근 보관 실행이 없으면 운영 테이블을 건드리지 않습니다. (--load-live로 강제)
+- 이력/스냅샷은 실행마다 그 실행 시각으로 다시 만들어야 합니다.
+"""
+import pytest
+
+from ..archive import RawArchiveWriter
+from ..config import CrawlingConfig
+from ..local_client import LocalSupabaseClient
+from ..rate_history import RateHistoryStore, product_key
+from ..replay import parse_date, replay
+from ..supabase_client import SupabaseManager
+
+PRODUCT = 'KB 직장인든든 신용대출'
+
+
+def product(base_rate: float, product_name: str = PRODUCT) -> dict:
+    """이미 파싱된 형태의 원본 레코드 (기존 백업과 같은 형태)"""
+    return {
+        'bank_name': 'KB', 'product_name': product_name, 'product_type': '신용대출',
+        'base_rate': base_rate, 'additional_rate': 1.0, 'max_limit': 100000000,
+        'early_repay_fee_rate': 0.7, 'fee_waiver_months': 36, 'salary_transfer_discount': 0.3
+    }
+
+
+@pytest.fixture
+def archive_root(tmp_path):
+    """1월/2월 두 번의 실행 (2월에 금리 변경)"""
+    root = tmp_path / 'raw_data'
+    for run_id, rate in (('20260115_030000', 4.0), ('20260215_030000', 4.5)):
+        with RawArchiveWriter(run_id, root=root) as archive:
+            archive.write('KB', product(rate))
+            archive.write('KB', product(5.0, 'KB 주택담보대출'))
+    return root
+
+
+@pytest.fixture
+def supabase():
+    return SupabaseManager(client=LocalSupabaseClient())
+
+
+@pytest.fixture(autouse=True)
+def history_enabled(monkeypatch):
+    monkeypatch.setattr(CrawlingConfig, 'RATE_HISTORY_ENABLED', True)
+
+
+def live_rates(supabase) -> dict:
+    return {row['product_name']: row['base_rate'] for row in supabase.client.tables.get('crawled_loan_products', [])}
+
+
+def test_replay_records_history_for_loaded_products(archive_root, supabase, tmp_path):
+    history_root = tmp_path / 'rate_history'
+    # 운영 수집이 잘못 파싱한 값(3.9)으로 이력을 남겨 둔 상태
+    stale = RateHistoryStore(history_root)
+    stale.commit(stale.diff([product(3.9)], ts='2026-02-15T03:00:00')[0])
+
+    summary = replay([str(archive_root)], history_root=history_root, supabase=supabase)
+
+    assert summary['failed'] == 0 and summary['loaded'] == 2
+    assert live_rates(supabase) == {PRODUCT: 4.5, 'KB 주택담보대출': 5.0}
+    history = RateHistoryStore(history_root)
+    assert history.state[product_key('KB', PRODUCT)]['base_rate'] == 4.5
+    # 다음 수집이 옛 값(3.9)을 다시 가져오면 변경으로 감지되어 운영 테이블이 다시 적재됨
+    assert history.diff([product(3.9)])[1] != []
+    # 재처리 값과 같으면 다시 적재하지 않음
+    assert history.diff([product(4.5)])[1] == []
+    # 잘못된 이벤트는 실행별 이벤트로 교체됨
+    events = history.product_history('KB', PRODUCT)
+    assert [(event['ts'], event['changes']['base_rate']) for event in events] == [
+        ('2026-01-15T03:00:00', 4.0), ('2026-02-15T03:00:00', 4.5)
+    ]
+    assert history.state_at('2026-01-31')[product_key('KB', PRODUCT)]['base_rate'] == 4.0
+
+
+def test_replay_with_past_until_leaves_live_table_alone(archive_root, supabase, tmp_path):
+    summary = replay([str(archive_root)], until=parse_date('2026-01-31', end_of_day=True),
+                     history_root=tmp_path / 'rate_history', supabase=supabase)
+
+    assert summary['cleaned'] == 2
+    assert live_rates(supabase) == {}
+    # 운영 이력은 그대로, 과거 범위 이력은 별도 저장소에 기록
+    assert RateHistoryStore(tmp_path / 'rate_history').state == {}
+    replayed = RateHistoryStore(tmp_path / 'rate_history_replay' / '20260115_030000-20260115_030000')
+    assert replayed.state[product_key('KB', PRODUCT)]['base_rate'] == 4.0
+
+
+def test_load_live_forces_past_range_into_live_table(archive_root, supabase, tmp_path):
+    summary = replay([str(archive_root)], until=parse_date('2026-01-31', end_of_day=True), load_live=True,
+                     history_root=tmp_path / 'rate_history', supabase=supabase)
+
+    assert summary['loaded'] == 2
+    assert live_rates(supabase)[PRODUCT] == 4.0
+    assert RateHistoryStore(tmp_path / 'rate_history').state[product_key('KB', PRODUCT)]['base_rate'] == 4.0
+
+
+def test_replace_events_keeps_other_banks_in_time_order(tmp_path):
+    history = RateHistoryStore(tmp_path / 'rate_history', checkpoint_every=1)
+    other = dict(product(3.0), bank_name='신한')
+    history.commit(history.diff([product(3.9)], ts='2026-01-01T00:00:00')[0])
+    history.commit(history.diff([product(4.1), other], ts='2026-02-01T00:00:00')[0])
+
+    rebuilt = history.diff([product(4.2)], ts='2026-01-15T00:00:00')[0]
+    history.replace_events('2026-01-15T00:00:00', rebuilt, banks=['KB'])
+
+    reloaded = RateHistoryStore(tmp_path / 'rate_history')
+    assert [event['ts'] for event in reloaded.iter_events()] == [
+        '2026-01-01T00:00:00', '2026-01-15T00:00:00', '2026-02-01T00:00:00'
+    ]
+    assert reloaded.state[product_key('KB', PRODUCT)]['base_rate'] == 4.2
+    assert reloaded.state[product_key('신한', PRODUCT)]['base_rate'] == 3.0
+    assert reloaded.state_at('2026-01-10')[product_key('KB', PRODUCT)]['base_rate'] == 3.9
+
+
+def test_replay_writes_snapshot_per_run(archive_root, supabase, tmp_path, monkeypatch):
+    pytest.importorskip('pyarrow')
+    monkeypatch.setattr(CrawlingConfig, 'SNAPSHOT_STORE_ENABLED', True)
+
+    summary = replay([str(archive_root)], history_root=tmp_path / 'rate_history',
+                     snapshot_root=tmp_path / 'snapshots', supabase=supabase)
+
+    assert summary['snapshots'] == 2
+    assert sorted(path.name for path in (tmp_path / 'snapshots').iterdir()) == [
+        'snapshot_date=2026-01-15', 'snapshot_date=2026-02-15'
+    ]
@@ -0,0 +1,142 @@
+"""
+WebDriverPool 테스트 (가짜 드라이버 생성기, 브라우저 없음)
+- 여러 스레드가 여러 프로필로 동시에 빌려도 살아 있는 세션 수가 size를 넘지 않아야 합니다.
+- 풀이 가득 차면 다른 프로필의 대기 세션을 종료(생성기 자원 반납 포함)하고 그 자리에 새로 만듭니다.
+"""
+import random
+import threading
+import time
+
+import pytest
+
+from ..scheduler import WebDriverPool
+
+
+class FakeDriver:
+    def __init__(self, factory: 'FakeFactory', profile):
+        self.factory = factory
+        self.profile = profile
+        self.quit_called = False
+
+    def delete_all_cookies(self):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+        self.factory.closed()
+
+
+class FakeFactory:
+    """생성된 세션 수를 세는 생성기 (생성 지연으로 경쟁 구간을 넓힘)"""
+
+    def __init__(self, delay: float = 0.0, fail_first: int = 0):
+        self.delay = delay
+        self.fail_first = fail_first
+        self.live = 0
+        self.max_live = 0
+        self.created = []
+        self.released = []
+        self._lock = threading.Lock()
+
+    def __call__(self, profile=None) -> FakeDriver:
+        with self._lock:
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                raise RuntimeError('Chrome 시작 실패')
+            self.live += 1
+            self.max_live = max(self.max_live, self.live)
+        time.sleep(self.delay)
+        driver = FakeDriver(self, profile)
+        with self._lock:
+            self.created.append(driver)
+        return driver
+
+    def closed(self):
+        with self._lock:
+            self.live -= 1
+
+    def release(self, driver):
+        self.released.append(driver)
+
+
+def test_concurrent_acquire_never_exceeds_size():
+    factory = FakeFactory(delay=0.002)
+    pool = WebDriverPool(3, factory, acquire_timeout=10)
+    in_use, errors = set(), []
+    in_use_lock = threading.Lock()
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        try:
+            for _ in range(25):
+                profile = rng.choice(['KB', '신한', '우리', None])
+                driver = pool.acquire(profile)
+                with in_use_lock:
+                    assert id(driver) not in in_use, '같은 세션을 두 스레드가 동시에 사용'
+                    assert driver.profile == profile, '다른 프로필의 세션을 재사용'
+                    in_use.add(id(driver))
+                time.sleep(rng.random() / 1000)
+                with in_use_lock:
+                    in_use.discard(id(driver))
+                pool.release(driver, discard=rng.random() < 0.1)
+        except Exception as e:  # 스레드 안의 실패를 메인 스레드로 전달
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pool.close()
+
+    assert errors == []
+    assert factory.max_live <= 3
+    # 프로필이 4개라 교체(종료 후 생성)가 실제로 일어났어야 의미 있는 테스트
+    assert len(factory.created) > 3
+    assert factory.live == 0
+    assert len(factory.released) == len(factory.created)
+
+
+def test_full_pool_evicts_idle_session_of_another_profile():
+    factory = FakeFactory()
+    pool = WebDriverPool(2, factory)
+    kb, shinhan = pool.acquire('KB'), pool.acquire('신한')
+    pool.release(kb)
+    pool.release(shinhan)
+
+    woori = pool.acquire('우리')
+
+    assert woori.profile == '우리'
+    assert kb.quit_called and factory.released == [kb]
+    assert factory.live == 2
+    # 남아 있는 신한 세션은 그대로 재사용
+    assert pool.acquire('신한') is shinhan
+    assert len(factory.created) == 3
+
+
+def test_idle_session_of_same_profile_is_reused():
+    factory = FakeFactory()
+    pool = WebDriverPool(2, factory)
+    first = pool.acquire('KB')
+    pool.release(first)
+
+    assert pool.acquire('KB') is first
+    assert len(factory.created) == 1
+
+
+def test_factory_failure_gives_back_the_slot():
+    factory = FakeFactory(fail_first=1)
+    pool = WebDriverPool(1, factory, acquire_timeout=0.1)
+
+    with pytest.raises(RuntimeError):
+        pool.acquire('KB')
+    driver = pool.acquire('KB')
+    assert driver.profile == 'KB' and factory.live == 1
+
+
+def test_acquire_times_out_when_every_session_is_lent():
+    pool = WebDriverPool(1, FakeFactory(), acquire_timeout=0.05)
+    pool.acquire('KB')
+
+    with pytest.raises(TimeoutError):
+        pool.acquire('KB')
@@ -0,0 +1,82 @@
+"""
+NumPy 배치 시뮬레이터 ↔ TS 엔진 정합성 테스트
+- fixtures/simulation_parity.json은 src/tests/simulation-parity.ts가 simulateRefinancing /
+  findBestRefinancingOption으로 만든 결과입니다. (TS 엔진을 바꾸면 다시 생성)
+- 금액은 부동소수점 오차만 허용(1원), 손익분기점/추천 액션/최적 상품은 정확히 같아야 합니다.
+"""
+import json
+import math
+
+import numpy as np
+import pytest
+
+from ..fixture_server import FIXTURE_DIR
+from ..simulation import best_product_indices, js_number, simulate_batch, simulate_pair
+
+TOLERANCE = 1.0
+EXACT_FIELDS = ('break_even_months', 'recommended_action')
+
+
+@pytest.fixture(scope='module')
+def parity():
+    with open(FIXTURE_DIR / 'simulation_parity.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope='module')
+def batch(parity):
+    return simulate_batch(parity['debts'], parity['products'], parity['has_salary_transfer'])
+
+
+def pairs(parity):
+    for i, row in enumerate(parity['results']):
+        for j, expected in enumerate(row):
+            yield i, j, expected
+
+
+def test_batch_matches_ts_engine(parity, batch):
+    mismatches = []
+    for i, j, expected in pairs(parity):
+        if expected is None:
+            # TS에서 예외 → 배치 결과 없음
+            if not math.isnan(batch['net_savings'][i, j]):
+                mismatches.append((i, j, 'valid'))
+            continue
+        for field, value in expected.items():
+            actual = batch[field][i, j]
+            if field in EXACT_FIELDS:
+                if actual != value:
+                    mismatches.append((i, j, field, value, actual))
+            elif abs(actual - value) > TOLERANCE:
+                mismatches.append((i, j, field, value, float(actual)))
+    assert mismatches == []
+
+
+def test_best_product_matches_ts_engine(parity, batch):
+    assert best_product_indices(batch).tolist() == parity['best_product_index']
+
+
+def test_decimal_reference_matches_ts_engine(parity):
+    # --check가 쓰는 스칼라 기준 구현도 TS 결과와 같아야 함
+    for i, j, expected in pairs(parity):
+        actual = simulate_pair(parity['debts'][i], parity['products'][j], parity['has_salary_transfer'][i])
+        if expected is None:
+            assert actual is None
+            continue
+        for field, value in expected.items():
+            if field in EXACT_FIELDS:
+                assert actual[field] == value, (i, j, field)
+            else:
+                assert actual[field] == pytest.approx(value, abs=1e-6), (i, j, field)
+
+
+def test_fixture_covers_every_action_and_invalid_debts(parity):
+    actions = {expected['recommended_action'] for _, _, expected in pairs(parity) if expected}
+    assert actions == {'즉시_대환', '수수료_면제_대기', '현재_유지'}
+    assert any(all(expected is None for expected in row) for row in parity['results'])
+
+
+def test_js_number():
+    assert js_number('') == 0 and js_number(' 4.5 ') == 4.5 and js_number(True) == 1
+    assert js_number('0x10') == 16 and js_number('1e3') == 1000
+    assert all(np.isnan(js_number(value)) for value in ('abc', '1_000', 'nan', '-0x10', []))
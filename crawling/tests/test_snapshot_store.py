@@ -0,0 +1,53 @@
+"""
+정제 상품 스냅샷 저장소 테스트 (pyarrow 필요)
+- 실행 일자/은행 파티션에 실행별 파일 하나씩 쓰고, 다른 실행의 파일은 다시 쓰지 않아야 합니다.
+"""
+from datetime import date, datetime
+
+import pytest
+
+from ..snapshot_store import ProductSnapshotStore
+
+pytest.importorskip('pyarrow')
+
+
+def record(bank_name: str, product_name: str, base_rate: float) -> dict:
+    return {
+        'bank_name': bank_name, 'product_name': product_name, 'product_type': '신용대출', 'base_rate': base_rate,
+        'additional_rate': 0.0, 'max_limit': 10000000, 'early_repay_fee_rate': 1.5, 'fee_waiver_months': 36,
+        'salary_transfer_discount': 0.3,
+    }
+
+
+def test_runs_are_written_to_date_partitions(tmp_path):
+    store = ProductSnapshotStore(tmp_path)
+    store.write([record('KB', 'a', 4.0), record('신한', 'b', 3.5)], run_id='20260201_030000',
+                snapshot_at=datetime(2026, 2, 1, 3))
+    first_part = tmp_path / 'snapshot_date=2026-02-01' / 'bank_name=KB' / 'part-20260201_030000.parquet'
+    first_mtime = first_part.stat().st_mtime_ns
+
+    store.write([record('KB', 'a', 4.1)], run_id='20260202_030000', snapshot_at=datetime(2026, 2, 2, 3))
+    store.write([record('KB', 'a', 4.2)], run_id='20260201_150000', snapshot_at=datetime(2026, 2, 1, 15))
+
+    parts = sorted(str(path.relative_to(tmp_path)) for path in tmp_path.rglob('*.parquet'))
+    assert len(parts) == 4
+    assert all(part.startswith('snapshot_date=2026-02-0') for part in parts)
+    # 같은 날 다른 실행이 써도 기존 파일은 다시 쓰지 않음
+    assert first_part.stat().st_mtime_ns == first_mtime
+
+    table = store.scan(bank_name='KB', since='2026-02-01', until='2026-02-01')
+    assert sorted(table.column('base_rate').to_pylist()) == [4.0, 4.2]
+    assert set(table.column('snapshot_date').to_pylist()) == {date(2026, 2, 1)}
+    assert store.scan(bank_name='신한').column('product_name').to_pylist() == ['b']
+    assert store.scan(since='2026-02-02').column('base_rate').to_pylist() == [4.1]
+
+
+def test_rewriting_a_run_replaces_its_file(tmp_path):
+    store = ProductSnapshotStore(tmp_path)
+    snapshot_at = datetime(2026, 2, 1, 3)
+    store.write([record('KB', 'a', 4.0)], run_id='20260201_030000', snapshot_at=snapshot_at)
+    store.write([record('KB', 'a', 4.0), record('KB', 'b', 5.0)], run_id='20260201_030000', snapshot_at=snapshot_at)
+
+    table = store.scan(bank_name='KB')
+    assert sorted(table.column('product_name').to_pylist()) == ['a', 'b']
+    assert len(list(tmp_path.rglob('*.parquet'))) == 1
@@ -0,0 +1,153 @@
+"""
+요청 제어 테스트 (가짜 시계 주입, 실제 대기 없음)
+- 토큰 버킷: 간격/버스트, 빠른 응답이면 간격 축소, 느린 응답/오류면 확대 (하한/상한 유지)
+- 서킷 브레이커: closed → open → half_open(시험 요청 1개) → closed / 다시 open
+- 재시도 대기: 지수 백오프 + 지터 범위, 상한
+"""
+import random
+
+import pytest
+
+from ..config import CrawlingConfig
+from ..throttle import AdaptiveRateLimiter, CircuitBreaker, CircuitOpenError, retry_delay
+
+
+class FakeClock:
+    """sleep()이 시계를 앞당기는 가짜 monotonic 시계"""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_limiter(clock, delay=1.0, burst=2) -> AdaptiveRateLimiter:
+    return AdaptiveRateLimiter(delay, min_delay=0.5, max_delay=4.0, burst=burst, clock=clock, sleep=clock.sleep)
+
+
+def test_token_bucket_spaces_requests_and_allows_burst_after_idle(clock):
+    limiter = make_limiter(clock)
+
+    assert limiter.wait() == 0.0          # 첫 요청은 바로
+    assert limiter.wait() == 1.0          # 이후는 간격만큼 대기
+    assert limiter.wait() == 1.0
+    assert clock.sleeps == [1.0, 1.0]
+
+    clock.now += 10                       # 쉬는 동안 버킷 크기(2)까지만 충전
+    assert [limiter.wait() for _ in range(3)] == [0.0, 0.0, 1.0]
+
+
+def test_fast_responses_shrink_delay_down_to_min(clock):
+    limiter = make_limiter(clock)
+    fast = CrawlingConfig.THROTTLE_FAST_SEC / 2
+
+    limiter.record(fast)
+    assert limiter.delay == pytest.approx(1.0 * CrawlingConfig.THROTTLE_SPEEDUP)
+    for _ in range(20):
+        limiter.record(fast)
+    assert limiter.delay == 0.5
+
+    # 보통 속도 응답은 간격을 바꾸지 않음
+    limiter.record((CrawlingConfig.THROTTLE_FAST_SEC + CrawlingConfig.THROTTLE_SLOW_SEC) / 2)
+    assert limiter.delay == 0.5
+
+
+def test_slow_responses_and_errors_grow_delay_up_to_max(clock):
+    limiter = make_limiter(clock)
+
+    limiter.record(CrawlingConfig.THROTTLE_SLOW_SEC + 1)
+    assert limiter.delay == pytest.approx(1.0 * CrawlingConfig.THROTTLE_BACKOFF)
+    limiter.record(0.1, ok=False)         # 빠르더라도 오류면 확대
+    assert limiter.delay == 4.0
+    limiter.record(0.1, ok=False)
+    assert limiter.delay == 4.0
+
+    # 늘어난 간격이 다음 대기에 반영됨
+    limiter.wait()
+    assert limiter.wait() == 4.0
+
+
+def test_zero_delay_limiter_never_sleeps(clock):
+    limiter = AdaptiveRateLimiter(0.0, min_delay=0.0, max_delay=0.0, clock=clock, sleep=clock.sleep)
+    assert [limiter.wait() for _ in range(5)] == [0.0] * 5
+    limiter.record(0.1, ok=False)
+    assert limiter.delay == 0.0 and clock.sleeps == []
+
+
+def test_circuit_opens_after_threshold_and_probes_once_after_cooldown(clock):
+    breaker = CircuitBreaker('KB', failure_threshold=3, cooldown_sec=120, clock=clock)
+
+    for _ in range(2):
+        breaker.record_failure()
+        breaker.check()                   # 임계값 전에는 통과
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    clock.now += 119.9
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    clock.now += 0.1
+    breaker.check()                       # 시험 요청 하나만 통과
+    assert breaker.state == 'half_open'
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    breaker.record_success()
+    assert (breaker.state, breaker.failures) == ('closed', 0)
+    breaker.check()
+    breaker.check()
+
+
+def test_failed_probe_reopens_circuit_for_a_full_cooldown(clock):
+    breaker = CircuitBreaker('KB', failure_threshold=1, cooldown_sec=60, clock=clock)
+    breaker.record_failure()
+    clock.now += 60
+    breaker.check()
+
+    breaker.record_failure()              # 시험 요청 실패 → 다시 open, 대기 시간 새로 시작
+    assert breaker.state == 'open'
+    clock.now += 59
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    clock.now += 1
+    breaker.check()
+    assert breaker.state == 'half_open'
+
+
+class FixedRandom(random.Random):
+    def __init__(self, value: float):
+        super().__init__()
+        self.value = value
+
+    def uniform(self, a: float, b: float) -> float:
+        return a + (b - a) * self.value
+
+
+def test_retry_delay_is_exponential_with_jitter_and_capped():
+    config = CrawlingConfig()
+    base, cap = config.RETRY_BACKOFF_BASE, config.RETRY_BACKOFF_MAX
+
+    low, high = FixedRandom(0.0), FixedRandom(1.0)
+    for attempt in (1, 2, 3):
+        expected = min(cap, base * 2 ** (attempt - 1))
+        assert retry_delay(attempt, config, rng=low) == pytest.approx(expected * 0.5)
+        assert retry_delay(attempt, config, rng=high) == pytest.approx(expected * 1.5)
+    assert retry_delay(20, config, rng=high) == pytest.approx(cap * 1.5)
+
+    # 같은 시드면 같은 대기 시간 (지터는 rng에서만 나옴)
+    assert [retry_delay(2, config, rng=random.Random(7)) for _ in range(3)] == \
+        [retry_delay(2, config, rng=random.Random(7)) for _ in range(3)]
@@ -0,0 +1,68 @@
+"""
+작업 큐 모드 테스트 (픽스처 서버 + LocalSupabaseClient)
+- queue run / queue merge에 --queue로 기본이 아닌 큐 경로를 주면, 워커와 병합 단계가 같은 큐 DB를 읽어야 합니다.
+"""
+import pytest
+
+from .. import cli, offer_index, supabase_client, work_queue
+from ..config import CrawlingConfig
+from ..local_client import LocalSupabaseClient
+from ..work_queue import QueueCoordinator, QueueWorker, WorkQueue
+
+RUN_ID = '20260301_030000'
+
+
+@pytest.fixture
+def local_run(monkeypatch, tmp_path, offline_config):
+    """main()이 로컬 클라이언트와 임시 디렉터리만 쓰도록 설정하고, 적재된 테이블을 돌려줌"""
+    client = LocalSupabaseClient()
+    monkeypatch.setenv('SUPABASE_URL', 'http://localhost')
+    monkeypatch.setattr(supabase_client.SupabaseManager, '__init__',
+                        lambda self: setattr(self, 'client', client) or setattr(self, 'product_cache', None))
+    monkeypatch.setattr(work_queue, 'RAW_DATA_DIR', tmp_path / 'raw_data')
+    monkeypatch.setattr(offer_index, 'DEFAULT_INDEX_DIR', tmp_path / 'offer_index')
+    for name in ('DETAIL_ENABLED', 'RATE_HISTORY_ENABLED', 'SNAPSHOT_STORE_ENABLED', 'METRICS_ENABLED'):
+        monkeypatch.setattr(CrawlingConfig, name, False)
+    return client
+
+
+def run_workers(fixture_server, queue_path, run_id: str = RUN_ID) -> str:
+    """로컬 워커 대신 같은 프로세스에서 픽스처 서버 목록을 수집 (run_local과 같은 큐 경로 사용)"""
+    queue = WorkQueue(queue_path)
+    queue.enqueue(run_id, [('KB', '신용대출', fixture_server.url_for('kb_credit.html')),
+                           ('KB', '담보대출', fixture_server.url_for('kb_mortgage.html'))])
+    stats = QueueWorker(queue, run_id).run()
+    assert stats['done'] == 2
+    return run_id
+
+
+def loaded_banks(client) -> set:
+    return {row['bank_name'] for row in client.tables.get('crawled_loan_products', [])}
+
+
+def test_queue_merge_reads_the_given_queue(fixture_server, local_run, tmp_path):
+    queue_path = tmp_path / 'custom' / 'queue.sqlite3'
+    run_workers(fixture_server, queue_path)
+
+    exit_code = cli.main(['queue', '--queue', str(queue_path), 'merge', '--run-id', RUN_ID, '--timeout', '0'])
+
+    assert exit_code == 0
+    assert loaded_banks(local_run) == {'KB'}
+    assert len(local_run.tables['crawled_loan_products']) == 15
+    assert QueueCoordinator(WorkQueue(queue_path), RUN_ID).banks() == ['KB']
+
+
+def test_queue_run_merges_from_the_given_queue(fixture_server, local_run, tmp_path, monkeypatch):
+    queue_path = tmp_path / 'custom' / 'queue.sqlite3'
+    used_paths = []
+
+    def fake_run_local(banks, workers, path, run_id, log_level):
+        used_paths.append(path)
+        return run_workers(fixture_server, path)
+
+    monkeypatch.setattr(work_queue, 'run_local', fake_run_local)
+    exit_code = cli.main(['queue', '--queue', str(queue_path), 'run'])
+
+    assert exit_code == 0
+    assert used_paths == [queue_path]
+    assert len(local_run.tables['crawled_loan_products']) == 15
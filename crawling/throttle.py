@@ -0,0 +1,146 @@
+"""
+은행 호스트별 적응형 요청 제어 (Adaptive Throttle)
+- AdaptiveRateLimiter: 토큰 버킷. 응답이 빠르면 요청 간격을 줄이고, 느리거나 오류가 나면 늘립니다.
+    빠른 응답(THROTTLE_FAST_SEC 미만)  -> 간격 × THROTTLE_SPEEDUP (THROTTLE_MIN_DELAY까지)
+    느린 응답(THROTTLE_SLOW_SEC 초과) / 오류 -> 간격 × THROTTLE_BACKOFF (THROTTLE_MAX_DELAY까지)
+  시작 간격은 은행별 BANK_CRAWL_DELAY > CRAWL_DELAY 입니다.
+- CircuitBreaker: 연속 실패가 CIRCUIT_FAILURE_THRESHOLD회 이상이면 CIRCUIT_COOLDOWN_SEC 동안 요청을 바로 거절(open)하고,
+  대기 후 시험 요청 하나만 통과시켜(half-open) 성공하면 다시 정상(closed)으로 돌아갑니다.
+  (은행 사이트 장애 시 대상 페이지마다 타임아웃을 기다리지 않고 곧바로 실패)
+"""
+import logging
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+from .config import CrawlingConfig
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷 브레이커가 열려 요청을 보내지 않음 (재시도하지 않음)"""
+
+
+def retry_delay(attempt: int, config: CrawlingConfig = None, rng: Optional[random.Random] = None) -> float:
+    """재시도 대기 시간 (지수 백오프 + 지터, attempt는 1부터)"""
+    config = config or CrawlingConfig()
+    delay = min(config.RETRY_BACKOFF_MAX, config.RETRY_BACKOFF_BASE * (2 ** (attempt - 1)))
+    return delay * (rng or random).uniform(0.5, 1.5)
+
+
+class AdaptiveRateLimiter:
+    """응답 속도에 따라 간격이 바뀌는 토큰 버킷 (스레드 안전)"""
+
+    def __init__(self, delay: float, min_delay: Optional[float] = None, max_delay: Optional[float] = None,
+                 burst: Optional[int] = None, config: CrawlingConfig = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.config = config or CrawlingConfig()
+        self.delay = max(0.0, float(delay))
+        # 시작 간격보다 느슨한 하한/상한은 쓰지 않음
+        self.min_delay = min(self.delay, self.config.THROTTLE_MIN_DELAY if min_delay is None else min_delay)
+        self.max_delay = max(self.delay, self.config.THROTTLE_MAX_DELAY if max_delay is None else max_delay)
+        self.burst = max(1, burst or self.config.THROTTLE_BURST)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        # 첫 요청은 바로 보내고, 이후는 간격마다 토큰 1개씩 충전
+        self._tokens = 1.0
+        self._updated = clock()
+
+    def wait(self) -> float:
+        """토큰 하나를 쓸 수 있을 때까지 대기하고, 실제 대기한 시간(초)을 반환"""
+        with self._lock:
+            now = self._clock()
+            if self.delay > 0:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) / self.delay)
+            else:
+                self._tokens = self.burst
+            self._updated = now
+            # 토큰이 모자라면 미리 차감해 두고(음수), 다른 스레드는 그 뒤 순서로 대기
+            self._tokens -= 1
+            wait_for = -self._tokens * self.delay if self._tokens < 0 else 0.0
+        if wait_for > 0:
+            self._sleep(wait_for)
+        return wait_for
+
+    def record(self, elapsed_sec: float, ok: bool = True):
+        """응답 결과로 간격 조정"""
+        with self._lock:
+            previous = self.delay
+            if not ok or elapsed_sec > self.config.THROTTLE_SLOW_SEC:
+                self.delay = min(self.max_delay, max(self.delay, 0.1) * self.config.THROTTLE_BACKOFF)
+            elif elapsed_sec < self.config.THROTTLE_FAST_SEC:
+                self.delay = max(self.min_delay, self.delay * self.config.THROTTLE_SPEEDUP)
+        if self.delay > previous:
+            logger.info(f"🐢 요청 간격 확대: {previous:.2f}초 → {self.delay:.2f}초 (응답 {elapsed_sec:.1f}초, 성공 {ok})")
+
+
+class CircuitBreaker:
+    """연속 실패 시 일정 시간 요청을 차단 (closed -> open -> half_open -> closed)"""
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None, cooldown_sec: Optional[float] = None,
+                 config: CrawlingConfig = None, clock: Callable[[], float] = time.monotonic):
+        config = config or CrawlingConfig()
+        self.name = name
+        self.failure_threshold = failure_threshold or config.CIRCUIT_FAILURE_THRESHOLD
+        self.cooldown_sec = config.CIRCUIT_COOLDOWN_SEC if cooldown_sec is None else cooldown_sec
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = 'closed'
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def check(self):
+        """요청 전 호출. 차단 중이면 CircuitOpenError"""
+        with self._lock:
+            if self.state == 'closed':
+                return
+            remaining = self._opened_at + self.cooldown_sec - self._clock()
+            if self.state == 'open' and remaining <= 0:
+                self.state = 'half_open'
+            if self.state == 'half_open' and not self._probing:
+                # 시험 요청은 하나만 통과
+                self._probing = True
+                return
+        raise CircuitOpenError(
+            f"{self.name} 요청 차단 중 (연속 실패 {self.failures}회, {max(0.0, remaining):.0f}초 후 재시도)"
+        )
+
+    def record_success(self):
+        with self._lock:
+            if self.state != 'closed':
+                logger.info(f"🔌 {self.name} 서킷 복구 (closed)")
+            self.state, self.failures, self._probing = 'closed', 0, False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == 'half_open' or (self.state == 'closed' and self.failures >= self.failure_threshold):
+                self.state = 'open'
+                self._opened_at = self._clock()
+                logger.warning(f"⛔ {self.name} 서킷 차단 (연속 실패 {self.failures}회, {self.cooldown_sec:.0f}초)")
+
+
+class HostThrottle:
+    """은행 호스트 하나의 요청 제어 (적응형 토큰 버킷 + 서킷 브레이커)"""
+
+    def __init__(self, name: str, delay: float, config: CrawlingConfig = None):
+        self.name = name
+        self.limiter = AdaptiveRateLimiter(delay, config=config)
+        self.breaker = CircuitBreaker(name, config=config)
+
+    def wait(self) -> float:
+        """차단 중이면 CircuitOpenError, 아니면 다음 요청 가능 시점까지 대기"""
+        self.breaker.check()
+        return self.limiter.wait()
+
+    def record(self, elapsed_sec: float, ok: bool = True):
+        self.limiter.record(elapsed_sec, ok)
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
@@ -0,0 +1,543 @@
+"""
+작업 큐 모드 (Work Queue / Lease)
+- 수집 계획(은행 × 상품 유형 × 목록 페이지)을 내구성 있는 큐(SQLite)에 작업 단위로 넣고,
+  여러 워커 프로세스가 작업을 임대(lease)해 KBCrawler.crawl_target(url, p_type) 단위로 나눠 수집합니다.
+    pending --lease--> leased --complete--> done
+                         |--fail/임대 만료--> pending (attempts < QUEUE_MAX_ATTEMPTS, 백오프 후) / failed
+- 워커는 작업 중 QUEUE_HEARTBEAT_SEC마다 임대를 연장합니다. 프로세스가 죽어 임대가 만료되면 다음 lease 때 다시 대기 상태가 됩니다.
+- 원본 레코드는 시도(attempt)마다 별도 파일(raw_data/<run_id>/tasks/<task>-a<attempt>.jsonl.gz)에 기록하고,
+  임대를 계속 가진 시도만 complete로 결과 파일을 등록합니다. (임대를 잃은 늦은 워커의 결과는 무시되어 재시도가 중복을 만들지 않음)
+- 코디네이터(QueueCoordinator)는 완료된 작업의 결과 파일을 은행별 아카이브 세그먼트(raw_data/<run_id>/<bank>.jsonl.gz)로
+  병합하고, CrawlScheduler 대신 CrawlPipeline에 결과를 넘겨 기존과 같은 정제 → 적재 단계를 탑니다.
+  병합은 여러 번 실행해도 같은 결과입니다. (세그먼트를 작업 결과로부터 다시 만듦)
+- 작업 큐 모드에서는 변경 감지 지문(FingerprintStore)을 쓰지 않습니다. (파일 하나를 여러 프로세스가 갱신할 수 없음)
+  바뀌지 않은 상품의 재적재는 금리 이력 비교(RATE_HISTORY_ENABLED)가 걸러냅니다.
+- SQLite 큐는 한 서버 안의 프로세스용 참조 구현입니다. 여러 서버로 나눌 때는 같은 lease/heartbeat/complete/fail
+  의미를 가진 공유 큐와 공유 raw_data 저장소를 사용해야 합니다. (네트워크 파일시스템 위의 SQLite 잠금은 믿을 수 없음)
+
+사용 예:
+    python -m crawling queue run --workers 4                 # 계획 등록 → 로컬 워커 4개 → 병합/적재
+    python -m crawling queue enqueue --bank KB               # 계획만 등록 (run_id 출력)
+    python -m crawling queue work --run-id 20260212_113110   # 워커 하나 실행 (다른 터미널/서버에서 여러 개)
+    python -m crawling queue merge --run-id 20260212_113110  # 남은 작업을 기다린 뒤 병합/정제/적재
+"""
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing, contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .archive import (
+    INDEX_FILE, RAW_DATA_DIR, RUN_ID_FORMAT, RawArchiveWriter, SegmentWriter, _SEGMENT_SUFFIX, iter_segment,
+    resolve_compression
+)
+from .config import CrawlingConfig
+from .metrics import METRICS
+from .throttle import CircuitOpenError, HostThrottle, retry_delay
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = Path(__file__).resolve().parent / 'state' / 'work_queue.sqlite3'
+TASK_DIR = 'tasks'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    bank_name TEXT NOT NULL,
+    product_type TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    result_path TEXT,
+    record_count INTEGER,
+    product_count INTEGER,
+    elapsed_sec REAL,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (run_id, bank_name, product_type, url)
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_claim ON tasks (status, available_at, id);
+"""
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+def plan_tasks(banks: Optional[List[str]] = None) -> List[Tuple[str, str, str]]:
+    """수집 계획: 은행별 크롤러의 targets를 (은행 코드, 상품 유형, 목록 URL) 작업으로 펼침"""
+    from .bank_crawlers import BANK_CRAWLERS
+
+    tasks = []
+    for code in banks or CrawlingConfig.TARGET_BANKS:
+        if code not in BANK_CRAWLERS:
+            logger.warning(f"등록되지 않은 은행 코드는 건너뜁니다: {code}")
+            continue
+        for url, p_type in BANK_CRAWLERS[code]().targets:
+            tasks.append((code, p_type, url))
+    return tasks
+
+
+class WorkQueue:
+    """
+    SQLite 작업 큐 (프로세스/스레드 안전: 호출마다 연결을 새로 열고, 임대는 BEGIN IMMEDIATE로 직렬화)
+    임대 토큰은 (task id, lease_owner, attempts)이며, 토큰이 맞지 않는 heartbeat/complete/fail은 무시됩니다.
+    """
+
+    def __init__(self, path: Optional[Path] = None, config: CrawlingConfig = None):
+        self.config = config or CrawlingConfig()
+        self.path = Path(path or self.config.QUEUE_PATH or DEFAULT_QUEUE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as db:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return db
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        db = self._connect()
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            yield db
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        finally:
+            db.close()
+
+    def enqueue(self, run_id: str, tasks: List[Tuple[str, str, str]]) -> int:
+        """작업 등록 (같은 실행의 같은 작업은 한 번만 등록됨), 새로 등록한 수 반환"""
+        now = time.time()
+        with self._transaction() as db:
+            before = db.total_changes
+            db.executemany(
+                "INSERT OR IGNORE INTO tasks (run_id, bank_name, product_type, url, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id, bank_name, p_type, url, now, now) for bank_name, p_type, url in tasks]
+            )
+            return db.total_changes - before
+
+    def lease(self, worker_id: str, run_id: Optional[str] = None, lease_sec: Optional[float] = None) -> Optional[Dict]:
+        """대기 중인 작업 하나를 임대 (없으면 None). 만료된 임대는 먼저 대기 상태로 되돌림"""
+        lease_sec = lease_sec or self.config.QUEUE_LEASE_SEC
+        now = time.time()
+        with self._transaction() as db:
+            self._requeue_expired(db, now)
+            query = "SELECT * FROM tasks WHERE status = 'pending' AND available_at <= ?"
+            params: list = [now]
+            if run_id:
+                query += " AND run_id = ?"
+                params.append(run_id)
+            row = db.execute(query + " ORDER BY id LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE tasks SET status = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                (worker_id, now + lease_sec, now, row['id'])
+            )
+        task = dict(row)
+        task.update({'status': 'leased', 'attempts': row['attempts'] + 1, 'lease_owner': worker_id})
+        return task
+
+    def heartbeat(self, task: Dict, lease_sec: Optional[float] = None) -> bool:
+        """임대 연장 (이미 임대를 잃었으면 False)"""
+        lease_sec = lease_sec or self.config.QUEUE_LEASE_SEC
+        now = time.time()
+        with self._transaction() as db:
+            return self._update_leased(db, task, "lease_expires_at = ?, updated_at = ?", (now + lease_sec, now))
+
+    def complete(self, task: Dict, result_path: str, record_count: int, product_count: int,
+                 elapsed_sec: float) -> bool:
+        """결과 파일 등록 후 완료 처리 (임대를 잃었으면 False, 이 시도의 결과는 사용되지 않음)"""
+        now = time.time()
+        with self._transaction() as db:
+            return self._update_leased(
+                db, task,
+                "status = 'done', result_path = ?, record_count = ?, product_count = ?, elapsed_sec = ?, "
+                "error = NULL, lease_owner = NULL, lease_expires_at = NULL, updated_at = ?",
+                (result_path, record_count, product_count, round(elapsed_sec, 3), now)
+            )
+
+    def fail(self, task: Dict, error: str, retry_after: float = 0.0) -> Optional[str]:
+        """
+        실패 처리: 시도 횟수가 남았으면 retry_after초 뒤 다시 대기, 아니면 failed
+        반환: 바뀐 상태 ('pending' | 'failed'), 이미 임대를 잃었으면 None
+        """
+        now = time.time()
+        status = 'failed' if task['attempts'] >= self.config.QUEUE_MAX_ATTEMPTS else 'pending'
+        with self._transaction() as db:
+            updated = self._update_leased(
+                db, task,
+                "status = ?, available_at = ?, error = ?, lease_owner = NULL, lease_expires_at = NULL, updated_at = ?",
+                (status, now + retry_after, error[:2000], now)
+            )
+        return status if updated else None
+
+    @staticmethod
+    def _update_leased(db: sqlite3.Connection, task: Dict, assignments: str, params: tuple) -> bool:
+        cursor = db.execute(
+            f"UPDATE tasks SET {assignments} "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ? AND attempts = ?",
+            params + (task['id'], task['lease_owner'], task['attempts'])
+        )
+        return cursor.rowcount == 1
+
+    def requeue_expired(self) -> int:
+        with self._transaction() as db:
+            return self._requeue_expired(db, time.time())
+
+    def _requeue_expired(self, db: sqlite3.Connection, now: float) -> int:
+        """임대 만료 작업을 대기 상태로 (시도 횟수를 다 쓴 작업은 failed)"""
+        expired = db.execute(
+            "SELECT id, run_id, bank_name, product_type, lease_owner, attempts FROM tasks "
+            "WHERE status = 'leased' AND lease_expires_at < ?", (now,)
+        ).fetchall()
+        for row in expired:
+            status = 'failed' if row['attempts'] >= self.config.QUEUE_MAX_ATTEMPTS else 'pending'
+            db.execute(
+                "UPDATE tasks SET status = ?, error = ?, lease_owner = NULL, lease_expires_at = NULL, "
+                "available_at = ?, updated_at = ? WHERE id = ?",
+                (status, f"임대 만료 (워커 {row['lease_owner']})", now, now, row['id'])
+            )
+            logger.warning(
+                f"⏰ 작업 {row['id']} ({row['bank_name']} {row['product_type']}) 임대 만료 → {status} "
+                f"(시도 {row['attempts']}회, 워커 {row['lease_owner']})"
+            )
+        return len(expired)
+
+    def tasks(self, run_id: str) -> List[Dict]:
+        with closing(self._connect()) as db:
+            rows = db.execute("SELECT * FROM tasks WHERE run_id = ? ORDER BY id", (run_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def counts(self, run_id: Optional[str] = None) -> Dict[str, int]:
+        """상태별 작업 수 (run_id가 없으면 전체 실행)"""
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        query, params = "SELECT status, COUNT(*) AS n FROM tasks", ()
+        if run_id:
+            query, params = query + " WHERE run_id = ?", (run_id,)
+        with closing(self._connect()) as db:
+            for row in db.execute(query + " GROUP BY status", params):
+                counts[row['status']] = row['n']
+        return counts
+
+    def latest_run_id(self) -> Optional[str]:
+        with closing(self._connect()) as db:
+            row = db.execute("SELECT run_id FROM tasks ORDER BY id DESC LIMIT 1").fetchone()
+        return row['run_id'] if row else None
+
+
+class _TaskArchive:
+    """작업 시도 하나의 원본 레코드를 전용 세그먼트에 기록 (crawler.archive 자리에 주입)"""
+
+    def __init__(self, path: Path, compression: str, flush_every: int):
+        self.path = path
+        self.writer = SegmentWriter(path, compression, flush_every)
+
+    def write(self, bank_name: str, record: Dict):
+        self.writer.write(record)
+
+    def close_segment(self, bank_name: str):
+        self.writer.close()
+
+
+class QueueWorker:
+    """
+    작업을 임대해 수집하는 워커 (프로세스당 하나)
+    은행별 크롤러는 작업 사이에 재사용되어 HTTP 세션/드라이버/요청 간격 상태가 이어집니다.
+    """
+
+    def __init__(self, queue: WorkQueue, run_id: Optional[str] = None, worker_id: Optional[str] = None,
+                 archive_root: Optional[Path] = None, config: CrawlingConfig = None, driver_factory=None):
+        self.queue = queue
+        self.run_id = run_id
+        self.worker_id = worker_id or default_worker_id()
+        self.archive_root = Path(archive_root) if archive_root else RAW_DATA_DIR
+        self.config = config or CrawlingConfig()
+        self.compression = resolve_compression()
+        self.driver_factory = driver_factory
+        self._crawlers: Dict[str, object] = {}
+        self.stats = {'done': 0, 'failed': 0, 'retried': 0, 'lost': 0}
+
+    def run(self, max_tasks: Optional[int] = None, wait: bool = False) -> Dict:
+        """
+        작업이 없을 때까지 처리 후 통계 반환
+        wait=False면 대기/임대 중인 작업이 모두 없어질 때 종료 (다른 워커의 만료된 임대도 넘겨받기 위해 그때까지는 대기)
+        """
+        logger.info(f"👷 워커 {self.worker_id} 시작 (실행 {self.run_id or '전체'})")
+        processed = 0
+        try:
+            while max_tasks is None or processed < max_tasks:
+                task = self.queue.lease(self.worker_id, self.run_id)
+                if task is None:
+                    if not wait and self._drained():
+                        break
+                    time.sleep(self.config.QUEUE_POLL_SEC)
+                    continue
+                self.process(task)
+                processed += 1
+        finally:
+            self.close()
+        logger.info(f"👷 워커 {self.worker_id} 종료: {self.stats}")
+        return self.stats
+
+    def _drained(self) -> bool:
+        counts = self.queue.counts(self.run_id)
+        return counts['pending'] + counts['leased'] == 0
+
+    def process(self, task: Dict) -> bool:
+        """작업 하나 수집 (결과 등록에 성공하면 True)"""
+        crawler = self._crawler(task['bank_name'])
+        label = f"작업 {task['id']} {task['bank_name']} [{task['product_type']}] (시도 {task['attempts']})"
+        task_dir = self.archive_root / task['run_id'] / TASK_DIR
+        task_dir.mkdir(parents=True, exist_ok=True)
+        path = task_dir / f"{task['id']}-a{task['attempts']}{_SEGMENT_SUFFIX[self.compression]}"
+        if path.exists():
+            path.unlink()
+
+        archive = _TaskArchive(path, self.compression, self.config.ARCHIVE_FLUSH_EVERY)
+        crawler.archive = archive
+        started = time.perf_counter()
+        logger.info(f"📥 {label} 시작")
+        try:
+            with self._heartbeat(task), METRICS.span('queue_task', bank=task['bank_name']):
+                products = crawler.crawl_target(task['url'], task['product_type'])
+            archive.close_segment(task['bank_name'])
+        except Exception as e:
+            archive.close_segment(task['bank_name'])
+            path.unlink(missing_ok=True)
+            # 실패한 세션은 상태를 신뢰할 수 없으므로 폐기하고 다음 작업에서 새로 준비
+            crawler.teardown_driver(discard=True)
+            retry_after = (self.config.CIRCUIT_COOLDOWN_SEC if isinstance(e, CircuitOpenError)
+                           else retry_delay(task['attempts'], self.config))
+            status = self.queue.fail(task, str(e), retry_after)
+            self.stats['failed' if status == 'failed' else 'retried' if status else 'lost'] += 1
+            METRICS.incr('queue_tasks', bank=task['bank_name'], status=status or 'lost')
+            logger.error(f"❌ {label} 실패 → {status or '임대 상실'}: {e}")
+            return False
+        finally:
+            crawler.archive = None
+
+        elapsed = time.perf_counter() - started
+        if not self.queue.complete(task, path.name, archive.writer.records, len(products), elapsed):
+            # 임대가 만료되어 다른 워커에게 넘어간 작업: 이 시도의 결과 파일은 병합되지 않음
+            path.unlink(missing_ok=True)
+            self.stats['lost'] += 1
+            METRICS.incr('queue_tasks', bank=task['bank_name'], status='lost')
+            logger.warning(f"⚠️ {label} 임대를 잃어 결과를 버립니다. ({elapsed:.1f}초)")
+            return False
+        self.stats['done'] += 1
+        METRICS.incr('queue_tasks', bank=task['bank_name'], status='done')
+        logger.info(f"✅ {label} 완료: {len(products)}건 ({elapsed:.1f}초)")
+        return True
+
+    @contextmanager
+    def _heartbeat(self, task: Dict):
+        """작업 중 주기적으로 임대 연장 (임대를 잃으면 연장을 멈추고 complete에서 거절됨)"""
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(self.config.QUEUE_HEARTBEAT_SEC):
+                try:
+                    if not self.queue.heartbeat(task):
+                        logger.warning(f"⚠️ 작업 {task['id']} 임대를 잃었습니다. (다른 워커에게 재할당됨)")
+                        return
+                except sqlite3.Error as e:
+                    logger.warning(f"하트비트 실패 (다음 주기에 재시도): {e}")
+
+        thread = threading.Thread(target=beat, name=f"heartbeat-{task['id']}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def _crawler(self, bank_name: str):
+        if bank_name not in self._crawlers:
+            from .bank_crawlers import BANK_CRAWLERS
+            crawler = BANK_CRAWLERS[bank_name]()
+            delay = self.config.BANK_CRAWL_DELAY.get(bank_name, self.config.CRAWL_DELAY)
+            crawler.politeness = HostThrottle(bank_name, delay, self.config)
+            if self.driver_factory is not None:
+                crawler._driver_factory = self.driver_factory
+            self._crawlers[bank_name] = crawler
+        return self._crawlers[bank_name]
+
+    def close(self):
+        for crawler in self._crawlers.values():
+            crawler.teardown_driver()
+            if crawler.http_fetcher is not None:
+                crawler.http_fetcher.close()
+                crawler.http_fetcher = None
+        self._crawlers = {}
+
+
+def run_worker_process(queue_path: str, run_id: Optional[str], worker_id: Optional[str] = None,
+                       log_level: int = logging.INFO) -> Dict:
+    """로컬 워커 프로세스 진입점 (queue run이 spawn으로 실행)"""
+    from .main import setup_logging
+    setup_logging(level=log_level)
+    return QueueWorker(WorkQueue(queue_path), run_id, worker_id).run()
+
+
+class QueueCoordinator:
+    """
+    실행 하나의 작업 등록 / 완료 대기 / 결과 병합
+    CrawlPipeline의 scheduler 자리에 넣으면 은행별 병합 결과를 정제/적재 단계로 넘깁니다.
+        CrawlPipeline(supabase, scheduler=coordinator).run(coordinator.banks())
+    """
+
+    def __init__(self, queue: WorkQueue, run_id: Optional[str] = None, archive_root: Optional[Path] = None,
+                 config: CrawlingConfig = None):
+        self.queue = queue
+        self.run_id = run_id or datetime.now().strftime(RUN_ID_FORMAT)
+        self.archive_root = Path(archive_root) if archive_root else RAW_DATA_DIR
+        self.config = config or CrawlingConfig()
+        self.archive: Optional[RawArchiveWriter] = None
+        self.metrics: List[Dict] = []
+
+    def enqueue(self, banks: Optional[List[str]] = None) -> int:
+        tasks = plan_tasks(banks)
+        added = self.queue.enqueue(self.run_id, tasks)
+        logger.info(f"🗂️ 실행 {self.run_id} 작업 {len(tasks)}개 중 {added}개 등록")
+        return added
+
+    def banks(self) -> List[str]:
+        return sorted({task['bank_name'] for task in self.queue.tasks(self.run_id)})
+
+    def wait(self, timeout: Optional[float] = None) -> Dict[str, int]:
+        """대기/임대 중인 작업이 없어질 때까지 대기 (만료된 임대는 그동안 다시 대기 상태로)"""
+        started = time.monotonic()
+        last = None
+        while True:
+            self.queue.requeue_expired()
+            counts = self.queue.counts(self.run_id)
+            if counts != last:
+                logger.info(f"⏳ 실행 {self.run_id} 작업 상태: {counts}")
+                last = counts
+            if counts['pending'] + counts['leased'] == 0:
+                return counts
+            if timeout is not None and time.monotonic() - started > timeout:
+                logger.warning(f"⚠️ {timeout:.0f}초 안에 끝나지 않은 작업이 있습니다: {counts}")
+                return counts
+            time.sleep(self.config.QUEUE_POLL_SEC)
+
+    def iter_results(self, banks: Optional[List[str]] = None) -> Iterator[Dict]:
+        """
+        완료된 작업의 결과 파일을 은행별 아카이브 세그먼트로 병합하고 CrawlScheduler와 같은 형식으로 반환
+        은행 상태: 작업이 하나라도 남아 있거나 모두 실패하면 failed (일부만 실패하면 KBCrawler.crawl처럼 수집분 사용)
+        """
+        from .cleansing import LoanDataCleaner
+
+        self.metrics = []
+        tasks = self.queue.tasks(self.run_id)
+        if banks is None:
+            banks = sorted({task['bank_name'] for task in tasks})
+        self._reset_merged_segments()
+        self.archive = RawArchiveWriter(self.run_id, root=self.archive_root)
+        task_dir = self.archive.run_dir / TASK_DIR
+        run_failed = False
+        try:
+            for bank_name in banks:
+                bank_tasks = [task for task in tasks if task['bank_name'] == bank_name]
+                done = [task for task in bank_tasks if task['status'] == 'done']
+                unfinished = [task for task in bank_tasks if task['status'] != 'done']
+                with METRICS.span('queue_merge', bank=bank_name):
+                    raw_records = []
+                    for task in done:
+                        for record in iter_segment(task_dir / task['result_path']):
+                            self.archive.write(bank_name, record)
+                            raw_records.append(record)
+                    self.archive.close_segment(bank_name)
+                    products = LoanDataCleaner.parse_product_records(raw_records)
+
+                error = None
+                if unfinished:
+                    error = '; '.join(
+                        f"[{task['product_type']}] {task['status']}: {task['error'] or '-'}" for task in unfinished
+                    )
+                    logger.warning(f"⚠️ {bank_name} 미완료 작업 {len(unfinished)}/{len(bank_tasks)}개: {error}")
+                if not bank_tasks or (unfinished and not done):
+                    status = 'failed'
+                    error = error or '등록된 작업 없음'
+                    run_failed = True
+                else:
+                    status, error = ('success' if products else 'empty'), None
+                metrics = {
+                    'bank_name': bank_name,
+                    'status': status,
+                    'product_count': len(products),
+                    'unchanged_count': 0,
+                    'started_at': datetime.fromtimestamp(min(t['created_at'] for t in bank_tasks)).isoformat()
+                    if bank_tasks else None,
+                    'elapsed_sec': round(sum(task['elapsed_sec'] or 0 for task in done), 3),
+                    'error': error
+                }
+                self.metrics.append(metrics)
+                METRICS.incr('products_crawled', len(products), bank=bank_name)
+                logger.info(f"🧩 {bank_name} 작업 {len(done)}개 병합: 원본 {len(raw_records)}건 → 상품 {len(products)}건")
+                yield {'crawler': None, 'bank_name': bank_name, 'products': products, 'metrics': metrics}
+        finally:
+            self.archive.close('failed' if run_failed else 'complete')
+
+    def _reset_merged_segments(self):
+        """이전 병합 결과는 작업 결과로부터 다시 만들므로 삭제 (병합을 다시 실행해도 중복되지 않음)"""
+        index_path = self.archive_root / self.run_id / INDEX_FILE
+        if not index_path.exists():
+            return
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        for segment in index.get('segments', {}).values():
+            (index_path.parent / segment['path']).unlink(missing_ok=True)
+
+    def log_summary(self, wall_clock: float):
+        """은행별 병합 결과 요약 (작업 수집 시간 합계 기준)"""
+        logger.info("📈 은행별 작업 큐 수집 결과")
+        for m in self.metrics:
+            logger.info(f"   - {m['bank_name']}: {m['status']} / {m['product_count']}건 / 작업 합계 {m['elapsed_sec']:.1f}초")
+        logger.info(f"   - 병합 {wall_clock:.1f}초")
+
+
+def run_local(banks: Optional[List[str]] = None, workers: Optional[int] = None, queue_path: Optional[Path] = None,
+              run_id: Optional[str] = None, log_level: int = logging.INFO) -> str:
+    """계획 등록 → 로컬 워커 프로세스 실행 → 완료 대기, run_id 반환 (병합/적재는 main(queue_run_id=...))"""
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    queue = WorkQueue(queue_path)
+    coordinator = QueueCoordinator(queue, run_id)
+    coordinator.enqueue(banks)
+    workers = workers or CrawlingConfig.QUEUE_WORKERS
+    logger.info(f"👷 로컬 워커 {workers}개 실행 (큐 {queue.path})")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = [
+            executor.submit(run_worker_process, str(queue.path), coordinator.run_id, None, log_level)
+            for _ in range(workers)
+        ]
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                # 워커가 죽어도 임대가 만료되면 다른 워커/다음 실행이 이어받음
+                logger.error(f"❌ 워커 프로세스 오류: {e}")
+    coordinator.wait(timeout=0)
+    return coordinator.run_id
@@ -102,6 +102,52 @@ CREATE INDEX IF NOT EXISTS idx_crawling_logs_created ON crawling_logs(created_at
 
 COMMENT ON TABLE crawling_logs IS '크롤링 실행 로그';
 
+-- ============================================
+-- 5. 최적 상품 인덱스 스냅샷 테이블
+-- ============================================
+CREATE TABLE IF NOT EXISTS offer_index_snapshots (
+  version VARCHAR(32) PRIMARY KEY,          -- 크롤링 실행 ID (run_id)
+  built_at TIMESTAMP DEFAULT NOW(),
+  product_count INT DEFAULT 0,
+  payload JSONB NOT NULL                    -- 상품 표 + 유형/한도 구간별 상위 K개 순위
+);
+
+CREATE INDEX IF NOT EXISTS idx_offer_index_built ON offer_index_snapshots(built_at DESC);
+
+COMMENT ON TABLE offer_index_snapshots IS '적재 시점에 미리 계산한 최적 상품 인덱스 (버전별 스냅샷)';
+
+-- ============================================
+-- 6. 상품 변경 이력 테이블 (바뀐 필드만 기록)
+-- ============================================
+CREATE TABLE IF NOT EXISTS loan_product_history (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  bank_name VARCHAR(50) NOT NULL,
+  product_name VARCHAR(200) NOT NULL,
+  changed_at TIMESTAMP NOT NULL,
+  changes JSONB NOT NULL                    -- {필드: 새 값}, 신규 상품은 전체 필드
+);
+
+CREATE INDEX IF NOT EXISTS idx_loan_product_history_product ON loan_product_history(bank_name, product_name, changed_at);
+CREATE INDEX IF NOT EXISTS idx_loan_product_history_changed ON loan_product_history(changed_at);
+
+COMMENT ON TABLE loan_product_history IS '대출 상품 금리/조건 변경 이벤트 (시점 복원/금리 변동 분석용)';
+
+-- ============================================
+-- 7. 크롤링 실행 계측 테이블 (실행당 1건)
+-- ============================================
+CREATE TABLE IF NOT EXISTS crawling_run_metrics (
+  run_id VARCHAR(32) PRIMARY KEY,           -- 원본 아카이브 실행 ID
+  elapsed_sec DECIMAL(10, 3),
+  peak_rss_bytes BIGINT,
+  spans JSONB,                              -- [{name, labels, count, total_sec, max_sec, avg_sec}]
+  counters JSONB,                           -- [{name, labels, value}]
+  created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_crawling_run_metrics_created ON crawling_run_metrics(created_at DESC);
+
+COMMENT ON TABLE crawling_run_metrics IS '크롤링 실행별 구간 소요 시간/카운터 (crawling_logs 보조)';
+
 -- ============================================
 -- 샘플 데이터 삽입 (테스트용, 선택적)
 -- ============================================
@@ -0,0 +1,148 @@
+/**
+ * NumPy 배치 시뮬레이터(crawling/simulation.py) 정합성 픽스처 생성
+ *
+ * 고정 입력(부채 × 상품)을 simulateRefinancing / findBestRefinancingOption에 넣은 결과를
+ * crawling/fixtures/simulation_parity.json으로 저장합니다.
+ * crawling/tests/test_simulation_parity.py가 이 결과와 simulate_batch를 비교합니다.
+ *
+ * 실행 (저장소 루트): npx tsx src/tests/simulation-parity.ts
+ * TS 엔진이나 big.js 버전을 바꾸면 다시 생성해 커밋하세요.
+ */
+
+import { simulateRefinancing, findBestRefinancingOption } from '../lib/services/simulation-service';
+import type { CurrentDebtInfo, NewLoanProduct, SimulationResult } from '../lib/services/simulation-service';
+import * as fs from 'fs';
+import * as path from 'path';
+
+const OUTPUT_PATH = path.join(process.cwd(), 'crawling', 'fixtures', 'simulation_parity.json');
+
+// user_debts 로우 형태 (Python 쪽 입력과 같은 키)
+const debts: Record<string, any>[] = [
+  // 수수료 면제 전, 인지세 0원 구간
+  { principal: 30000000, interest_rate: 7.5, remaining_months: 24, total_months: 36, repayment_type: '원리금균등', early_repay_fee_rate: 1.5, fee_waiver_months: 36 },
+  // 수수료 면제 후, 1억 초과 구간
+  { principal: 120000000, interest_rate: 5.2, remaining_months: 180, total_months: 360, repayment_type: '원금균등', early_repay_fee_rate: 1.2, fee_waiver_months: 36 },
+  // 인지세 경계 (5천만원 이하 → 0원)
+  { principal: 50000000, interest_rate: 9.9, remaining_months: 60, total_months: 60, repayment_type: '원리금균등', early_repay_fee_rate: 1.0, fee_waiver_months: 36 },
+  // 인지세 경계 (5천만원 초과 → 7만원)
+  { principal: 50000001, interest_rate: 4.1, remaining_months: 34, total_months: 36, repayment_type: '원금균등', early_repay_fee_rate: 1.5, fee_waiver_months: 36 },
+  // 면제까지 1개월 (수수료_면제_대기 후보)
+  { principal: 100000000, interest_rate: 6.0, remaining_months: 13, total_months: 48, repayment_type: '원리금균등', early_repay_fee_rate: 1.5, fee_waiver_months: 36 },
+  // 10억 초과 (인지세 최대), 장기
+  { principal: 1200000000, interest_rate: 3.9, remaining_months: 240, total_months: 360, repayment_type: '원리금균등', early_repay_fee_rate: 0.5, fee_waiver_months: 36 },
+  // 현재 금리 0%
+  { principal: 8000000, interest_rate: 0, remaining_months: 12, total_months: 24, repayment_type: '원리금균등', early_repay_fee_rate: 1.5, fee_waiver_months: 12 },
+  // 잔여 1개월
+  { principal: 15000000, interest_rate: 12.5, remaining_months: 1, total_months: 12, repayment_type: '원금균등', early_repay_fee_rate: 1.5, fee_waiver_months: 24 },
+  // 값 누락 → safeNum 기본값
+  { principal: null, interest_rate: null, remaining_months: null, total_months: null, repayment_type: '원리금균등', early_repay_fee_rate: null, fee_waiver_months: null },
+  // 숫자 문자열
+  { principal: '25000000', interest_rate: '8.25', remaining_months: '30', total_months: '48', repayment_type: '원금균등', early_repay_fee_rate: '1.2', fee_waiver_months: '36' },
+  // 빈 문자열 / 불리언 / 숫자 아닌 문자열
+  { principal: 40000000, interest_rate: '', remaining_months: 20, total_months: 36, repayment_type: '원리금균등', early_repay_fee_rate: true, fee_waiver_months: 'abc' },
+  // 유효하지 않은 부채 (TS에서 예외)
+  { principal: 10000000, interest_rate: 6.0, remaining_months: 0, total_months: 36, repayment_type: '원리금균등', early_repay_fee_rate: 1.5, fee_waiver_months: 36 },
+  { principal: 10000000, interest_rate: 6.0, remaining_months: 12, total_months: 36, repayment_type: '만기일시', early_repay_fee_rate: 1.5, fee_waiver_months: 36 },
+  { principal: -1, interest_rate: 6.0, remaining_months: 12, total_months: 36, repayment_type: '원금균등', early_repay_fee_rate: 1.5, fee_waiver_months: 36 },
+];
+
+const hasSalaryTransfer: boolean[] = debts.map((_, i) => i % 3 !== 2);
+
+// crawled_loan_products 로우 형태
+const products: Record<string, any>[] = [
+  { bank_name: 'KB', product_name: '직장인 신용', base_rate: 3.5, additional_rate: 1.2, salary_transfer_discount: 0.3, user_other_discount: 0 },
+  { bank_name: '신한', product_name: '쏠편한 신용', base_rate: 4.8, additional_rate: 0.5, salary_transfer_discount: 0.5, user_other_discount: 0.2 },
+  { bank_name: '하나', product_name: '우대금리 0%', base_rate: 0, additional_rate: 0, salary_transfer_discount: 0.3, user_other_discount: 0 },
+  { bank_name: '우리', product_name: '주택담보', base_rate: 2.9, additional_rate: 0, salary_transfer_discount: 0, user_other_discount: 0 },
+  { bank_name: 'NH', product_name: '값 누락', base_rate: null, additional_rate: null, salary_transfer_discount: null, user_other_discount: null },
+  { bank_name: 'IBK', product_name: '고금리', base_rate: 6.2, additional_rate: 1.8, salary_transfer_discount: 0.3, user_other_discount: 0.1 },
+  { bank_name: '카카오', product_name: '숫자 문자열', base_rate: '3.95', additional_rate: '0.75', salary_transfer_discount: '0.2', user_other_discount: '0' },
+  { bank_name: '토스', product_name: '초고금리', base_rate: 11.0, additional_rate: 2.0, salary_transfer_discount: 0, user_other_discount: 0 },
+];
+
+function toDebtInfo(row: Record<string, any>): CurrentDebtInfo {
+  return {
+    principal: row.principal,
+    interestRate: row.interest_rate,
+    remainingMonths: row.remaining_months,
+    totalMonths: row.total_months,
+    repaymentType: row.repayment_type,
+    earlyRepayFeeRate: row.early_repay_fee_rate,
+    feeWaiverMonths: row.fee_waiver_months,
+  } as CurrentDebtInfo;
+}
+
+function toLoanProduct(row: Record<string, any>): NewLoanProduct {
+  return {
+    bankName: row.bank_name,
+    productName: row.product_name,
+    baseRate: row.base_rate,
+    additionalRate: row.additional_rate,
+    salaryTransferDiscount: row.salary_transfer_discount,
+    userOtherDiscount: row.user_other_discount,
+  } as NewLoanProduct;
+}
+
+// SimulationResult → simulate_batch 필드 이름
+function toRow(result: SimulationResult) {
+  return {
+    total_debt_before: result.totalDebtBefore,
+    monthly_payment_before: result.monthlyPaymentBefore,
+    total_debt_after: result.totalDebtAfter,
+    monthly_payment_after: result.monthlyPaymentAfter,
+    early_repay_fee: result.earlyRepayFee,
+    stamp_duty: result.stampDuty,
+    total_refinance_cost: result.totalRefinanceCost,
+    interest_savings: result.interestSavings,
+    net_savings: result.netSavings,
+    monthly_savings: result.monthlySavings,
+    break_even_months: result.breakEvenMonths,
+    current_rate: result.currentRate,
+    new_rate: result.newRate,
+    recommended_action: result.recommendedAction,
+  };
+}
+
+function simulateOrNull(debt: CurrentDebtInfo, product: NewLoanProduct, salary: boolean) {
+  try {
+    return toRow(simulateRefinancing(debt, product, salary));
+  } catch {
+    // 유효하지 않은 부채 → 결과 없음 (NumPy 쪽은 NaN)
+    return null;
+  }
+}
+
+function installedVersion(name: string): string | null {
+  try {
+    const manifest = path.join(process.cwd(), 'node_modules', name, 'package.json');
+    return JSON.parse(fs.readFileSync(manifest, 'utf-8')).version;
+  } catch {
+    return null;
+  }
+}
+
+function main() {
+  const loanProducts = products.map(toLoanProduct);
+  const results = debts.map((row, i) =>
+    loanProducts.map(product => simulateOrNull(toDebtInfo(row), product, hasSalaryTransfer[i]))
+  );
+  const best = debts.map((row, i) => {
+    const result = findBestRefinancingOption(toDebtInfo(row), loanProducts, hasSalaryTransfer[i]);
+    return result ? products.findIndex(p => p.product_name === result.recommendedProduct.productName) : -1;
+  });
+
+  const fixture = {
+    generator: 'src/tests/simulation-parity.ts',
+    big_js: installedVersion('big.js'),
+    debts,
+    has_salary_transfer: hasSalaryTransfer,
+    products,
+    results,
+    best_product_index: best,
+  };
+
+  fs.writeFileSync(OUTPUT_PATH, JSON.stringify(fixture, null, 2) + '\n', 'utf-8');
+  console.log(`✅ ${debts.length} × ${products.length} 결과 저장: ${OUTPUT_PATH}`);
+}
+
+main();